@@ -2,6 +2,7 @@ import importlib
 import os
 from pathlib import Path
 from PluginScripts.PluginBase import PluginBase
+from ModuleFolders.Infrastructure.Metrics.StageMetrics import get_stage_metrics
 
 class PluginManager:
 
@@ -41,8 +42,11 @@ class PluginManager:
             sorted_plugins = [plugin for plugin in sorted_plugins if self.plugins_enable.get(plugin.name, plugin.default_enable)]
 
             #print(sorted_plugins) #bug用
-            for plugin in sorted_plugins:
-                plugin.on_event(event_name, config, event_data)
+            if not sorted_plugins:
+                return
+            with get_stage_metrics().timer(f"plugin:{event_name}"):
+                for plugin in sorted_plugins:
+                    plugin.on_event(event_name, config, event_data)
 
     def load_plugins_from_directory(self, directory):
         directory_path = Path(directory)
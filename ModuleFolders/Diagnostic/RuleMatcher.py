@@ -5,7 +5,9 @@
 """
 
 import re
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from typing import Optional, List, Dict
 
 from ModuleFolders.Diagnostic.i18n import get_text
@@ -32,9 +34,21 @@ class RuleMatcher:
     优先级: 精确匹配 > 正则匹配 > 关键词匹配
     """
 
+    # 最近诊断过的错误文本 -> 诊断结果，错误风暴时重复的错误只需一次字典查找
+    RESULT_CACHE_SIZE = 512
+
+    # 本地模块模式 - 这些是项目内部模块
+    LOCAL_MODULE_REG = re.compile(
+        r"ModuleFolders\.|PluginScripts\.|Tools\.|from ModuleFolders|from PluginScripts|import ModuleFolders"
+    )
+    MISSING_MODULE_REG = re.compile(r"No module named ['\"]?([a-zA-Z0-9_]+)")
+
     def __init__(self, lang: str = "zh_CN"):
         self.lang = lang
+        self._result_cache: "OrderedDict[str, DiagnosticResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._init_rules()
+        self._compile_rules()
 
     def _init_rules(self):
         """初始化规则库"""
@@ -229,6 +243,20 @@ class RuleMatcher:
             "self_check_3"
         ]
 
+    def _compile_rules(self):
+        """预编译正则规则（保持优先级顺序），修改规则后需要重新调用"""
+        self._compiled_keyerror_rules = [
+            (re.compile(rule["pattern"], re.IGNORECASE), rule) for rule in self.keyerror_rules
+        ]
+        # 需要详细检查的规则由专门的逻辑处理，不参与正则匹配
+        self._compiled_regex_rules = [
+            (re.compile(rule["pattern"], re.IGNORECASE), rule)
+            for rule in self.regex_rules if not rule.get("needs_detail_check")
+        ]
+
+        with self._cache_lock:
+            self._result_cache.clear()
+
     @property
     def default_self_check(self) -> List[str]:
         """获取翻译后的默认自查清单"""
@@ -244,8 +272,24 @@ class RuleMatcher:
         Returns:
             DiagnosticResult: 诊断结果
         """
-        result = DiagnosticResult(self_check=self.default_self_check)
+        # 诊断结果只取决于错误文本（和语言），以完整文本为键缓存
+        with self._cache_lock:
+            result = self._result_cache.get(error_text)
+            if result is not None:
+                self._result_cache.move_to_end(error_text)
 
+        if result is None:
+            result = self._match_rules(error_text)
+            with self._cache_lock:
+                self._result_cache[error_text] = result
+                while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+
+        # 返回副本，调用方修改结果不会影响缓存
+        return replace(result, self_check=list(result.self_check) if result.self_check is not None else None)
+
+    def _match_rules(self, error_text: str) -> DiagnosticResult:
+        """按优先级依次匹配各类规则"""
         # 1. 精确匹配状态码
         for code, rule in self.exact_rules.items():
             if code in error_text:
@@ -253,8 +297,8 @@ class RuleMatcher:
 
         # 2. KeyError 特殊处理
         if "KeyError" in error_text:
-            for rule in self.keyerror_rules:
-                if re.search(rule["pattern"], error_text, re.IGNORECASE):
+            for pattern, rule in self._compiled_keyerror_rules:
+                if pattern.search(error_text):
                     return self._create_result(rule, f"keyerror_{rule['pattern'][:20]}")
 
         # 3. ImportError 特殊处理 (区分本地模块和第三方依赖)
@@ -262,14 +306,12 @@ class RuleMatcher:
             return self._handle_import_error(error_text)
 
         # 4. 其他正则匹配
-        for rule in self.regex_rules:
-            if rule.get("needs_detail_check"):
-                continue  # 跳过需要详细检查的规则
-            if re.search(rule["pattern"], error_text, re.IGNORECASE):
+        for pattern, rule in self._compiled_regex_rules:
+            if pattern.search(error_text):
                 return self._create_result(rule, f"regex_{rule['pattern'][:30]}")
 
         # 未匹配到任何规则
-        return result
+        return DiagnosticResult(self_check=self.default_self_check)
 
     def _create_result(self, rule: dict, rule_name: str) -> DiagnosticResult:
         """从规则创建诊断结果，使用 i18n 翻译"""
@@ -295,19 +337,7 @@ class RuleMatcher:
         处理 ImportError/ModuleNotFoundError
         区分本地模块错误(代码Bug)和第三方依赖缺失(用户问题)
         """
-        # 本地模块模式 - 这些是项目内部模块
-        local_patterns = [
-            r"ModuleFolders\.",
-            r"PluginScripts\.",
-            r"Tools\.",
-            r"from ModuleFolders",
-            r"from PluginScripts",
-            r"import ModuleFolders",
-        ]
-
-        is_local_module = any(
-            re.search(p, error_text) for p in local_patterns
-        )
+        is_local_module = self.LOCAL_MODULE_REG.search(error_text) is not None
 
         if is_local_module:
             # 本地模块导入错误 = 代码Bug
@@ -325,10 +355,7 @@ class RuleMatcher:
         else:
             # 第三方依赖缺失 = 用户问题
             # 尝试提取缺失的模块名
-            module_match = re.search(
-                r"No module named ['\"]?([a-zA-Z0-9_]+)",
-                error_text
-            )
+            module_match = self.MISSING_MODULE_REG.search(error_text)
             module_name = module_match.group(1) if module_match else "<package>"
 
             # 获取基础解决方案文本并替换占位符
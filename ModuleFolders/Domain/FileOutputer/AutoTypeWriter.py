@@ -58,6 +58,10 @@ class AutoTypeWriter(BaseBilingualWriter, BaseTranslatedWriter):
         if errors:
             raise RuntimeError("释放时发生异常:\n" + "\n".join(errors))
 
+    def can_write_concurrently(self, cache_file: CacheFile) -> bool:
+        writer = self._writers.get(cache_file.file_project_type)
+        return writer is None or writer.can_write_concurrently(cache_file)
+
     def write_bilingual_file(
         self, translation_file_path: Path, cache_file: CacheFile,
         source_file_path: Path = None,
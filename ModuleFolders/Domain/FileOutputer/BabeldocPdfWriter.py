@@ -31,6 +31,10 @@ class BabeldocPdfWriter(BaseBilingualWriter, BaseTranslatedWriter):
         if self.abs_tmp_directory.exists():
             shutil.rmtree(self.abs_tmp_directory)
 
+    def can_write_concurrently(self, cache_file: CacheFile) -> bool:
+        # babeldoc 会修改模块级全局状态、驱动 rich 进度显示，并共用同一个临时目录，只能串行输出
+        return False
+
     def on_write_translated(
         self, translation_file_path: Path, cache_file: CacheFile,
         pre_write_metadata: PreWriteMetadata,
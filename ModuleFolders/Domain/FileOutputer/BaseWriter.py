@@ -77,6 +77,10 @@ class BaseTranslationWriter(ABC):
             return isinstance(self, BaseBilingualWriter) and self.output_config.bilingual_config.enabled
         return False
 
+    def can_write_concurrently(self, cache_file: CacheFile) -> bool:
+        """判断该文件能否与其他文件并行输出（每个工作线程持有独立的writer实例）"""
+        return True
+
     def __enter__(self):
         """申请整个Writer生命周期用到的耗时资源，单个文件的资源则在write_xxx_file方法中申请释放"""
         return self
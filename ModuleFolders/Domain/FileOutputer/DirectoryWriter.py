@@ -1,8 +1,14 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable
 
+import rapidjson as json
 import rich
 
+from ModuleFolders.Infrastructure.Cache.CacheFile import CacheFile
 from ModuleFolders.Infrastructure.Cache.CacheProject import CacheProject
 from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.Domain.FileOutputer.BaseWriter import (
@@ -13,9 +19,70 @@ from ModuleFolders.Domain.FileOutputer.BaseWriter import (
 )
 
 
+class DirectoryWriteError(RuntimeError):
+    """并行输出时收集到的全部失败，按项目文件顺序排列"""
+
+    def __init__(self, failures: list[tuple[str, Exception]]):
+        self.failures = failures
+        details = "\n".join(f"{storage_path}: {type(e).__name__}: {e}" for storage_path, e in failures)
+        super().__init__(f"{len(failures)} 个文件输出失败:\n{details}")
+
+
+class ExportManifest:
+    """记录上次输出时每个文件的内容指纹，用于跳过未变化的文件"""
+
+    FILE_NAME = ".export_manifest.json"
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._entries: dict[str, str] = {}
+        self._dirty = False
+        if manifest_path.is_file():
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as reader:
+                    self._entries = json.load(reader)
+            except Exception:
+                self._entries = {}
+
+    def is_unchanged(self, translation_file_path: Path, fingerprint: str) -> bool:
+        with self._lock:
+            recorded = self._entries.get(str(translation_file_path))
+        return recorded == fingerprint and translation_file_path.exists()
+
+    def record(self, translation_file_path: Path, fingerprint: str):
+        with self._lock:
+            self._entries[str(translation_file_path)] = fingerprint
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as writer:
+                    json.dump(self._entries, writer, ensure_ascii=False)
+                os.replace(tmp_path, self.manifest_path)
+                self._dirty = False
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+
 class DirectoryWriter:
-    def __init__(self, create_writer: Callable[[], BaseTranslationWriter]):
+    def __init__(
+        self, create_writer: Callable[[], BaseTranslationWriter],
+        max_workers: int = 1, skip_unchanged: bool = False,
+    ):
+        """
+        :param max_workers: 并行输出的线程数，小于等于1时按文件顺序串行输出
+        :param skip_unchanged: 内容与上次输出一致且输出文件仍存在时跳过该文件
+        """
         self.create_writer = create_writer
+        self.max_workers = max_workers
+        self.skip_unchanged = skip_unchanged
 
     WRITER_TYPE_CONFIG = {
         BaseTranslatedWriter: ("translated_config", "write_translated_file"),
@@ -30,8 +97,15 @@ class DirectoryWriter:
         with self.create_writer() as writer:
             # 判断输入路径是目录还是文件
             is_source_a_directory = source_directory.is_dir()
-            
+
+            manifest = None
+            if self.skip_unchanged:
+                manifest_root = translation_directory or writer.output_config.translated_config.output_root
+                if manifest_root:
+                    manifest = ExportManifest(Path(manifest_root) / ExportManifest.FILE_NAME)
+
             # 把翻译片段按文件名分组
+            jobs = []
             for storage_path, file_items in project.files.items():
                 # 根据输入路径的类型决定如何构造源文件路径
                 if is_source_a_directory:
@@ -40,23 +114,147 @@ class DirectoryWriter:
                 else:
                     # 如果是文件，则输入路径本身就是源文件路径
                     source_file_path = source_directory
-                for translation_mode in BaseTranslationWriter.TranslationMode:
-                    if writer.can_write(translation_mode):
-                        translation_config: TranslationOutputConfig = getattr(
-                            writer.output_config, translation_mode.config_attr
+                jobs.append((storage_path, file_items, source_file_path))
+
+            try:
+                if self.max_workers > 1 and len(jobs) > 1:
+                    self._write_parallel(writer, jobs, translation_directory, task_config, manifest)
+                else:
+                    for storage_path, file_items, source_file_path in jobs:
+                        self._write_file(
+                            writer, storage_path, file_items, source_file_path,
+                            translation_directory, task_config, manifest
                         )
-                        # 替换文件后缀
-                        new_storage_path = self.with_file_suffix(storage_path, translation_config.name_suffix)
-                        output_root = translation_directory or translation_config.output_root
-                        translation_file_path = output_root / new_storage_path
-                        if not translation_file_path.parent.exists():
-                            translation_file_path.parent.mkdir(parents=True, exist_ok=True)
-                        write_translation_file = getattr(writer, translation_mode.write_method)
-
-                        # 执行写入
-                        write_translation_file(translation_file_path, file_items, source_file_path, task_config)
+            finally:
+                if manifest:
+                    manifest.save()
         # 释放Ainiee配置实例
 
+    def _write_parallel(
+        self, writer: BaseTranslationWriter, jobs: list, translation_directory: Path,
+        task_config: TaskConfig, manifest: ExportManifest | None,
+    ):
+        """可并行的文件分发到线程池，每个工作线程持有独立的writer实例；不可并行的文件在当前线程串行输出"""
+        local = threading.local()
+        worker_writers: list[BaseTranslationWriter] = []
+        worker_writers_lock = threading.Lock()
+
+        def get_worker_writer() -> BaseTranslationWriter:
+            worker_writer = getattr(local, "writer", None)
+            if worker_writer is None:
+                worker_writer = self.create_writer()
+                worker_writer.__enter__()
+                local.writer = worker_writer
+                with worker_writers_lock:
+                    worker_writers.append(worker_writer)
+            return worker_writer
+
+        def run(job):
+            storage_path, file_items, source_file_path = job
+            self._write_file(
+                get_worker_writer(), storage_path, file_items, source_file_path,
+                translation_directory, task_config, manifest
+            )
+
+        concurrent_jobs = []
+        serial_jobs = []
+        for job in jobs:
+            (concurrent_jobs if writer.can_write_concurrently(job[1]) else serial_jobs).append(job)
+
+        # 结果按提交顺序收集，保证错误报告的顺序与项目文件顺序一致
+        failures: dict[str, Exception] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file_writer") as executor:
+                futures = [(job[0], executor.submit(run, job)) for job in concurrent_jobs]
+                for job in serial_jobs:
+                    try:
+                        self._write_file(writer, *job, translation_directory, task_config, manifest)
+                    except Exception as e:
+                        failures[job[0]] = e
+                for storage_path, future in futures:
+                    exception = future.exception()
+                    if exception is not None:
+                        failures[storage_path] = exception
+        finally:
+            # 所有文件输出完毕后才统一释放，避免共享的临时目录被提前清理
+            for worker_writer in worker_writers:
+                try:
+                    worker_writer.__exit__(None, None, None)
+                except Exception as e:
+                    rich.print(f"[[red]ERROR[/]] 释放输出器失败: {e}")
+
+        if failures:
+            raise DirectoryWriteError([
+                (storage_path, failures[storage_path])
+                for storage_path, _, _ in jobs if storage_path in failures
+            ])
+
+    def _write_file(
+        self, writer: BaseTranslationWriter, storage_path: str, file_items: CacheFile,
+        source_file_path: Path, translation_directory: Path, task_config: TaskConfig,
+        manifest: ExportManifest | None,
+    ):
+        for translation_mode in BaseTranslationWriter.TranslationMode:
+            if writer.can_write(translation_mode):
+                translation_config: TranslationOutputConfig = getattr(
+                    writer.output_config, translation_mode.config_attr
+                )
+                # 替换文件后缀
+                new_storage_path = self.with_file_suffix(storage_path, translation_config.name_suffix)
+                output_root = translation_directory or translation_config.output_root
+                translation_file_path = output_root / new_storage_path
+
+                fingerprint = None
+                if manifest:
+                    fingerprint = self.compute_fingerprint(
+                        writer, translation_mode, translation_config, file_items, source_file_path, task_config
+                    )
+                    if manifest.is_unchanged(translation_file_path, fingerprint):
+                        continue
+
+                if not translation_file_path.parent.exists():
+                    translation_file_path.parent.mkdir(parents=True, exist_ok=True)
+                write_translation_file = getattr(writer, translation_mode.write_method)
+
+                # 执行写入
+                write_translation_file(translation_file_path, file_items, source_file_path, task_config)
+
+                if manifest:
+                    manifest.record(translation_file_path, fingerprint)
+
+    @classmethod
+    def compute_fingerprint(
+        cls, writer: BaseTranslationWriter, translation_mode: BaseTranslationWriter.TranslationMode,
+        translation_config: TranslationOutputConfig, cache_file: CacheFile,
+        source_file_path: Path, task_config: TaskConfig = None,
+    ) -> str:
+        """根据输出方式、译文内容与原文件状态计算指纹，任一变化都会导致重新输出"""
+        hasher = hashlib.blake2b(digest_size=16)
+
+        def feed(value):
+            hasher.update(str(value).encode("utf-8", "surrogatepass"))
+            hasher.update(b"\x1f")
+
+        feed(type(writer).__name__)
+        feed(translation_mode.name)
+        feed(translation_config.name_suffix)
+        feed(writer.output_config.bilingual_order.value)
+        feed(cache_file.encoding)
+        feed(cache_file.line_ending)
+        feed(task_config.keep_original_encoding if task_config else None)
+        for item in cache_file.items:
+            feed(item.translation_status)
+            feed(item.source_text)
+            feed(item.translated_text)
+            feed(item.polished_text)
+        try:
+            stat = os.stat(source_file_path)
+            feed(stat.st_size)
+            feed(stat.st_mtime_ns)
+        except OSError:
+            feed(None)
+        return hasher.hexdigest()
+
     @classmethod
     def with_file_suffix(self, file_path: str, name_suffix: str) -> Path:
         parts = file_path.rsplit(".", 1)
@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from pathlib import Path
 
 from ModuleFolders.Infrastructure.Cache.CacheFile import CacheFile
@@ -21,22 +22,49 @@ class DocxWriter(BaseTranslatedWriter):
         source_file_path: Path = None,
     ):
         content = self.file_accessor.read_content(source_file_path)
-        start_index = 0
         # 根据 w:t 标签找到原文
-        paragraphs = content.find_all("w:t")
-        items = cache_file.items
-        for match in paragraphs:
-            if isinstance(match.string, str) and match.string.strip():
-                # 在翻译结果中查找是否存在原文，存在则替换并右移开始下标
-                for content_index in range(start_index, len(items)):
-                    if match.string == items[content_index].source_text:
-                        match.string = items[content_index].final_text
-                        start_index = content_index + 1
-                        break
+        nodes = content.find_all("w:t")
+        unmatched = self._patch_by_locator(nodes, cache_file.items)
+        if unmatched:
+            self._patch_by_search(nodes, unmatched)
         self.file_accessor.write_content(
             content, translation_file_path, source_file_path
         )
 
+    def _patch_by_locator(self, nodes, items):
+        """按读取时记录的 run_idx 直接替换，返回无法定位的条目（旧缓存或原文已变化）"""
+        unmatched = []
+        for item in items:
+            run_idx = item.get_extra("run_idx")
+            if run_idx is not None and 0 <= run_idx < len(nodes):
+                node = nodes[run_idx]
+                if node.string == item.source_text:
+                    node.string = item.final_text
+                    # 已替换的节点不再参与后面的文本匹配
+                    nodes[run_idx] = None
+                    continue
+            unmatched.append(item)
+        return unmatched
+
+    def _patch_by_search(self, nodes, items):
+        """按原文顺序匹配：每个节点替换为下标不小于上次匹配位置的第一个同原文条目"""
+        positions = {}
+        for index, item in enumerate(items):
+            positions.setdefault(item.source_text, []).append(index)
+
+        start_index = 0
+        for node in nodes:
+            if node is None or not isinstance(node.string, str) or not node.string.strip():
+                continue
+            candidates = positions.get(node.string)
+            if not candidates:
+                continue
+            found = bisect_left(candidates, start_index)
+            if found < len(candidates):
+                content_index = candidates[found]
+                node.string = items[content_index].final_text
+                start_index = content_index + 1
+
     @classmethod
     def get_project_type(self):
         return ProjectType.DOCX
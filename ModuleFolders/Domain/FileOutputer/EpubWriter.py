@@ -1,5 +1,6 @@
 import re
-from itertools import groupby
+from bisect import bisect_left
+from collections import deque
 from pathlib import Path
 from typing import Callable
 
@@ -19,6 +20,9 @@ from ModuleFolders.Domain.FileOutputer.BaseWriter import (
 
 
 class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
+    # 章节中的开始标签，用于一次扫描定位所有待替换片段
+    OPEN_TAG_PATTERN = re.compile(r"<([A-Za-z][\w:.-]*)\b[^>]*>")
+
     def __init__(self, output_config: OutputConfig):
         super().__init__(output_config)
         self.file_accessor = EpubAccessor()
@@ -49,28 +53,111 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
     ):
         content = self.file_accessor.read_content(source_file_path)
 
-        translated_item_dict = {
-            k: list(v)
-            for k, v in groupby(cache_file.items, key=lambda x: x.require_extra("item_id"))
-        }
+        translated_item_dict = {}
+        for item in cache_file.items:
+            translated_item_dict.setdefault(item.require_extra("item_id"), []).append(item)
+
         translation_content = {}
         for item_id, item_filename, html_content in content:
             if item_id not in translated_item_dict:
                 translation_content[item_filename] = html_content
                 continue
-            
-            modified_html_content = html_content
-            for item in translated_item_dict[item_id]:
-                if item.translation_status == TranslationStatus.TRANSLATED or item.translation_status == TranslationStatus.POLISHED:
-                    original_html = item.require_extra("original_html")
-                    translated_text = item.final_text
-                    new_html = translate_html_tag(original_html, translated_text)
-                    modified_html_content = modified_html_content.replace(original_html, new_html, 1)
-            translation_content[item_filename] = modified_html_content
+
+            replacements = [
+                (item.require_extra("original_html"), item.final_text)
+                for item in translated_item_dict[item_id]
+                if item.translation_status == TranslationStatus.TRANSLATED or item.translation_status == TranslationStatus.POLISHED
+            ]
+            translation_content[item_filename] = self._substitute_tags(html_content, replacements, translate_html_tag)
         self.file_accessor.write_content(
             translation_content, translation_file_path, source_file_path
         )
 
+    def _substitute_tags(self, html_content: str, replacements: list, translate_html_tag: Callable[[str, str], str]) -> str:
+        """
+        把章节中的原文片段替换为译文片段，章节只扫描一次、拼接一次
+
+        与逐条 str.replace(original_html, new_html, 1) 的结果一致：同一片段第 k 次出现对应第 k 个条目，
+        与已替换区域重叠的出现位置视为已不存在。未改动的部分逐字节保留。
+        """
+        if not replacements:
+            return html_content
+
+        occurrences = self._locate_fragments(html_content, {original for original, _ in replacements})
+        claimed_starts, claimed_ends = [], []
+        spans = []
+        rebuilt = {}
+        for original_html, translated_text in replacements:
+            positions = occurrences.get(original_html)
+            if positions is None:
+                # 不以完整标签开头的片段，退回普通查找
+                positions = occurrences[original_html] = deque(self._find_all(html_content, original_html))
+
+            start = None
+            while positions:
+                candidate = positions.popleft()
+                index = bisect_left(claimed_starts, candidate)
+                if index > 0 and claimed_ends[index - 1] > candidate:
+                    continue
+                if index < len(claimed_starts) and claimed_starts[index] < candidate + len(original_html):
+                    continue
+                start = candidate
+                break
+            if start is None:
+                continue
+
+            end = start + len(original_html)
+            claimed_starts.insert(index, start)
+            claimed_ends.insert(index, end)
+
+            # 重复的段落（分隔符、固定台词等）只重建一次
+            key = (original_html, translated_text)
+            new_html = rebuilt.get(key)
+            if new_html is None:
+                new_html = rebuilt[key] = translate_html_tag(original_html, translated_text)
+            spans.append((start, end, new_html))
+
+        spans.sort()
+        parts = []
+        cursor = 0
+        for start, end, new_html in spans:
+            parts.append(html_content[cursor:start])
+            parts.append(new_html)
+            cursor = end
+        parts.append(html_content[cursor:])
+        return "".join(parts)
+
+    def _locate_fragments(self, html_content: str, fragments: set) -> dict:
+        """一次扫描章节，按出现顺序记录每个片段（开始标签到首个同名结束标签）的位置"""
+        tag_names = set()
+        for fragment in fragments:
+            match = self.OPEN_TAG_PATTERN.match(fragment)
+            if match:
+                tag_names.add(match.group(1))
+
+        occurrences = {}
+        for match in self.OPEN_TAG_PATTERN.finditer(html_content):
+            tag_name = match.group(1)
+            if tag_name not in tag_names:
+                continue
+            closing = f"</{tag_name}>"
+            end = html_content.find(closing, match.end())
+            if end < 0:
+                continue
+            fragment = html_content[match.start():end + len(closing)]
+            if fragment in fragments:
+                occurrences.setdefault(fragment, deque()).append(match.start())
+        return occurrences
+
+    @staticmethod
+    def _find_all(html_content: str, fragment: str) -> list:
+        positions = []
+        start = html_content.find(fragment)
+        while start >= 0:
+            positions.append(start)
+            start = html_content.find(fragment, start + len(fragment))
+        return positions
+
     # 译文版本
     def _rebuild_translated_tag(self, original_html, translated_text):
         soup = BeautifulSoup(original_html, 'html.parser')
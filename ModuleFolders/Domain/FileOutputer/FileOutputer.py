@@ -110,7 +110,11 @@ class FileOutputer:
             else:
                 source_directory = input_path_obj
 
-            writer = DirectoryWriter(writer_factory)
+            writer = DirectoryWriter(
+                writer_factory,
+                max_workers=output_config.get("export_thread_counts", 1),
+                skip_unchanged=output_config.get("skip_unchanged_output", False),
+            )
             writer.write_translation_directory(cache_data, source_directory, Path(output_path), task_config)
         else:
             raise ValueError(f"未找到对应的项目写入器: {project_type}")
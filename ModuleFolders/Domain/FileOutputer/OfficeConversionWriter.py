@@ -37,6 +37,10 @@ class OfficeConversionWriter(BaseTranslatedWriter):
         if input_temp_root.exists():
             shutil.rmtree(input_temp_root)
 
+    def can_write_concurrently(self, cache_file: CacheFile) -> bool:
+        # Office 转换依赖单个外部进程，只能串行输出
+        return False
+
     def write_translated_file(
         self, translation_file_path: Path, cache_file: CacheFile,
         source_file_path: Path = None,
@@ -26,11 +26,12 @@ class DocxReader(BaseSourceReader):
 
     def on_read_source(self, file_path: Path, pre_read_metadata: PreReadMetadata) -> CacheFile:
         xml_soup = self.file_accessor.read_content(file_path)
-        paragraphs = xml_soup.find_all('w:t')
-        # 过滤掉空的内容
-        filtered_matches = (match.string for match in paragraphs if isinstance(match.string, str) and match.string.strip())
-        items = [
-            CacheItem(source_text=str(text)) for text in filtered_matches
-            if not (text == "" or text == "\n" or text == " " or text == '\xa0')
-        ]
+        items = []
+        # run_idx 记录合并 run 之后第几个 w:t 节点，写入时按它直接定位
+        for run_idx, match in enumerate(xml_soup.find_all('w:t')):
+            text = match.string
+            # 过滤掉空的内容
+            if not isinstance(text, str) or not text.strip():
+                continue
+            items.append(CacheItem(source_text=str(text), extra={"run_idx": run_idx}))
         return CacheFile(items=items)
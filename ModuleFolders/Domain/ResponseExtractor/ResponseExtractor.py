@@ -21,6 +21,20 @@ class ResponseExtractor:
     # 提取规范数字序号与正文的正则
     extract_num_text_reg = re.compile(f'["“”][^"“”]*?{multiline_number_prefix}(.*?){multiline_quote_suffix}')
 
+    # 以下正则每个回复、每行都会用到，统一在类加载时编译
+    # 最后一个 textarea 标签的内容
+    textarea_reg = re.compile(r'<textarea.*?>(.*?)</textarea>', re.DOTALL)
+    # 按主序号把回复切分成块（换行后紧跟 "数字."）
+    block_split_reg = re.compile(r'\n(?=\d+\.)')
+    # 以数字和句点开头的行
+    numbered_line_reg = re.compile(r'^\d+\.')
+    # 列表块 N.[ ... ]
+    list_block_reg = re.compile(r'^\d+\.\s*\[(.*)]$', re.DOTALL)
+    # 各种变形序号，之后最多再跟两个简单的 "数字." 序号，一次替换完成
+    numbered_prefix_reg = re.compile(r'^(?:\s*[「『【（\(……□\s]*\d+(?:\.\d+)*\.[,，、]?\s*)?(?:\s*\d+\.\s*){0,2}')
+    # 尾部的 "\n] 或 \n] (及其前面的空格)
+    trailing_bracket_reg = re.compile(r'\s*"?\n]$')
+
     def __init__(self):
         pass
 
@@ -57,33 +71,24 @@ class ResponseExtractor:
     def label_text_extraction(self,source_text_dict, html_string):
 
         # 只提取最后一个 textarea 标签的内容
-        textarea_contents = re.findall(r'<textarea.*?>(.*?)</textarea>', html_string, re.DOTALL)
+        textarea_contents = ResponseExtractor.textarea_reg.findall(html_string)
         if not textarea_contents:
             return {}  # 如果没有找到 textarea 标签，返回空字典
         last_content = textarea_contents[-1]
 
-        # 提取文本存储到字典中
-        output_dict = ResponseExtractor.extract_text_to_dict(self,last_content)
+        # 提取文本行
+        extracted_items = ResponseExtractor.tokenize_numbered_lines(last_content)
 
         # 如果原文是一行，则跳过过滤，主要是本地模型兼容
         if len(source_text_dict) == 1 :
-             return output_dict 
+             return {str(i): item for i, item in enumerate(extracted_items)}
 
         # 从第一个以数字序号开头的行开始，保留之后的所有行(主要是有些AI会在译文内容前面加点说明)
-        filtered_dict = {}
-        found = False
-        # 按行号顺序遍历
-        for key in sorted(output_dict.keys(), key=lambda k: int(k)):
-            value = output_dict[key]
-            if not found:
-                if re.match(r'^\d+\.', value):  # 匹配以数字和句点开头的行
-                    found = True
-                else:
-                    continue
-            if found:
-                filtered_dict[key] = value
-
-        return filtered_dict
+        numbered_line_match = ResponseExtractor.numbered_line_reg.match
+        for start, value in enumerate(extracted_items):
+            if numbered_line_match(value):
+                return {str(i): extracted_items[i] for i in range(start, len(extracted_items))}
+        return {}
 
     # 提取文本为字典
     def extract_text_to_dict(self, input_string: str) -> Dict[str, str]:
@@ -96,10 +101,26 @@ class ResponseExtractor:
         Returns:
             一个字典，键是'0', '1', '2'...，值是提取到的文本行。
         """
+        # 切分文本行后生成最终字典
+        extracted_items = ResponseExtractor.tokenize_numbered_lines(input_string)
+        return {str(i): item for i, item in enumerate(extracted_items)}
+
+    @staticmethod
+    def tokenize_numbered_lines(input_string: str) -> List[str]:
+        """
+        把回复切分为按顺序排列的文本行，单行条目原样保留，N.[ ... ] 列表块展开为 "n.n.,正文"。
+
+        Args:
+            input_string: textarea 中的内容。
+
+        Returns:
+            提取到的文本行列表。
+        """
         # 1. 初步分割: 按主序号分割成块
-        blocks = re.split(r'\n(?=\d+\.)', input_string.strip())
+        blocks = ResponseExtractor.block_split_reg.split(input_string.strip())
 
         extracted_items = []
+        list_block_match = ResponseExtractor.list_block_reg.match
 
         # 2. 处理每个块
         for block in blocks:
@@ -107,14 +128,14 @@ class ResponseExtractor:
             if not block:
                 continue
 
-            # 3. 尝试匹配列表块模式 (N.[ ... ])
+            # 3. 尝试匹配列表块模式 (N.[ ... ])，只有以 ] 结尾的块才可能是列表块
             # re.DOTALL 使 '.' 可以匹配换行符
-            list_block_match = re.match(r'^\d+\.\s*\[(.*)]$', block, re.DOTALL)
-            if list_block_match:
-                list_content = list_block_match.group(1).strip()
+            list_match = list_block_match(block) if block[-1] == "]" else None
+            if list_match:
+                list_content = list_match.group(1).strip()
                 # 再次判断是否是列表块内容(通过以特定模式开始作为判断)
                 if list_content and ResponseExtractor.multiline_start_reg.match(list_content):
-                    items = ResponseExtractor.extract_multiline_content(self, list_content)
+                    items = ResponseExtractor.extract_multiline_content(None, list_content)
                     extracted_items.extend(items)
                 else:
                     # 如果方括号内的内容不像带引号列表 (例如 "9.[社团活动后]")
@@ -124,9 +145,7 @@ class ResponseExtractor:
                 # 4.2 文本块: 不是 N.[...] 格式，直接添加整个块内容
                 extracted_items.append(block)
 
-        # 5. 生成最终字典
-        result_dict = {str(i): item for i, item in enumerate(extracted_items)}
-        return result_dict
+        return extracted_items
 
     def extract_multiline_content(self, text: str) -> List[str]:
         """
@@ -215,15 +234,8 @@ class ResponseExtractor:
             例如：
             {'0': 0, '1': 1, '2': 0}
         """
-        newline_counts = {}  # 初始化一个空字典用于存储换行符数量
-
-        for key, text in source_text_dict.items():
-            newline_count = text.count('\n')  # 使用字符串的count()方法统计换行符数量
-            if newline_count == 0:
-                newline_counts[key] = newline_count  # 将统计结果存入新字典，键保持不变
-            else:
-                newline_counts[key] = newline_count
-        return newline_counts
+        # 使用字符串的count()方法统计换行符数量，键保持不变
+        return {key: text.count('\n') for key, text in source_text_dict.items()}
 
     # 辅助函数，根据换行符数量生成最终译文字典，与原文字典进行一一对应
     def generate_text_by_newlines(self, newline_counts_dict, translation_text_dict):
@@ -240,36 +252,29 @@ class ResponseExtractor:
             如果 translation_text_dict 有剩余内容，将添加新键值对，键为最大原键加1，值为剩余内容按换行拼接。
         """
         result_dict = {}
-        translation_keys_sorted = sorted(translation_text_dict.keys(), key=int)
+        # 按序号排好的译文行，之后只做切片，不再逐行查字典
+        translation_lines = [translation_text_dict[k] for k in sorted(translation_text_dict.keys(), key=int)]
+        total_lines = len(translation_lines)
         translation_index = 0
 
         # 处理每个预定键的行数需求
         for key, newline_count in newline_counts_dict.items():
-            extracted_lines = []
-            num_lines_to_extract = newline_count + 1 if newline_count > 0 else 1
-
-            for _ in range(num_lines_to_extract):
-                if translation_index < len(translation_keys_sorted):
-                    current_key = translation_keys_sorted[translation_index]
-                    extracted_lines.append(translation_text_dict[current_key])
-                    translation_index += 1
-                else:
-                    break
-
-            if extracted_lines:
-                result_dict[key] = '\n'.join(extracted_lines) if newline_count > 0 else extracted_lines[0]
-            else:
+            if translation_index >= total_lines:
                 result_dict[key] = ''
+            elif newline_count > 0:
+                result_dict[key] = '\n'.join(translation_lines[translation_index:translation_index + newline_count + 1])
+            else:
+                result_dict[key] = translation_lines[translation_index]
+            translation_index += newline_count + 1
 
         # 添加剩余内容为新键值对
-        if translation_index < len(translation_keys_sorted):
+        if translation_index < total_lines:
             if newline_counts_dict:
                 max_key = max(map(int, newline_counts_dict.keys()))
             else:
                 max_key = 0
             new_key = str(max_key + 1)
-            remaining_texts = [translation_text_dict[k] for k in translation_keys_sorted[translation_index:]]
-            result_dict[new_key] = '\n'.join(remaining_texts)
+            result_dict[new_key] = '\n'.join(translation_lines[translation_index:])
 
         return result_dict
 
@@ -279,9 +284,9 @@ class ResponseExtractor:
         """
         去除翻译文本中的数字序号前缀。
         
-        处理两个步骤：
+        处理两个步骤（合并为 numbered_prefix_reg 一次替换）：
         1. 去除各种变形序号（包括特殊前缀字符 + 数字序号 + 特殊后缀标点）
-        2. 循环去除开头剩余的简单数字序号
+        2. 去除开头剩余的简单数字序号（最多两个）
         
         Args:
             translation_text_dict: 翻译文本字典
@@ -289,46 +294,26 @@ class ResponseExtractor:
         Returns:
             处理后的文本字典
         """
+        # 匹配模式：[可选空白][可选特殊前缀][数字序号][可选标点后缀][可选空白]，随后最多两个 数字. 序号
+        # - 特殊前缀：「『【……□ 等引号、省略号、方框等字符
+        # - 数字序号：支持 1. 或 1.2. 或 1.2.3. 等多级序号
+        # - 标点后缀：, ， 、等中英文标点
+        strip_prefix = ResponseExtractor.numbered_prefix_reg.sub
+        strip_trailing_bracket = ResponseExtractor.trailing_bracket_reg.sub
+
         output_dict = {}
         for key, value in translation_text_dict.items():
 
             if not isinstance(value, str):
                 output_dict[key] = value
                 continue
-                
-            translation_lines = value.split('\n')
-            cleaned_lines = []
-            
-            for i, line in enumerate(translation_lines):
-                temp_line = line
-                
-                # 第一步：去除各种变形序号
-                # 匹配模式：[可选空白][可选特殊前缀][数字序号][可选标点后缀][可选空白]
-                # - 特殊前缀：「『【……□ 等引号、省略号、方框等字符
-                # - 数字序号：支持 1. 或 1.2. 或 1.2.3. 等多级序号
-                # - 标点后缀：, ， 、等中英文标点
-                temp_line = re.sub(
-                    r'^\s*[「『【（\(……□\s]*\d+(\.\d+)*\.[,，、]?\s*',
-                    '',
-                    temp_line
-                )
-                
-                # 第二步：循环去除开头剩余的 数字. 格式
-                # 处理可能存在的嵌套或多余的数字序号
-                max_iterations = 2  # 设置最大迭代次数，防止意外无限循环
-                for iteration in range(max_iterations):
-                    new_line = re.sub(r'^\s*\d+\.\s*', '', temp_line)
-                    # 如果没有变化，说明已经清理完毕
-                    if new_line == temp_line:
-                        break
-                    temp_line = new_line
-                
-                cleaned_lines.append(temp_line)
-
-            processed_text = '\n'.join(cleaned_lines)
-
-            # 移除尾部的 "/n] 或 /n] (及其前面的空格)
-            final_text = re.sub(r'\s*"?\n]$', '', processed_text)
-            output_dict[key] = final_text
-            
+
+            if '\n' in value:
+                processed_text = '\n'.join([strip_prefix('', line, count=1) for line in value.split('\n')])
+                # 移除尾部的 "/n] 或 /n] (及其前面的空格)
+                output_dict[key] = strip_trailing_bracket('', processed_text, count=1)
+            else:
+                # 单行文本不可能以 "\n] 结尾
+                output_dict[key] = strip_prefix('', value, count=1)
+
         return output_dict
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+基于 inotify 的目录事件监听（仅 Linux）
+通过 ctypes 直接调用 libc，不依赖第三方库；不可用时由 WatchManager 回退到轮询扫描
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# inotify 事件掩码（见 <sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# 文件写入中 / 写入完成 / 离开目录
+WRITE_EVENTS = IN_CREATE | IN_MODIFY
+COMPLETE_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO
+REMOVE_EVENTS = IN_DELETE | IN_MOVED_FROM
+
+WATCH_MASK = (WRITE_EVENTS | COMPLETE_EVENTS | REMOVE_EVENTS
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+class InotifyWatcher:
+    """inotify 文件描述符的封装，按目录添加监听并读取事件"""
+
+    def __init__(self):
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._libc = libc
+        self.fd = fd
+        # 自唤醒管道：规则变化或停止时打断阻塞中的 read_events
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._paths: Dict[int, str] = {}  # wd -> 目录路径
+        self._wds: Dict[str, int] = {}  # 目录路径 -> wd
+
+    @classmethod
+    def is_supported(cls) -> bool:
+        """当前平台是否可以使用 inotify"""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            return hasattr(_load_libc(), "inotify_init1")
+        except OSError:
+            return False
+
+    def add_watch(self, directory: str) -> int:
+        """监听单个目录（不含子目录），失败时抛出 OSError（例如超过 max_user_watches）"""
+        directory = os.path.abspath(directory)
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), directory)
+        self._paths[wd] = directory
+        self._wds[directory] = wd
+        return wd
+
+    def remove_watch(self, directory: str):
+        wd = self._wds.pop(os.path.abspath(directory), None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def is_watched(self, directory: str) -> bool:
+        return os.path.abspath(directory) in self._wds
+
+    def read_events(self, timeout: Optional[float] = None) -> List[Tuple[str, int]]:
+        """
+        等待并读取事件
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待（可被 wake 打断）
+
+        Returns:
+            List[Tuple[str, int]]: (完整路径, 事件掩码)；队列溢出时返回 ("", IN_Q_OVERFLOW)
+        """
+        readable, _, _ = select.select([self.fd, self._wake_r], [], [], timeout)
+        if self._wake_r in readable:
+            try:
+                while os.read(self._wake_r, 512):
+                    pass
+            except BlockingIOError:
+                pass
+        if self.fd not in readable:
+            return []
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append(("", IN_Q_OVERFLOW))
+                continue
+
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                # 目录被删除或监听被移除，内核已自动释放该 wd
+                self._paths.pop(wd, None)
+                self._wds.pop(directory, None)
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            events.append((path, mask))
+        return events
+
+    def wake(self):
+        """让正在等待的 read_events 立即返回"""
+        try:
+            os.write(self._wake_w, b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self.fd = -1
+            self._paths.clear()
+            self._wds.clear()
@@ -11,6 +11,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Any, Set
 from ModuleFolders.Base.Base import Base
+from ModuleFolders.Infrastructure.Automation.InotifyWatcher import (
+    COMPLETE_EVENTS, IN_CREATE, IN_DELETE_SELF, IN_ISDIR, IN_MOVE_SELF, IN_MOVED_TO,
+    IN_Q_OVERFLOW, REMOVE_EVENTS, InotifyWatcher
+)
 
 
 class WatchRule:
@@ -93,6 +97,8 @@ class FileState:
         self.hash = ""
         self.first_seen = datetime.now()
         self.stable_since: Optional[datetime] = None
+        self.write_closed_at: Optional[float] = None  # 收到写入完成事件的时间（monotonic）
+        self.rule_id: Optional[str] = None
         self.status = "pending"  # pending, stable, processing, done, error
 
     def update(self) -> bool:
@@ -106,6 +112,7 @@ class FileState:
                 self.size = new_size
                 self.mtime = new_mtime
                 self.stable_since = None
+                self.write_closed_at = None
                 return True
             else:
                 if self.stable_since is None:
@@ -121,6 +128,17 @@ class FileState:
         elapsed = (datetime.now() - self.stable_since).total_seconds()
         return elapsed >= debounce_seconds
 
+    def mark_write_complete(self):
+        """收到写入完成事件（写句柄关闭或文件被移入目录）"""
+        self.update()
+        self.write_closed_at = time.monotonic()
+
+    def is_write_complete(self, settle_seconds: float) -> bool:
+        """写入完成后在去抖时间内没有新的写入"""
+        if self.write_closed_at is None:
+            return False
+        return time.monotonic() - self.write_closed_at >= settle_seconds
+
 
 class WatchManager(Base):
     """文件夹监控管理器"""
@@ -134,14 +152,17 @@ class WatchManager(Base):
         self.running = False
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._lock = threading.Lock()
+        # 可重入：队列模式下 _process_file 在持锁时调用 _mark_processed，任务线程则单独加锁
+        self._lock = threading.RLock()
 
         # 文件状态追踪
         self.file_states: Dict[str, FileState] = {}
         self.processed_files: Set[str] = set()
 
         # 配置
-        self.scan_interval = 10  # 扫描间隔（秒）
+        self.scan_interval = 10  # 扫描间隔（秒），inotify 模式下仅用于无法监听的规则
+        self.use_inotify = True  # Linux 下使用 inotify 事件代替轮询
+        self.event_settle_seconds = 0.5  # 写入完成事件后的去抖时间（秒）
         self.max_concurrent = 2  # 最大并发任务数
         self.current_tasks = 0
 
@@ -152,6 +173,12 @@ class WatchManager(Base):
         # 持久化已处理文件记录
         self.processed_file_path = ""
 
+        # inotify 状态
+        self.watch_backend = ""  # inotify / polling
+        self._watcher: Optional[InotifyWatcher] = None
+        self._rules_version = 0
+        self._dir_rules: Dict[str, Set[str]] = {}  # 被监听目录 -> 规则ID
+
     def set_callbacks(self, task_callback: Callable = None,
                       queue_callback: Callable = None):
         """设置回调函数"""
@@ -182,6 +209,7 @@ class WatchManager(Base):
                     pass
 
             self.rules[rule.id] = rule
+            self._notify_rules_changed()
             self._log("info", f"Watch rule added: {rule.watch_path}")
             return True
 
@@ -190,6 +218,7 @@ class WatchManager(Base):
         with self._lock:
             if rule_id in self.rules:
                 rule = self.rules.pop(rule_id)
+                self._notify_rules_changed()
                 self._log("info", f"Watch rule removed: {rule.watch_path}")
                 return True
             return False
@@ -204,8 +233,15 @@ class WatchManager(Base):
             for key, value in kwargs.items():
                 if hasattr(rule, key):
                     setattr(rule, key, value)
+            self._notify_rules_changed()
             return True
 
+    def _notify_rules_changed(self):
+        """规则变化后让 inotify 循环重新同步监听目录"""
+        self._rules_version += 1
+        if self._watcher:
+            self._watcher.wake()
+
     def get_rule(self, rule_id: str) -> Optional[WatchRule]:
         """获取规则"""
         return self.rules.get(rule_id)
@@ -233,13 +269,28 @@ class WatchManager(Base):
 
         self.running = False
         self._stop_event.set()
+        if self._watcher:
+            self._watcher.wake()
         if self._thread:
             self._thread.join(timeout=5)
         self._save_processed_files()
         self._log("info", "Watch manager stopped")
 
     def _watch_loop(self):
-        """监控主循环"""
+        """监控主循环：Linux 下优先使用 inotify 事件，不可用时轮询扫描"""
+        if self.use_inotify and InotifyWatcher.is_supported():
+            try:
+                watcher = InotifyWatcher()
+            except OSError as e:
+                self._log("warning", f"inotify unavailable, falling back to polling: {e}")
+            else:
+                self._inotify_loop(watcher)
+                return
+        self._poll_loop()
+
+    def _poll_loop(self):
+        """轮询模式：每隔 scan_interval 完整扫描一次监控目录"""
+        self.watch_backend = "polling"
         while not self._stop_event.is_set():
             try:
                 with self._lock:
@@ -254,6 +305,182 @@ class WatchManager(Base):
                 self._log("error", f"Watch loop error: {e}")
                 time.sleep(30)
 
+    def _inotify_loop(self, watcher: InotifyWatcher):
+        """inotify 模式：空闲时阻塞等待内核事件，只在有待定文件时定期复查"""
+        self.watch_backend = "inotify"
+        self._watcher = watcher
+        rules_version = None
+        polled_rules: Set[str] = set()
+        next_scan = 0.0
+
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    with self._lock:
+                        if rules_version != self._rules_version:
+                            rules_version = self._rules_version
+                            polled_rules = self._sync_watches(watcher)
+                            # 完整扫描一次，收录监听建立前已存在的文件
+                            self._scan_enabled_rules()
+                            next_scan = time.monotonic() + self.scan_interval
+
+                        # 有待定文件时按去抖间隔复查，否则一直等待事件
+                        timeouts = []
+                        if any(state.status == "pending" for state in list(self.file_states.values())):
+                            timeouts.append(self.event_settle_seconds)
+                        if polled_rules:
+                            timeouts.append(max(0.0, next_scan - time.monotonic()))
+                        timeout = min(timeouts) if timeouts else None
+
+                    events = watcher.read_events(timeout)
+
+                    with self._lock:
+                        if self._handle_events(watcher, events):
+                            # 事件队列溢出，可能丢失了事件，完整扫描一次补齐
+                            self._log("warning", "inotify event queue overflowed, rescanning")
+                            self._scan_enabled_rules()
+                        self._check_pending_files()
+
+                        # 无法建立监听的规则（例如超过 max_user_watches）继续轮询
+                        if polled_rules and time.monotonic() >= next_scan:
+                            for rule_id in polled_rules:
+                                rule = self.rules.get(rule_id)
+                                if rule and rule.enabled:
+                                    self._scan_directory(rule)
+                            next_scan = time.monotonic() + self.scan_interval
+
+                except Exception as e:
+                    self._log("error", f"Watch loop error: {e}")
+                    self._stop_event.wait(30)
+        finally:
+            self._watcher = None
+            watcher.close()
+
+    def _scan_enabled_rules(self):
+        for rule in self.rules.values():
+            if rule.enabled:
+                self._scan_directory(rule)
+
+    def _sync_watches(self, watcher: InotifyWatcher) -> Set[str]:
+        """
+        按当前规则重建目录监听
+
+        Returns:
+            Set[str]: 无法建立监听、需要继续轮询的规则ID
+        """
+        dir_rules: Dict[str, Set[str]] = {}
+        for rule in self.rules.values():
+            if not rule.enabled:
+                continue
+            for directory in self._rule_directories(rule.watch_path, rule):
+                dir_rules.setdefault(directory, set()).add(rule.id)
+
+        for directory in list(self._dir_rules):
+            if directory not in dir_rules:
+                watcher.remove_watch(directory)
+
+        polled_rules: Set[str] = set()
+        self._dir_rules = {}
+        for directory, rule_ids in dir_rules.items():
+            if rule_ids <= polled_rules:
+                continue
+            try:
+                if not watcher.is_watched(directory):
+                    watcher.add_watch(directory)
+                self._dir_rules[directory] = rule_ids
+            except OSError as e:
+                self._log("warning", f"Cannot watch {directory}, polling instead: {e}")
+                polled_rules |= rule_ids
+        return polled_rules
+
+    def _rule_directories(self, directory: str, rule: WatchRule) -> List[str]:
+        """规则需要监听的目录：递归规则包含全部子目录（排除输出目录和完成目录）"""
+        if not rule.recursive:
+            return [directory]
+        result = []
+        for root, dirs, _ in os.walk(directory):
+            dirs[:] = [d for d in dirs if
+                       os.path.join(root, d) not in [rule.output_path, rule.done_path]]
+            result.append(root)
+        return result
+
+    def _handle_events(self, watcher: InotifyWatcher, events: List[tuple]) -> bool:
+        """处理 inotify 事件，返回是否发生了事件队列溢出"""
+        overflow = False
+        for path, mask in events:
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+
+            directory, filename = os.path.split(path)
+
+            # 被监听的目录本身被删除或移走
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                watcher.remove_watch(path)
+                self._dir_rules.pop(path, None)
+                continue
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_new_directory(watcher, path)
+                continue
+
+            if mask & REMOVE_EVENTS:
+                state = self.file_states.get(path)
+                if state and state.status == "pending":
+                    del self.file_states[path]
+                continue
+
+            rule = self._match_rule(directory, filename)
+            if rule is None or self._get_file_key(path) in self.processed_files:
+                continue
+
+            state = self.file_states.get(path)
+            if state is None:
+                state = self.file_states[path] = FileState(path)
+                state.rule_id = rule.id
+            if mask & COMPLETE_EVENTS:
+                state.mark_write_complete()
+            else:
+                state.update()
+        return overflow
+
+    def _match_rule(self, directory: str, filename: str) -> Optional[WatchRule]:
+        for rule_id in self._dir_rules.get(directory, ()):
+            rule = self.rules.get(rule_id)
+            if rule and rule.enabled and rule.matches_pattern(filename):
+                return rule
+        return None
+
+    def _watch_new_directory(self, watcher: InotifyWatcher, path: str):
+        """递归规则下新建的子目录：加入监听并收录监听建立前写入的文件"""
+        parent = os.path.dirname(path)
+        for rule_id in list(self._dir_rules.get(parent, ())):
+            rule = self.rules.get(rule_id)
+            if not rule or not rule.recursive or path in [rule.output_path, rule.done_path]:
+                continue
+            for directory in self._rule_directories(path, rule):
+                try:
+                    if not watcher.is_watched(directory):
+                        watcher.add_watch(directory)
+                except OSError as e:
+                    self._log("warning", f"Cannot watch {directory}: {e}")
+                    continue
+                self._dir_rules.setdefault(directory, set()).add(rule.id)
+            for file_path in self._scan_recursive(path, rule):
+                self._process_file(file_path, rule)
+
+    def _check_pending_files(self):
+        """复查待定文件，写入完成的文件交给 _process_file 派发"""
+        for file_path, state in list(self.file_states.items()):
+            if state.status != "pending":
+                continue
+            rule = self.rules.get(state.rule_id)
+            if rule is None or not rule.enabled or not os.path.exists(file_path):
+                del self.file_states[file_path]
+                continue
+            self._process_file(file_path, rule)
+
     def _scan_directory(self, rule: WatchRule):
         """扫描目录"""
         try:
@@ -307,12 +534,18 @@ class WatchManager(Base):
             self.file_states[file_path] = FileState(file_path)
 
         state = self.file_states[file_path]
+        state.rule_id = rule.id
+        if state.status == "processing":
+            return
 
         # 更新状态
         state.update()
 
-        # 检查文件是否稳定
-        if not state.is_stable(rule.debounce_seconds):
+        # 检查文件是否写入完成：收到写入完成事件时只需短暂去抖，否则等待大小与修改时间稳定
+        if state.write_closed_at is not None:
+            if not state.is_write_complete(self.event_settle_seconds):
+                return
+        elif not state.is_stable(rule.debounce_seconds):
             return
 
         # 检查并发限制
@@ -356,8 +589,9 @@ class WatchManager(Base):
                 self.current_tasks -= 1
 
     def _execute_task(self, file_path: str, rule: WatchRule, task_config: dict):
-        """执行任务"""
-        state = self.file_states.get(file_path)
+        """执行任务（在任务线程中运行，访问共享状态时需持有 _lock）"""
+        with self._lock:
+            state = self.file_states.get(file_path)
         try:
             self.task_callback(task_config)
             self._mark_processed(file_path, rule, "done")
@@ -365,23 +599,26 @@ class WatchManager(Base):
         except Exception as e:
             self._log("error", f"Task failed: {os.path.basename(file_path)} - {e}")
             if state:
-                state.status = "error"
+                with self._lock:
+                    state.status = "error"
         finally:
-            self.current_tasks -= 1
+            with self._lock:
+                self.current_tasks -= 1
 
     def _mark_processed(self, file_path: str, rule: WatchRule, status: str):
         """标记文件已处理"""
         file_key = self._get_file_key(file_path)
-        self.processed_files.add(file_key)
+        with self._lock:
+            self.processed_files.add(file_key)
 
-        state = self.file_states.get(file_path)
-        if state:
-            state.status = status
+            state = self.file_states.get(file_path)
+            if state:
+                state.status = status
 
-        rule.files_processed += 1
-        rule.last_activity = datetime.now()
+            rule.files_processed += 1
+            rule.last_activity = datetime.now()
 
-        # 移动到完成目录
+        # 移动到完成目录（不持锁，避免大文件移动阻塞监听循环）
         if rule.move_to_done and rule.done_path and status == "done":
             try:
                 dest = os.path.join(rule.done_path, os.path.basename(file_path))
@@ -395,8 +632,8 @@ class WatchManager(Base):
                 self._log("warning", f"Failed to move file: {e}")
 
         # 清理状态
-        if file_path in self.file_states:
-            del self.file_states[file_path]
+        with self._lock:
+            self.file_states.pop(file_path, None)
 
     def _get_file_key(self, file_path: str) -> str:
         """生成文件唯一标识"""
@@ -459,6 +696,7 @@ class WatchManager(Base):
 
         self.scan_interval = watch_config.get("scan_interval", 10)
         self.max_concurrent = watch_config.get("max_concurrent", 2)
+        self.use_inotify = watch_config.get("use_inotify", True)
 
         rules_data = watch_config.get("rules", [])
         for rule_data in rules_data:
@@ -479,11 +717,13 @@ class WatchManager(Base):
         config["watch_mode"]["enabled"] = self.running
         config["watch_mode"]["scan_interval"] = self.scan_interval
         config["watch_mode"]["max_concurrent"] = self.max_concurrent
+        config["watch_mode"]["use_inotify"] = self.use_inotify
 
     def get_status(self) -> dict:
         """获取监控状态"""
         return {
             "running": self.running,
+            "backend": self.watch_backend,
             "rule_count": len(self.rules),
             "enabled_count": sum(1 for r in self.rules.values() if r.enabled),
             "pending_files": len([s for s in self.file_states.values()
@@ -11,6 +11,7 @@ import rapidjson as json
 
 from ModuleFolders.Base.Base import Base
 from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
+from ModuleFolders.Infrastructure.Metrics.StageMetrics import get_stage_metrics
 from ModuleFolders.Infrastructure.Cache.CacheFile import CacheFile
 from ModuleFolders.Infrastructure.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Infrastructure.Cache.CacheProject import (
@@ -97,7 +98,7 @@ class CacheManager(Base):
         # 定义临时文件路径，确保在同一文件系统下以支持原子性替换
         tmp_path = path + f".{os.getpid()}.tmp"
 
-        with self.file_lock:
+        with self.file_lock, get_stage_metrics().timer("cache_save"):
             try:
                 os.makedirs(cache_dir, exist_ok=True)
                 content_bytes = msgspec.json.encode(self.project)
@@ -20,6 +20,8 @@ from ModuleFolders.Base.Base import Base
 from ModuleFolders.Infrastructure.LLMRequester.AsyncOpenaiRequester import AsyncOpenaiRequester
 from ModuleFolders.Infrastructure.LLMRequester.ErrorClassifier import ErrorClassifier, ErrorType
 from ModuleFolders.Infrastructure.LLMRequester.AsyncSignalHub import get_signal_hub
+from ModuleFolders.Infrastructure.LLMRequester.ResponseCache import get_response_cache
+from ModuleFolders.Infrastructure.RequestLimiter.ConcurrencyController import get_concurrency_controller
 
 
 class AsyncLLMRequester(Base):
@@ -86,19 +88,33 @@ class AsyncLLMRequester(Base):
         self,
         messages: list,
         system_prompt: str,
-        platform_config: dict
+        platform_config: dict,
+        use_cache: bool = False
     ) -> Tuple[bool, str, str, int, int]:
         """
         异步分发请求到对应平台
 
+        Args:
+            use_cache: 开启了响应缓存时，相同请求直接返回缓存的回复，在途的相同请求只发送一次
+
         Returns:
             tuple: (skip, think, content, prompt_tokens, completion_tokens)
         """
         config = self.load_config()
+        if use_cache and config.get("enable_response_cache", False):
+            return await get_response_cache().request_async(
+                messages,
+                system_prompt,
+                platform_config,
+                lambda: self.send_request_async(messages, system_prompt, platform_config),
+            )
+
         max_retries = 3 if config.get("enable_retry_backoff", True) else 1
         current_retry = 0
         backoff_delay = 2
         signal_hub = get_signal_hub()
+        # 只在实际发出的请求后反馈给自适应并发控制器，缓存命中与合并的相同请求不会走到这里
+        controller = get_concurrency_controller()
 
         while current_retry < max_retries:
             # 检查停止信号
@@ -129,6 +145,7 @@ class AsyncLLMRequester(Base):
                     result = await requester.request_openai_async(messages, system_prompt, platform_config)
 
                 skip, think, content, pt, ct = result
+                controller.record_outcome(platform_config, skip, content)
                 if not skip:
                     return result
 
@@ -140,6 +157,7 @@ class AsyncLLMRequester(Base):
 
             except Exception as e:
                 error_str = str(e)
+                controller.record_outcome(platform_config, True, error_str)
                 error_type, _ = ErrorClassifier.classify(error_str)
 
                 if error_type == ErrorType.HARD_ERROR:
@@ -24,6 +24,7 @@ from ModuleFolders.Infrastructure.LLMRequester.ErrorClassifier import ErrorClass
 from ModuleFolders.Infrastructure.LLMRequester.ProviderFingerprint import ProviderFingerprint, FeatureSupport
 from ModuleFolders.Infrastructure.LLMRequester.AsyncSignalHub import get_signal_hub
 from ModuleFolders.Infrastructure.LLMRequester.LLMClientFactory import LLMClientFactory
+from ModuleFolders.Infrastructure.RequestLimiter.ConcurrencyController import get_concurrency_controller
 
 
 class AsyncOpenaiRequester(Base):
@@ -166,6 +167,7 @@ class AsyncOpenaiRequester(Base):
             headers=headers,
             timeout=timeout
         ) as resp:
+            get_concurrency_controller().observe_headers(api_key, resp.headers)
             if resp.status != 200:
                 error_text = await resp.text()
                 raise Exception(f"HTTP {resp.status}: {error_text}")
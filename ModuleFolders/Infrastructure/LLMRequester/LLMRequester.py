@@ -7,6 +7,8 @@ from ModuleFolders.Infrastructure.LLMRequester.AnthropicRequester import Anthrop
 from ModuleFolders.Infrastructure.LLMRequester.AmazonbedrockRequester import AmazonbedrockRequester
 from ModuleFolders.Infrastructure.LLMRequester.OpenaiRequester import OpenaiRequester
 from ModuleFolders.Infrastructure.LLMRequester.DashscopeRequester import DashscopeRequester
+from ModuleFolders.Infrastructure.LLMRequester.ResponseCache import get_response_cache
+from ModuleFolders.Infrastructure.RequestLimiter.ConcurrencyController import get_concurrency_controller
 
 # 接口请求器
 class LLMRequester():
@@ -14,10 +16,19 @@ class LLMRequester():
         pass
 
     # 分发请求
-    def sent_request(self, messages: list[dict], system_prompt: str, platform_config: dict) -> tuple[bool, str, str, int, int]:
+    # use_cache 为 True 且开启了响应缓存时，相同请求直接返回缓存的回复，在途的相同请求只发送一次
+    def sent_request(self, messages: list[dict], system_prompt: str, platform_config: dict, use_cache: bool = False) -> tuple[bool, str, str, int, int]:
         from ModuleFolders.Base.Base import Base
         config = Base().load_config()
-        
+
+        if use_cache and config.get("enable_response_cache", False):
+            return get_response_cache().request(
+                messages,
+                system_prompt,
+                platform_config,
+                lambda: self.sent_request(messages, system_prompt, platform_config),
+            )
+
         max_retries = 3 if config.get("enable_retry_backoff", True) else 1
         current_retry = 0
         backoff_delay = 2 # Initial 2s delay
@@ -96,7 +107,10 @@ class LLMRequester():
                     system_prompt,
                     platform_config,
                 )
-            
+
+            # 把结果反馈给自适应并发控制器
+            get_concurrency_controller().record_outcome(platform_config, skip, response_content)
+
             if not skip:
                 return skip, response_think, response_content, prompt_tokens, completion_tokens
             
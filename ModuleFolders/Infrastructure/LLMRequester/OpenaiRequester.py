@@ -3,6 +3,7 @@ from ModuleFolders.Base.Base import Base
 from ModuleFolders.Infrastructure.LLMRequester.LLMClientFactory import LLMClientFactory
 from ModuleFolders.Infrastructure.LLMRequester.ErrorClassifier import ErrorClassifier, ErrorType
 from ModuleFolders.Infrastructure.LLMRequester.ProviderFingerprint import ProviderFingerprint
+from ModuleFolders.Infrastructure.RequestLimiter.ConcurrencyController import get_concurrency_controller
 
 
 # 接口请求器
@@ -98,6 +99,7 @@ class OpenaiRequester(Base):
 
         with httpx.Client(timeout=request_timeout) as http_client:
             resp = http_client.post(api_url, json=request_body, headers=auth_headers)
+            get_concurrency_controller().observe_headers(api_key, resp.headers)
 
             if resp.status_code != 200:
                 raise Exception(f"HTTP {resp.status_code}: {resp.text}")
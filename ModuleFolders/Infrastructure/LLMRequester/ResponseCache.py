@@ -0,0 +1,252 @@
+"""
+LLM 响应缓存
+
+以 (平台, 模型, 完整消息, 采样参数) 的哈希为键，把成功的回复保存到本地 SQLite：
+- 再次发送相同请求（重跑、重试、重复的文本块）时直接返回保存的回复，不消耗 Token
+- 相同请求正在进行时，其他调用方等待它的结果，不重复发送
+- 回复未通过译文检查时由调用方 invalidate，下一轮会重新请求
+
+在途合并只在当前进程内生效；多个进程共用缓存文件时，各自发出的相同请求都会写入同一条记录。
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+CACHE_PATH = os.path.join(".", "Resource", "llm_cache", "responses.db")
+KEY_VERSION = 1  # 键的组成变化时递增，使旧记录自然失效
+
+# 影响模型输出的平台参数，API Key、超时、流式等传输相关设置不参与计算
+KEY_PLATFORM_FIELDS = (
+    "target_platform",
+    "api_url",
+    "api_format",
+    "model_name",
+    "temperature",
+    "top_p",
+    "presence_penalty",
+    "frequency_penalty",
+    "extra_body",
+    "think_switch",
+    "think_depth",
+    "thinking_budget",
+    "structured_output_mode",
+    "auto_complete",
+)
+
+RequestResult = Tuple[bool, str, str, int, int]
+
+
+class ResponseCache:
+    """LLM 响应的磁盘缓存与在途请求合并"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db_lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "stored": 0, "invalidated": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL 允许多个进程同时读写同一个缓存文件
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " think TEXT,"
+            " content TEXT NOT NULL,"
+            " prompt_tokens INTEGER NOT NULL DEFAULT 0,"
+            " completion_tokens INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(messages: list, system_prompt: str, platform_config: dict) -> str:
+        """计算请求的内容哈希"""
+        payload = {
+            "version": KEY_VERSION,
+            "platform": {field: platform_config.get(field) for field in KEY_PLATFORM_FIELDS},
+            "system_prompt": system_prompt,
+            "messages": messages,
+        }
+        serialized = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[RequestResult]:
+        """读取缓存的回复，命中时 Token 记为 0"""
+        with self._db_lock:
+            row = self._conn.execute("SELECT think, content FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return False, row[0] or "", row[1], 0, 0
+
+    def put(self, key: str, result: RequestResult) -> None:
+        """保存成功且内容非空的回复"""
+        skip, think, content, prompt_tokens, completion_tokens = result
+        if skip or not content or not content.strip():
+            return
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, think, content, prompt_tokens, completion_tokens, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, think, content, prompt_tokens or 0, completion_tokens or 0, time.time()),
+            )
+        self._count("stored")
+
+    def invalidate(self, messages: list, system_prompt: str, platform_config: dict) -> None:
+        """删除某个请求的缓存（回复未通过检查时调用）"""
+        key = self.make_key(messages, system_prompt, platform_config)
+        with self._db_lock:
+            deleted = self._conn.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount
+        if deleted:
+            self._count("invalidated")
+
+    def clear(self) -> None:
+        """清空全部缓存"""
+        with self._db_lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        """命中、未命中、合并等计数，以及缓存的记录数"""
+        with self._db_lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._inflight_lock:
+            counters = dict(self._counters)
+            counters["inflight"] = len(self._inflight)
+        counters["entries"] = entries
+        return counters
+
+    def request(
+        self,
+        messages: list,
+        system_prompt: str,
+        platform_config: dict,
+        send: Callable[[], RequestResult],
+    ) -> RequestResult:
+        """
+        带缓存地发送请求
+
+        Args:
+            send: 未命中时实际发送请求的函数
+        """
+        key = self.make_key(messages, system_prompt, platform_config)
+        cached, future, leader = self._acquire(key)
+        if cached is not None:
+            return cached
+        if not leader:
+            return self._follower_result(future.result())
+
+        try:
+            result = send()
+        except BaseException as e:
+            self._release(key, future, exception=e)
+            raise
+        self._store(key, result)
+        self._release(key, future, result=result)
+        return result
+
+    async def request_async(
+        self,
+        messages: list,
+        system_prompt: str,
+        platform_config: dict,
+        send: Callable[[], Awaitable[RequestResult]],
+    ) -> RequestResult:
+        """request 的异步版本，与同步调用方共享在途请求"""
+        key = self.make_key(messages, system_prompt, platform_config)
+        cached, future, leader = self._acquire(key)
+        if cached is not None:
+            return cached
+        if not leader:
+            return self._follower_result(await asyncio.wrap_future(future))
+
+        try:
+            result = await send()
+        except BaseException as e:
+            self._release(key, future, exception=e)
+            raise
+        self._store(key, result)
+        self._release(key, future, result=result)
+        return result
+
+    def _acquire(self, key: str) -> Tuple[Optional[RequestResult], Optional[Future], bool]:
+        """
+        查找缓存或加入在途请求
+
+        Returns:
+            (缓存的结果, 在途请求的 Future, 是否由当前调用方发送请求)
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached, None, False
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counters["coalesced"] += 1
+                return None, future, False
+            future = Future()
+            self._inflight[key] = future
+
+        # 查询缓存与登记在途请求之间，上一个相同请求可能刚好完成并写入
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hits")
+            self._release(key, future, result=cached)
+            return cached, None, False
+
+        self._count("misses")
+        return None, future, True
+
+    def _store(self, key: str, result: RequestResult) -> None:
+        try:
+            self.put(key, result)
+        except sqlite3.Error:
+            # 缓存写入失败不影响本次请求
+            pass
+
+    def _release(self, key: str, future: Future, result: RequestResult = None, exception: BaseException = None) -> None:
+        """结束在途请求并唤醒等待同一请求的调用方"""
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        if exception is None:
+            future.set_result(result)
+        else:
+            future.set_exception(exception)
+
+    @staticmethod
+    def _follower_result(result: RequestResult) -> RequestResult:
+        """等待方拿到的结果：成功时 Token 已由发送方计入，这里记为 0"""
+        skip, think, content, _, _ = result
+        if skip:
+            return result
+        return skip, think, content, 0, 0
+
+    def _count(self, name: str) -> None:
+        with self._inflight_lock:
+            self._counters[name] += 1
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """获取全局响应缓存实例（首次调用时打开缓存文件）"""
+    global _response_cache
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(CACHE_PATH)
+    return _response_cache
@@ -0,0 +1,286 @@
+"""
+翻译流水线的阶段耗时指标
+
+各阶段（提示词构建、Token 计算、限流等待、HTTP 请求、回复提取与检查、缓存写入、插件事件等）的耗时记录到
+固定分桶的直方图中，另有少量计数器。每次记录只有一次二分查找和一次加锁，不保存原始样本。
+
+- 指标在进程内累计，WebServer 的 /metrics 以 Prometheus 文本格式输出
+- 任务在 WebServer 启动的工作进程中执行时，定时把快照推送到 /api/internal/update_metrics
+- 每次任务结束时，把本次任务的增量写入输出目录下的 cache/metrics_summary.json
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+# 直方图分桶上限（秒），覆盖从文本处理（毫秒级）到长回复（分钟级）的范围
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+METRIC_PREFIX = "translateflow"
+STAGE_METRIC = f"{METRIC_PREFIX}_stage_duration_seconds"
+PUSH_INTERVAL = 5.0  # 工作进程推送快照的间隔（秒）
+
+COUNTER_HELP = {
+    f"{METRIC_PREFIX}_requests_total": "LLM requests made by translation tasks, by result",
+    f"{METRIC_PREFIX}_lines_total": "Lines returned by translation tasks, by result",
+    f"{METRIC_PREFIX}_tokens_total": "Tokens reported by the LLM APIs, by kind",
+    f"{METRIC_PREFIX}_tasks_total": "Translation tasks finished, by result",
+}
+
+
+class Histogram:
+    """固定分桶的耗时直方图"""
+
+    __slots__ = ("_lock", "counts", "total", "count")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(BUCKETS) + 1)  # 最后一个为 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"counts": list(self.counts), "sum": self.total, "count": self.count}
+
+
+class StageTimer:
+    """记录一段代码耗时的上下文管理器"""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class StageMetrics:
+    """进程内的阶段耗时直方图与计数器"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._push_thread: Optional[threading.Thread] = None
+
+    def _histogram(self, stage: str) -> Histogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram())
+        return histogram
+
+    def timer(self, stage: str) -> StageTimer:
+        """with get_stage_metrics().timer("prompt_build"): ..."""
+        return StageTimer(self._histogram(stage))
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """记录一次已测得的耗时"""
+        self._histogram(stage).observe(seconds)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """计数器累加，name 不含前缀"""
+        series = _series_key(f"{METRIC_PREFIX}_{name}", labels)
+        with self._lock:
+            self._counters[series] = self._counters.get(series, 0) + value
+
+    def snapshot(self) -> dict:
+        """当前累计值，可序列化为 JSON"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        return {
+            "buckets": list(BUCKETS),
+            "histograms": {stage: histogram.snapshot() for stage, histogram in histograms.items()},
+            "counters": counters,
+        }
+
+    def start_push(self, api_url: str, source: str) -> None:
+        """在后台定时把快照推送给 WebServer（已在推送时不重复启动）"""
+        with self._lock:
+            if self._push_thread is not None and self._push_thread.is_alive():
+                return
+            self._push_thread = threading.Thread(
+                target=self._push_loop, args=(api_url, source), name="stage-metrics-push", daemon=True
+            )
+            self._push_thread.start()
+
+    def push(self, api_url: str, source: str) -> bool:
+        """推送一次快照，WebServer 不可用时返回 False"""
+        try:
+            import requests
+            response = requests.post(
+                f"{api_url}/api/internal/update_metrics",
+                json={"source": source, "snapshot": self.snapshot()},
+                timeout=1.0,
+            )
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    def _push_loop(self, api_url: str, source: str) -> None:
+        while True:
+            time.sleep(PUSH_INTERVAL)
+            self.push(api_url, source)
+
+
+def _series_key(name: str, labels: dict) -> str:
+    if not labels:
+        return name
+    label_text = ",".join(f'{key}="{_escape_label(str(value))}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{label_text}}}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _metric_name(series: str) -> str:
+    return series.split("{", 1)[0]
+
+
+def merge_snapshots(snapshots: Iterable[dict]) -> dict:
+    """把多个进程的快照相加（分桶不同的快照会被跳过）"""
+    merged = {"buckets": list(BUCKETS), "histograms": {}, "counters": {}}
+    for snapshot in snapshots:
+        if not snapshot or snapshot.get("buckets") != list(BUCKETS):
+            continue
+        for stage, data in snapshot.get("histograms", {}).items():
+            target = merged["histograms"].setdefault(stage, {"counts": [0] * (len(BUCKETS) + 1), "sum": 0.0, "count": 0})
+            target["counts"] = [a + b for a, b in zip(target["counts"], data["counts"])]
+            target["sum"] += data["sum"]
+            target["count"] += data["count"]
+        for series, value in snapshot.get("counters", {}).items():
+            merged["counters"][series] = merged["counters"].get(series, 0) + value
+    return merged
+
+
+def diff_snapshots(after: dict, before: dict) -> dict:
+    """两个快照之间的增量，用于统计单次任务"""
+    before_histograms = before.get("histograms", {})
+    before_counters = before.get("counters", {})
+    histograms = {}
+    for stage, data in after.get("histograms", {}).items():
+        previous = before_histograms.get(stage)
+        if previous is None:
+            histograms[stage] = data
+            continue
+        count = data["count"] - previous["count"]
+        if count > 0:
+            histograms[stage] = {
+                "counts": [a - b for a, b in zip(data["counts"], previous["counts"])],
+                "sum": data["sum"] - previous["sum"],
+                "count": count,
+            }
+    counters = {
+        series: value - before_counters.get(series, 0)
+        for series, value in after.get("counters", {}).items()
+        if value != before_counters.get(series, 0)
+    }
+    return {"buckets": after.get("buckets", list(BUCKETS)), "histograms": histograms, "counters": counters}
+
+
+def estimate_quantile(counts: List[int], quantile: float) -> float:
+    """按分桶线性插值估算分位数（秒），与 Prometheus 的 histogram_quantile 一致"""
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    rank = quantile * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if cumulative + count >= rank and count > 0:
+            if index >= len(BUCKETS):
+                return BUCKETS[-1]
+            lower = BUCKETS[index - 1] if index > 0 else 0.0
+            upper = BUCKETS[index]
+            return lower + (upper - lower) * (rank - cumulative) / count
+        cumulative += count
+    return BUCKETS[-1]
+
+
+def build_summary(delta: dict, wall_seconds: float) -> dict:
+    """单次任务的指标摘要：各阶段次数、总耗时、平均与分位耗时，以及计数器"""
+    stages = {}
+    for stage, data in sorted(delta.get("histograms", {}).items(), key=lambda item: -item[1]["sum"]):
+        count = data["count"]
+        stages[stage] = {
+            "count": count,
+            "total_seconds": round(data["sum"], 3),
+            "mean_ms": round(data["sum"] / count * 1000, 3) if count else 0.0,
+            "p50_ms": round(estimate_quantile(data["counts"], 0.5) * 1000, 3),
+            "p90_ms": round(estimate_quantile(data["counts"], 0.9) * 1000, 3),
+            "p99_ms": round(estimate_quantile(data["counts"], 0.99) * 1000, 3),
+        }
+    return {
+        "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "wall_seconds": round(wall_seconds, 3),
+        "stages": stages,
+        "counters": dict(sorted(delta.get("counters", {}).items())),
+    }
+
+
+def write_summary(path: str, summary: dict) -> None:
+    """原子写入摘要文件"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + f".{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as writer:
+            json.dump(summary, writer, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def render_prometheus(snapshot: dict) -> str:
+    """把快照渲染为 Prometheus 文本格式"""
+    lines = [
+        f"# HELP {STAGE_METRIC} Time spent in each translation pipeline stage",
+        f"# TYPE {STAGE_METRIC} histogram",
+    ]
+    bounds = [repr(float(bound)) for bound in BUCKETS] + ["+Inf"]
+    for stage, data in sorted(snapshot.get("histograms", {}).items()):
+        stage_label = _escape_label(stage)
+        cumulative = 0
+        for bound, count in zip(bounds, data["counts"]):
+            cumulative += count
+            lines.append(f'{STAGE_METRIC}_bucket{{stage="{stage_label}",le="{bound}"}} {cumulative}')
+        lines.append(f'{STAGE_METRIC}_sum{{stage="{stage_label}"}} {data["sum"]!r}')
+        lines.append(f'{STAGE_METRIC}_count{{stage="{stage_label}"}} {data["count"]}')
+
+    counters: Dict[str, List[str]] = {}
+    for series in sorted(snapshot.get("counters", {})):
+        counters.setdefault(_metric_name(series), []).append(series)
+    for name, series_list in counters.items():
+        lines.append(f"# HELP {name} {COUNTER_HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} counter")
+        for series in series_list:
+            value = snapshot["counters"][series]
+            lines.append(f"{series} {int(value) if float(value).is_integer() else value}")
+    return "\n".join(lines) + "\n"
+
+
+_stage_metrics = StageMetrics()
+
+
+def get_stage_metrics() -> StageMetrics:
+    """获取进程内的全局指标实例"""
+    return _stage_metrics
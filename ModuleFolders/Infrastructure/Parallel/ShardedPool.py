@@ -0,0 +1,72 @@
+"""
+按分片在进程池中执行的 CPU 密集型检查
+
+规则检查（TranslationChecker 的预编译规则、校对的 RuleBasedChecker）逐条处理大量文本，
+条目较多时按分片交给进程池，结果按原顺序合并：
+- 条目少于 PARALLEL_MIN_ITEMS、只有一个进程或在打包后的程序中运行时，直接在当前进程处理
+- 检查状态（规则集、检查器）通过进程池的 initializer 传给每个工作进程一次，而不是随每个分片传输
+- 无法创建子进程（受限环境等）时退回当前进程
+
+本模块只依赖标准库，工作进程导入它时不会加载其他模块。
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+PARALLEL_MIN_ITEMS = 20000  # 少于此数量时在当前进程检查，进程池的启动开销更大
+MIN_SHARD_SIZE = 2000
+
+# 分片函数：(检查状态, 分片) -> [(分片内序号, 结果)]，只需返回有结果的条目
+ShardFunction = Callable[[Any, Sequence], List[Tuple[int, Any]]]
+
+
+def run_sharded(items: Sequence, state: Any, shard_fn: ShardFunction, max_workers: int = None) -> Dict[int, Any]:
+    """
+    用 shard_fn 处理全部条目，条目较多时使用进程池
+
+    shard_fn 与 state 都需要能被 pickle（模块级函数或类中定义的方法）。
+
+    Returns:
+        条目序号 -> 结果，只包含 shard_fn 返回的条目
+    """
+    workers = max_workers or os.cpu_count() or 1
+    # 打包后的程序没有调用 freeze_support，不能创建子进程
+    if workers <= 1 or len(items) < PARALLEL_MIN_ITEMS or getattr(sys, "frozen", False):
+        return dict(shard_fn(state, items))
+
+    # 分片数为进程数的 4 倍，平衡各进程的负载
+    shard_size = max(MIN_SHARD_SIZE, -(-len(items) // (workers * 4)))
+    offsets = range(0, len(items), shard_size)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(offsets)), initializer=_init_worker, initargs=(state,)
+        ) as executor:
+            shard_results = executor.map(
+                partial(_run_shard_in_worker, shard_fn), (items[offset:offset + shard_size] for offset in offsets)
+            )
+            return {
+                offset + index: result
+                for offset, results in zip(offsets, shard_results)
+                for index, result in results
+            }
+    except (OSError, BrokenProcessPool):
+        # 无法创建子进程（受限环境等）时退回当前进程
+        return dict(shard_fn(state, items))
+
+
+_worker_state: Optional[Any] = None
+
+
+def _init_worker(state: Any):
+    """初始化工作进程，检查状态只传输一次"""
+    global _worker_state
+    _worker_state = state
+
+
+def _run_shard_in_worker(shard_fn: ShardFunction, shard: Sequence) -> List[Tuple[int, Any]]:
+    """在工作进程中处理一个分片"""
+    return shard_fn(_worker_state, shard)
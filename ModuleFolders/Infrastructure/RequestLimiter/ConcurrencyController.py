@@ -0,0 +1,246 @@
+"""
+自适应并发控制器（AIMD）
+
+按 平台 + API Key 维护各自的并发窗口：
+- 请求成功时加性增长，每成功一整个窗口的请求，窗口 +1
+- 触发限流（429 / rate limit / overloaded）时乘性减半，并按 retry-after 暂停该 Key
+- 响应头中的 x-ratelimit-remaining 为 0 时停止增长，并等待到 reset 时间
+
+平台的并发上限为其所有 Key 窗口之和，且不超过用户设置的线程数。
+同一进程内向同一平台发送请求的调用方（翻译任务、文本直译）通过 try_acquire / release 共用在途名额。
+"""
+
+import hashlib
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from ModuleFolders.Infrastructure.LLMRequester.ErrorClassifier import ErrorClassifier
+
+
+class AIMDWindow:
+    """单个 Key 的并发窗口"""
+
+    def __init__(self, size: float):
+        self.size = size
+        self.blocked_until = 0.0  # 限流暂停截止时间（monotonic）
+        self.last_decrease = 0.0  # 上次减半时间，同一批并发请求的 429 只减半一次
+        self.exhausted_until = 0.0  # 响应头表示额度已用完时，在此之前不再增长
+
+
+class ConcurrencyController:
+    """AIMD 并发控制器，TaskExecutor 用它决定同时在途的请求数"""
+
+    INCREASE_STEP = 1.0  # 每个窗口的加性增量
+    DECREASE_FACTOR = 0.5  # 限流时的乘性减量
+    MIN_WINDOW = 1.0
+    DECREASE_COOLDOWN = 2.0  # 两次减半的最小间隔（秒）
+    DEFAULT_BACKOFF = 1.0  # 限流但没有 retry-after 时的暂停时间（秒）
+
+    _RETRY_AFTER_PATTERN = re.compile(r"retry[\s_-]*after\D{0,5}(\d+(?:\.\d+)?)", re.IGNORECASE)
+    _DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._enabled: Dict[str, bool] = {}
+        self._ceilings: Dict[str, int] = {}
+        # scope(平台) -> key 摘要 -> 窗口
+        self._windows: Dict[str, Dict[str, AIMDWindow]] = {}
+        # scope(平台) -> 在途请求数，重新 configure 时保留
+        self._in_flight: Dict[str, int] = {}
+
+    @staticmethod
+    def key_id(api_key: Optional[str]) -> str:
+        """Key 只以摘要形式保存"""
+        return hashlib.sha1((api_key or "").encode("utf-8")).hexdigest()[:12]
+
+    def configure(self, scope: str, api_keys: Iterable[str], ceiling: int, enabled: bool = True) -> None:
+        """
+        任务开始或切换 API 时初始化平台的窗口
+
+        Args:
+            scope: 平台标识（target_platform）
+            api_keys: 该平台轮询使用的全部 Key
+            ceiling: 用户设置的线程数，窗口之和不会超过它
+            enabled: 关闭时 limit 直接返回 ceiling
+        """
+        keys = [self.key_id(key) for key in api_keys] or [self.key_id(None)]
+        ceiling = max(1, int(ceiling))
+        # 从用户设置的线程数起步，只在限流时收缩
+        initial = max(self.MIN_WINDOW, ceiling / len(keys))
+        with self._lock:
+            self._enabled[scope] = enabled
+            self._ceilings[scope] = ceiling
+            self._windows[scope] = {key: AIMDWindow(initial) for key in keys}
+
+    def limit(self, scope: str, ceiling: Optional[int] = None) -> int:
+        """当前允许的在途请求数"""
+        with self._lock:
+            return self._limit(scope, ceiling)
+
+    def try_acquire(self, scope: str, ceiling: Optional[int] = None) -> bool:
+        """在途请求数低于 limit 时占用一个名额，成功后必须调用 release"""
+        with self._lock:
+            active = self._in_flight.get(scope, 0)
+            if active >= self._limit(scope, ceiling):
+                return False
+            self._in_flight[scope] = active + 1
+            return True
+
+    def release(self, scope: str) -> None:
+        """归还 try_acquire 占用的名额"""
+        with self._lock:
+            self._in_flight[scope] = max(0, self._in_flight.get(scope, 0) - 1)
+
+    def in_flight(self, scope: str) -> int:
+        """当前在途请求数"""
+        with self._lock:
+            return self._in_flight.get(scope, 0)
+
+    def _limit(self, scope: str, ceiling: Optional[int]) -> int:
+        if ceiling is None:
+            ceiling = self._ceilings.get(scope, 1)
+        windows = self._windows.get(scope)
+        if not self._enabled.get(scope, False) or not windows:
+            return max(1, ceiling)
+        total = sum(window.size for window in windows.values())
+        return max(1, min(int(ceiling), int(total)))
+
+    def wait_time(self, scope: str) -> float:
+        """平台全部 Key 都处于限流暂停时，返回还需等待的秒数"""
+        now = time.monotonic()
+        with self._lock:
+            windows = self._windows.get(scope)
+            if not self._enabled.get(scope, False) or not windows:
+                return 0.0
+            return max(0.0, min(window.blocked_until for window in windows.values()) - now)
+
+    def record_outcome(self, platform_config: dict, skip: bool, content: str) -> None:
+        """根据一次请求的结果调整对应 Key 的窗口，失败时用 ErrorClassifier 判断是否为限流"""
+        scope = platform_config.get("target_platform")
+        key = self.key_id(platform_config.get("api_key"))
+        if not skip:
+            self._on_success(scope, key)
+        elif ErrorClassifier.should_reduce_concurrency(content or ""):
+            self._on_throttle(scope, key, self.parse_retry_after_text(content))
+
+    def observe_headers(self, api_key: Optional[str], headers) -> None:
+        """
+        读取响应头中的限流信息（retry-after / x-ratelimit-remaining / x-ratelimit-reset）
+
+        请求器只知道 Key，不知道平台，因此更新所有平台中该 Key 的窗口。
+        """
+        retry_after = self.parse_retry_after(headers.get("retry-after"))
+        remaining = self._first_int(headers, ("x-ratelimit-remaining-requests", "x-ratelimit-remaining"))
+        if retry_after is None and remaining is None:
+            return
+
+        reset = self._first_duration(headers, ("x-ratelimit-reset-requests", "x-ratelimit-reset"))
+        key = self.key_id(api_key)
+        now = time.monotonic()
+        with self._lock:
+            for windows in self._windows.values():
+                window = windows.get(key)
+                if window is None:
+                    continue
+                if retry_after is not None:
+                    window.blocked_until = max(window.blocked_until, now + retry_after)
+                if remaining is not None and remaining <= 0:
+                    wait = reset if reset is not None else self.DEFAULT_BACKOFF
+                    window.exhausted_until = max(window.exhausted_until, now + wait)
+
+    def _on_success(self, scope: str, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            window = self._window(scope, key)
+            if window is None or now < window.exhausted_until:
+                return
+            ceiling = self._ceilings.get(scope, 1)
+            window.size = min(float(ceiling), window.size + self.INCREASE_STEP / window.size)
+
+    def _on_throttle(self, scope: str, key: str, retry_after: Optional[float]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            window = self._window(scope, key)
+            if window is None:
+                return
+            pause = retry_after if retry_after is not None else self.DEFAULT_BACKOFF
+            window.blocked_until = max(window.blocked_until, now + pause)
+            if now - window.last_decrease >= self.DECREASE_COOLDOWN:
+                window.size = max(self.MIN_WINDOW, window.size * self.DECREASE_FACTOR)
+                window.last_decrease = now
+
+    def _window(self, scope: str, key: str) -> Optional[AIMDWindow]:
+        windows = self._windows.get(scope)
+        if windows is None:
+            return None
+        window = windows.get(key)
+        if window is None:
+            # 任务进行中新增的 Key，按最小窗口加入
+            window = windows[key] = AIMDWindow(self.MIN_WINDOW)
+        return window
+
+    @classmethod
+    def parse_retry_after(cls, value) -> Optional[float]:
+        """retry-after 可以是秒数或 HTTP 日期"""
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return None
+
+    @classmethod
+    def parse_retry_after_text(cls, text: Optional[str]) -> Optional[float]:
+        """从错误信息中提取 retry after N 秒"""
+        match = cls._RETRY_AFTER_PATTERN.search(text or "")
+        return float(match.group(1)) if match else None
+
+    @classmethod
+    def parse_duration(cls, value) -> Optional[float]:
+        """解析 x-ratelimit-reset 的 "1s" / "6m0s" / "20ms" / 纯秒数 格式"""
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        parts = cls._DURATION_PATTERN.findall(str(value))
+        if not parts:
+            return None
+        return sum(float(number) * units[unit] for number, unit in parts)
+
+    @classmethod
+    def _first_int(cls, headers, names: Tuple[str, ...]) -> Optional[int]:
+        for name in names:
+            value = headers.get(name)
+            if value is not None:
+                try:
+                    return int(float(value))
+                except (TypeError, ValueError):
+                    continue
+        return None
+
+    @classmethod
+    def _first_duration(cls, headers, names: Tuple[str, ...]) -> Optional[float]:
+        for name in names:
+            duration = cls.parse_duration(headers.get(name))
+            if duration is not None:
+                return duration
+        return None
+
+
+_controller = ConcurrencyController()
+
+
+# 全局单例访问
+def get_concurrency_controller() -> ConcurrencyController:
+    """获取全局并发控制器实例"""
+    return _controller
@@ -19,6 +19,10 @@ class RequestLimiter:
         
         self.lock = threading.Lock()
 
+    # 是否已设置过限额
+    def is_configured(self) -> bool:
+        return self.rpm_max_tokens > 0
+
     # 设置限制器的参数
     def set_limit(self, tpm_limit: int, rpm_limit: int, enable_rate_limit: bool = False,
                   custom_rpm: int = 0, custom_tpm: int = 0) -> None:
@@ -285,6 +285,26 @@ register_config(ConfigItem(
     category="output"
 ))
 
+register_config(ConfigItem(
+    key="export_thread_counts",
+    default=1,
+    level=ConfigLevel.ADVANCED,
+    config_type=ConfigType.INT,
+    i18n_key="setting_export_thread_counts",
+    min_value=1,
+    max_value=32,
+    category="output"
+))
+
+register_config(ConfigItem(
+    key="skip_unchanged_output",
+    default=True,
+    level=ConfigLevel.ADVANCED,
+    config_type=ConfigType.BOOL,
+    i18n_key="setting_skip_unchanged_output",
+    category="output"
+))
+
 # --- 功能开关 (USER) ---
 register_config(ConfigItem(
     key="auto_set_output_path",
@@ -875,6 +895,44 @@ register_config(ConfigItem(
     category="advanced"
 ))
 
+# --- 自适应并发 (ADVANCED) ---
+# 遇到 429 / retry-after 时按 AIMD 收缩在途请求数，线程数设置作为上限
+register_config(ConfigItem(
+    key="enable_adaptive_concurrency",
+    default=True,
+    level=ConfigLevel.ADVANCED,
+    config_type=ConfigType.BOOL,
+    i18n_key="setting_enable_adaptive_concurrency",
+    i18n_desc_key="setting_enable_adaptive_concurrency_desc",
+    category="advanced"
+))
+
+# --- 响应缓存 (ADVANCED) ---
+# 相同请求（平台、模型、消息、采样参数一致）直接返回本地缓存的回复，在途的相同请求只发送一次
+register_config(ConfigItem(
+    key="enable_response_cache",
+    default=False,
+    level=ConfigLevel.ADVANCED,
+    config_type=ConfigType.BOOL,
+    i18n_key="setting_enable_response_cache",
+    i18n_desc_key="setting_enable_response_cache_desc",
+    category="advanced"
+))
+
+# --- 任务队列并行 (ADVANCED) ---
+# 大于 1 时队列中的项目在独立进程中并行执行，线程数与 RPM/TPM 限额按项目数平分
+register_config(ConfigItem(
+    key="queue_parallel_projects",
+    default=1,
+    level=ConfigLevel.ADVANCED,
+    config_type=ConfigType.INT,
+    i18n_key="setting_queue_parallel_projects",
+    i18n_desc_key="setting_queue_parallel_projects_desc",
+    min_value=1,
+    max_value=16,
+    category="advanced"
+))
+
 # --- WebServer 配置 (ADVANCED) ---
 register_config(ConfigItem(
     key="webserver_port",
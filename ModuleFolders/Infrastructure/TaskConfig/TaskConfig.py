@@ -106,6 +106,8 @@ class TaskConfig(Base):
         self.output_filename_suffix = "" # NEW: 输出文件名后缀
         self.enable_bilingual_output = True # NEW: 是否启用双语输出 (default True)
         self.bilingual_text_order = "translation_first" # NEW: 双语文本顺序
+        self.export_thread_counts = 1 # 输出文件时的并行线程数，1 为串行
+        self.skip_unchanged_output = True # 手动导出时跳过内容未变化的文件
         self.force_retranslate = False # NEW: 强制重新翻译所有内容
         self.polishing_mode_selection = "translated_text_polish" # NEW: 润色模式选择
         self.polishing_pre_line_counts = 2 # NEW: 润色时获取上文的行数
@@ -304,8 +306,8 @@ class TaskConfig(Base):
         # 4. 返回处理后的 URL
         return url
 
-    # 准备翻译
-    def prepare_for_translation(self,mode) -> None:
+    # 准备翻译（persist 为 False 时不把输出路径写回配置文件，供不涉及项目输出的调用方使用）
+    def prepare_for_translation(self,mode, persist: bool = True) -> None:
 
         # 获取目标平台
 
@@ -387,10 +389,11 @@ class TaskConfig(Base):
             self.polishing_output_path = os.path.join(parent_dir, output_folder_name)
 
         # 保存新配置
-        config = self.load_config()
-        config["label_output_path"] = self.label_output_path
-        config["polishing_output_path"] = self.polishing_output_path
-        self.save_config(config)
+        if persist:
+            config = self.load_config()
+            config["label_output_path"] = self.label_output_path
+            config["polishing_output_path"] = self.polishing_output_path
+            self.save_config(config)
 
 
         # 计算实际线程数
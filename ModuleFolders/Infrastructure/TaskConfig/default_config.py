@@ -55,6 +55,8 @@ DEFAULT_CONFIG = {
     "output_filename_suffix": "",
     "enable_bilingual_output": True,
     "bilingual_text_order": "translation_first",
+    "export_thread_counts": 1,
+    "skip_unchanged_output": True,
     "polishing_mode_selection": "translated_text_polish",
     "polishing_pre_line_counts": 2,
     "cache_backup_limit": 10,
@@ -23,6 +23,7 @@ from .models import (
 from .auth_manager import AuthManager, get_auth_manager, AuthError
 from .jwt_handler import JWTHandler
 from .password_manager import PasswordManager
+from .principal_cache import PrincipalCache, principal_cache
 from .oauth_manager import OAuthManager, get_oauth_manager, OAuthError, OAuthProvider
 from .auth_middleware import (
     JWTAuthMiddleware,
@@ -53,6 +54,8 @@ __all__ = [
     "AuthError",
     "JWTHandler",
     "PasswordManager",
+    "PrincipalCache",
+    "principal_cache",
     "OAuthManager",
     "get_oauth_manager",
     "OAuthError",
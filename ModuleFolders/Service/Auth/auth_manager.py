@@ -19,6 +19,7 @@ from .models import (
 )
 from .password_manager import PasswordManager
 from .jwt_handler import JWTHandler
+from .principal_cache import principal_cache
 
 
 class AuthError(Exception):
@@ -306,6 +307,7 @@ class AuthManager:
         if stored_token:
             stored_token.is_revoked = True
             stored_token.save()
+            principal_cache.invalidate_user(stored_token.user_id)
             return True
 
         return False
@@ -316,7 +318,25 @@ class AuthManager:
         if not payload or payload.get("type") != "access":
             return None
 
-        return User.get_or_none(User.id == payload.get("sub"))
+        # Serve repeated requests with the same token from the principal cache
+        token_hash = self.jwt_handler.get_token_hash(token)
+        cached = principal_cache.get(token_hash)
+        if cached is not None:
+            user = User(**cached)
+            user._dirty.clear()
+            return user
+
+        generation = principal_cache.generation
+        user = User.get_or_none(User.id == payload.get("sub"))
+        if user:
+            principal_cache.set(
+                token_hash,
+                str(user.id),
+                user.__data__,
+                token_exp=payload.get("exp"),
+                generation=generation,
+            )
+        return user
 
     def forgot_password(
         self,
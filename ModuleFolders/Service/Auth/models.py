@@ -150,8 +150,20 @@ class User(_db.Model):
         table_name = "users"
 
     def save(self, *args, **kwargs):
+        from .principal_cache import principal_cache
+
         self.updated_at = datetime.utcnow()
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        # Role, status, password or profile may have changed
+        principal_cache.invalidate_user(self.id)
+        return result
+
+    def delete_instance(self, *args, **kwargs):
+        from .principal_cache import principal_cache
+
+        result = super().delete_instance(*args, **kwargs)
+        principal_cache.invalidate_user(self.id)
+        return result
 
     def __str__(self):
         return f"<User {self.username}>"
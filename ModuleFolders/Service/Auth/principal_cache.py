@@ -0,0 +1,123 @@
+# ModuleFolders/Service/Auth/principal_cache.py
+"""
+Short-lived cache of authenticated users keyed by access token hash.
+
+Avoids a database lookup on every authenticated request. Entries are
+invalidated whenever the user row is saved or deleted, and on logout.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+PRINCIPAL_CACHE_TTL_SECONDS = 30
+PRINCIPAL_CACHE_MAX_SIZE = 10000
+
+
+class PrincipalCache:
+    """Thread-safe LRU + TTL cache of user rows, keyed by token hash."""
+
+    def __init__(
+        self,
+        ttl: float = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_size: int = PRINCIPAL_CACHE_MAX_SIZE,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # token_hash -> (expires_at, user_id, row data)
+        self._entries: "OrderedDict[str, Tuple[float, str, dict]]" = OrderedDict()
+        # user_id -> token hashes, so all sessions of a user can be dropped at once
+        self._by_user: Dict[str, Set[str]] = {}
+        # Bumped on every invalidation; a lookup that started before an
+        # invalidation must not repopulate the cache with the stale row
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Current invalidation generation, read before loading a user row."""
+        return self._generation
+
+    def get(self, token_hash: str) -> Optional[dict]:
+        """Return a copy of the cached row data, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            expires_at, user_id, data = entry
+            if time.monotonic() >= expires_at:
+                self._remove(token_hash)
+                return None
+            self._entries.move_to_end(token_hash)
+            return copy.deepcopy(data)
+
+    def set(
+        self,
+        token_hash: str,
+        user_id: str,
+        data: dict,
+        token_exp: Optional[float] = None,
+        generation: Optional[int] = None,
+    ):
+        """
+        Cache row data for a token.
+
+        Args:
+            token_hash: Hash of the access token
+            user_id: Owner of the token
+            data: User row data
+            token_exp: Token expiry as a unix timestamp; the entry never outlives it
+            generation: Value of `generation` before the row was loaded
+        """
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+            if ttl <= 0:
+                return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._remove(token_hash)
+            self._entries[token_hash] = (time.monotonic() + ttl, user_id, copy.deepcopy(data))
+            self._by_user.setdefault(user_id, set()).add(token_hash)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_token(self, token_hash: str):
+        """Drop a single token."""
+        with self._lock:
+            self._generation += 1
+            self._remove(token_hash)
+
+    def invalidate_user(self, user_id: str):
+        """Drop every cached token of a user."""
+        with self._lock:
+            self._generation += 1
+            for token_hash in self._by_user.pop(str(user_id), ()):
+                self._entries.pop(token_hash, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, token_hash: str):
+        entry = self._entries.pop(token_hash, None)
+        if entry is None:
+            return
+        hashes = self._by_user.get(entry[1])
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                del self._by_user[entry[1]]
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
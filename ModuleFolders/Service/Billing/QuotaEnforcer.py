@@ -16,21 +16,86 @@ Features:
 - Detailed error messages with upgrade guidance
 """
 
-from typing import Dict, Any, Optional
+import inspect
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple
 from functools import wraps
-from datetime import datetime, timedelta
-import hashlib
+from datetime import datetime
+
+
+class QuotaCache:
+    """
+    有界的 LRU + TTL 配额缓存（线程安全）
+
+    键为 (user_id, metric_type, 日期)，超过 max_size 时淘汰最久未使用的条目，
+    过期条目在读取时移除。
+    """
+
+    def __init__(self, ttl: float = 60, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: Tuple[str, str, str], data: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Tuple[str, str, str]):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class QuotaReservation:
+    """一次配额预留，通过 QuotaEnforcer.commit / release 结束"""
+    user_id: str
+    metric_type: str
+    quantity: int
+    day: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    settled: bool = False
 
 
 class QuotaEnforcer:
     """Enforce usage quotas for users."""
 
-    def __init__(self, cache_ttl: int = 60):
+    # 按用户分段加锁，质数减少取模后的碰撞
+    _USER_LOCK_POOL_SIZE = 257
+
+    def __init__(self, cache_ttl: int = 60, cache_max_size: int = 10000):
         """
         初始化配额执行器
 
         Args:
             cache_ttl: 配额缓存时间（秒），默认60秒
+            cache_max_size: 配额缓存最大条目数
         """
         from ModuleFolders.Service.Billing.SubscriptionManager import SubscriptionManager
         from ModuleFolders.Service.Billing.UsageTracker import UsageTracker
@@ -38,38 +103,191 @@ class QuotaEnforcer:
         self.subscription_manager = SubscriptionManager()
         self.usage_tracker = UsageTracker()
         self.cache_ttl = cache_ttl
-        self._quota_cache: Dict[str, Dict[str, Any]] = {}
+        self._quota_cache = QuotaCache(ttl=cache_ttl, max_size=cache_max_size)
+        self._user_locks = tuple(threading.Lock() for _ in range(self._USER_LOCK_POOL_SIZE))
+        # 已预留但尚未提交的用量，独立于缓存保存，缓存过期或被淘汰时不会丢失
+        self._reserved: Dict[Tuple[str, str, str], int] = {}
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        """获取用户对应的锁"""
+        return self._user_locks[hash(user_id) % self._USER_LOCK_POOL_SIZE]
 
-    def _get_cache_key(self, user_id: str, metric_type: str) -> str:
+    def _get_cache_key(self, user_id: str, metric_type: str, day: Optional[str] = None) -> Tuple[str, str, str]:
         """生成缓存键"""
-        today = datetime.now().date().isoformat()
-        key_data = f"{user_id}:{metric_type}:{today}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return (user_id, metric_type, day or datetime.now().date().isoformat())
 
     def _get_cached_quota(self, user_id: str, metric_type: str) -> Optional[Dict[str, Any]]:
         """获取缓存的配额信息"""
-        cache_key = self._get_cache_key(user_id, metric_type)
-        cached = self._quota_cache.get(cache_key)
-
-        if cached:
-            # 检查缓存是否过期
-            if datetime.now() < cached["expires_at"]:
-                return cached["data"]
-
-        return None
+        return self._quota_cache.get(self._get_cache_key(user_id, metric_type))
 
     def _set_cached_quota(self, user_id: str, metric_type: str, data: Dict[str, Any]):
         """设置配额缓存"""
-        cache_key = self._get_cache_key(user_id, metric_type)
-        self._quota_cache[cache_key] = {
-            "data": data,
-            "expires_at": datetime.now() + timedelta(seconds=self.cache_ttl),
-        }
+        self._quota_cache.set(self._get_cache_key(user_id, metric_type), data)
 
     def _invalidate_cache(self, user_id: str, metric_type: str):
         """使缓存失效"""
-        cache_key = self._get_cache_key(user_id, metric_type)
-        self._quota_cache.pop(cache_key, None)
+        self._quota_cache.pop(self._get_cache_key(user_id, metric_type))
+
+    def _load_quota(self, user_id: str, metric_type: str) -> Dict[str, Any]:
+        """从缓存获取配额，未命中时查询数据库并写入缓存（调用方需持有用户锁）"""
+        quota = self._get_cached_quota(user_id, metric_type)
+        if quota is None:
+            quota = self.subscription_manager.check_quota(user_id, metric_type)
+            self._set_cached_quota(user_id, metric_type, quota)
+        return quota
+
+    def _effective_quota(self, user_id: str, metric_type: str) -> Dict[str, Any]:
+        """扣除未提交预留量后的配额视图（调用方需持有用户锁）"""
+        quota = self._load_quota(user_id, metric_type)
+        limit = quota.get("limit", 0)
+        if limit == -1:
+            return dict(quota)
+
+        reserved = self._reserved.get(self._get_cache_key(user_id, metric_type), 0)
+        if "used" not in quota:
+            # 用户不存在等情况，没有可计算的用量
+            return dict(quota)
+        remaining = max(0, limit - quota["used"] - reserved)
+        return {
+            **quota,
+            "remaining": remaining,
+            "allowed": remaining > 0,
+            "reserved": reserved,
+        }
+
+    def _apply_usage(self, user_id: str, metric_type: str, quantity: int):
+        """将已提交的用量同步到缓存中的配额（调用方需持有用户锁）"""
+        quota = self._get_cached_quota(user_id, metric_type)
+        if quota is None or quota.get("limit", 0) == -1 or "used" not in quota:
+            return
+        used = quota["used"] + quantity
+        remaining = max(0, quota["limit"] - used)
+        self._set_cached_quota(user_id, metric_type, {
+            **quota,
+            "used": used,
+            "remaining": remaining,
+            "allowed": remaining > 0,
+        })
+
+    def reserve(
+        self,
+        user_id: str,
+        estimated_quantity: int,
+        metric_type: str = "characters",
+    ) -> QuotaReservation:
+        """
+        原子地检查并预留配额
+
+        预留量在提交或释放前计入已用量，多个并发请求无法超额使用同一份剩余配额。
+
+        Args:
+            user_id: 用户ID
+            estimated_quantity: 预计使用量
+            metric_type: 指标类型
+
+        Returns:
+            配额预留对象
+
+        Raises:
+            QuotaExceededError: 配额不足时抛出
+        """
+        with self._user_lock(user_id):
+            self._raise_if_exceeded(
+                metric_type, estimated_quantity, self._effective_quota(user_id, metric_type)
+            )
+            key = self._get_cache_key(user_id, metric_type)
+            self._reserved[key] = self._reserved.get(key, 0) + estimated_quantity
+            return QuotaReservation(
+                user_id=user_id,
+                metric_type=metric_type,
+                quantity=estimated_quantity,
+                day=key[2],
+            )
+
+    def _settle(self, reservation: QuotaReservation):
+        """移除预留量（调用方需持有用户锁）"""
+        if reservation.settled:
+            raise ValueError(f"配额预留 {reservation.id} 已结算")
+        reservation.settled = True
+        key = self._get_cache_key(reservation.user_id, reservation.metric_type, reservation.day)
+        left = self._reserved.get(key, 0) - reservation.quantity
+        if left > 0:
+            self._reserved[key] = left
+        else:
+            self._reserved.pop(key, None)
+
+    def commit(
+        self,
+        reservation: QuotaReservation,
+        actual_quantity: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        按实际用量提交预留
+
+        使用量通过写入缓冲区异步落盘，同时更新缓存中的配额，不产生数据库往返。
+
+        Args:
+            reservation: reserve 返回的预留对象
+            actual_quantity: 实际使用量，默认为预留量
+            metadata: 额外元数据
+
+        Returns:
+            使用记录信息字典
+        """
+        quantity = reservation.quantity if actual_quantity is None else actual_quantity
+        with self._user_lock(reservation.user_id):
+            self._settle(reservation)
+            record = self.usage_tracker.record_usage(
+                user_id=reservation.user_id,
+                metric_type=reservation.metric_type,
+                quantity=quantity,
+                metadata=metadata,
+                buffered=True,
+            )
+            self._apply_usage(reservation.user_id, reservation.metric_type, quantity)
+        return record
+
+    def release(self, reservation: QuotaReservation):
+        """
+        释放未使用的预留（操作失败或取消时调用），重复释放会被忽略
+
+        Args:
+            reservation: reserve 返回的预留对象
+        """
+        with self._user_lock(reservation.user_id):
+            if not reservation.settled:
+                self._settle(reservation)
+
+    def commit_or_release(
+        self,
+        reservation: QuotaReservation,
+        actual_quantity: int,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        按实际用量结束预留：有用量时提交，用量为 0（全部失败）时释放
+
+        Returns:
+            使用记录信息字典，释放时为 None
+        """
+        if actual_quantity > 0:
+            return self.commit(reservation, actual_quantity=actual_quantity, metadata=metadata)
+        self.release(reservation)
+        return None
+
+    def _raise_if_exceeded(self, metric_type: str, estimated_quantity: int, quota: Dict[str, Any]):
+        """配额不足时抛出 QuotaExceededError"""
+        result = self._build_check_result(metric_type, estimated_quantity, quota)
+        if result["exceeded"]:
+            raise QuotaExceededError(
+                message=result["message"],
+                limit=result["limit"],
+                used=result["used"],
+                remaining=result["remaining"],
+                requested=estimated_quantity if result["allowed"] else None,
+                upgrade_url=result["upgrade_url"],
+            )
 
     def check_before_operation(
         self,
@@ -90,14 +308,20 @@ class QuotaEnforcer:
         Returns:
             配额检查结果字典
         """
-        # 尝试从缓存获取
-        cached_quota = self._get_cached_quota(user_id, metric_type)
-        if cached_quota:
-            quota = cached_quota
-        else:
-            quota = self.subscription_manager.check_quota(user_id, metric_type)
-            self._set_cached_quota(user_id, metric_type, quota)
+        with self._user_lock(user_id):
+            quota = self._effective_quota(user_id, metric_type)
+
+        if raise_on_exceeded:
+            self._raise_if_exceeded(metric_type, estimated_quantity, quota)
+        return self._build_check_result(metric_type, estimated_quantity, quota)
 
+    def _build_check_result(
+        self,
+        metric_type: str,
+        estimated_quantity: int,
+        quota: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """根据配额信息生成检查结果"""
         result = {
             "allowed": quota.get("allowed", False),
             "remaining": quota.get("remaining", 0),
@@ -114,14 +338,6 @@ class QuotaEnforcer:
             result["exceeded"] = True
             result["message"] = self._generate_exceeded_message(metric_type, result)
             result["upgrade_url"] = "/pricing"
-            if raise_on_exceeded:
-                raise QuotaExceededError(
-                    message=result["message"],
-                    limit=result["limit"],
-                    used=result["used"],
-                    remaining=result["remaining"],
-                    upgrade_url=result["upgrade_url"],
-                )
 
         # 请求量超过剩余配额
         elif result["remaining"] != -1 and estimated_quantity > result["remaining"]:
@@ -130,15 +346,6 @@ class QuotaEnforcer:
                 metric_type, estimated_quantity, result["remaining"]
             )
             result["upgrade_url"] = "/pricing"
-            if raise_on_exceeded:
-                raise QuotaExceededError(
-                    message=result["message"],
-                    limit=result["limit"],
-                    used=result["used"],
-                    remaining=result["remaining"],
-                    requested=estimated_quantity,
-                    upgrade_url=result["upgrade_url"],
-                )
 
         return result
 
@@ -161,19 +368,19 @@ class QuotaEnforcer:
         Returns:
             更新后的配额状态
         """
-        # 记录使用量
-        self.usage_tracker.record_usage(
-            user_id=user_id,
-            metric_type=metric_type,
-            quantity=quantity,
-            metadata=metadata,
-        )
-
-        # 使缓存失效
-        self._invalidate_cache(user_id, metric_type)
+        with self._user_lock(user_id):
+            # 记录使用量
+            self.usage_tracker.record_usage(
+                user_id=user_id,
+                metric_type=metric_type,
+                quantity=quantity,
+                metadata=metadata,
+                buffered=True,
+            )
+            self._apply_usage(user_id, metric_type, quantity)
 
-        # 返回更新后的配额
-        return self.subscription_manager.check_quota(user_id, metric_type)
+            # 返回更新后的配额
+            return self._effective_quota(user_id, metric_type)
 
     def check_and_record(
         self,
@@ -197,27 +404,23 @@ class QuotaEnforcer:
         Raises:
             QuotaExceededError: 配额不足时抛出
         """
-        # 先检查配额
-        check_result = self.check_before_operation(
-            user_id=user_id,
-            estimated_quantity=quantity,
-            metric_type=metric_type,
-            raise_on_exceeded=True,
-        )
-
-        # 记录使用量
-        record_result = self.usage_tracker.record_usage(
-            user_id=user_id,
-            metric_type=metric_type,
-            quantity=quantity,
-            metadata=metadata,
-        )
+        # 检查与记录在同一把用户锁内完成，避免并发请求重复使用同一份剩余配额
+        with self._user_lock(user_id):
+            quota = self._effective_quota(user_id, metric_type)
+            check_result = self._build_check_result(metric_type, quantity, quota)
+            self._raise_if_exceeded(metric_type, quantity, quota)
 
-        # 使缓存失效
-        self._invalidate_cache(user_id, metric_type)
+            record_result = self.usage_tracker.record_usage(
+                user_id=user_id,
+                metric_type=metric_type,
+                quantity=quantity,
+                metadata=metadata,
+                buffered=True,
+            )
+            self._apply_usage(user_id, metric_type, quantity)
 
-        # 获取更新后的配额状态
-        updated_quota = self.subscription_manager.check_quota(user_id, metric_type)
+            # 获取更新后的配额状态
+            updated_quota = self._effective_quota(user_id, metric_type)
 
         return {
             "record": record_result,
@@ -258,7 +461,8 @@ class QuotaEnforcer:
         Returns:
             使用百分比 (0-100), 无限配额返回 0.0
         """
-        quota = self.subscription_manager.check_quota(user_id, metric_type)
+        with self._user_lock(user_id):
+            quota = self._effective_quota(user_id, metric_type)
         limit = quota.get("limit", 0)
         used = quota.get("used", 0)
 
@@ -353,9 +557,26 @@ class QuotaExceededError(Exception):
         return result
 
 
-def require_quota(metric_type: str = "characters", quantity_param: str = "quantity"):
+_default_enforcer: Optional[QuotaEnforcer] = None
+_default_enforcer_lock = threading.Lock()
+
+
+def get_quota_enforcer() -> QuotaEnforcer:
+    """获取进程内共享的配额执行器，使缓存与预留在所有请求间生效"""
+    global _default_enforcer
+    if _default_enforcer is None:
+        with _default_enforcer_lock:
+            if _default_enforcer is None:
+                _default_enforcer = QuotaEnforcer()
+    return _default_enforcer
+
+
+def require_quota(metric_type: str = "characters", quantity_param: str = "quantity", report_usage: bool = False):
     """
-    装饰器：在执行操作前自动检查配额
+    装饰器：在执行操作前按预计用量预留配额，成功后提交、失败时释放
+
+    同时支持同步函数与协程函数。report_usage 为 True 时，被装饰函数返回 (结果, 实际使用量)，
+    按实际使用量提交（为 0 时释放预留），装饰后的函数只返回结果；否则按预计用量提交。
 
     用法:
         @require_quota(metric_type="characters", quantity_param="char_count")
@@ -365,46 +586,55 @@ def require_quota(metric_type: str = "characters", quantity_param: str = "quanti
 
     Args:
         metric_type: 指标类型
-        quantity_param: 函数参数中代表使用量的参数名
+        quantity_param: 函数参数中代表预计使用量的参数名
+        report_usage: 被装饰函数是否同时返回实际使用量
     """
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # 获取 user_id 和 quantity
-            user_id = kwargs.get("user_id")
-            quantity = kwargs.get(quantity_param, 1)
-
-            if not user_id:
-                raise ValueError("user_id parameter is required for quota checking")
-
-            # 创建配额执行器并检查
-            enforcer = QuotaEnforcer()
-            enforcer.check_before_operation(
-                user_id=user_id,
-                estimated_quantity=quantity,
-                metric_type=metric_type,
-                raise_on_exceeded=True,
-            )
+    def reserve(kwargs) -> Tuple[QuotaEnforcer, QuotaReservation]:
+        # 获取 user_id 和 quantity
+        user_id = kwargs.get("user_id")
+        quantity = kwargs.get(quantity_param, 1)
 
-            # 执行原函数
-            result = await func(*args, **kwargs)
+        if not user_id:
+            raise ValueError("user_id parameter is required for quota checking")
 
-            # 记录使用量
-            enforcer.usage_tracker.record_usage(
-                user_id=user_id,
-                metric_type=metric_type,
-                quantity=quantity,
-                metadata={"function": func.__name__},
-            )
+        enforcer = get_quota_enforcer()
+        return enforcer, enforcer.reserve(
+            user_id=user_id,
+            estimated_quantity=quantity,
+            metric_type=metric_type,
+        )
+
+    def settle(enforcer: QuotaEnforcer, reservation: QuotaReservation, func, outcome):
+        # 提交实际使用量
+        metadata = {"function": func.__name__}
+        if not report_usage:
+            enforcer.commit(reservation, metadata=metadata)
+            return outcome
+        result, actual_quantity = outcome
+        enforcer.commit_or_release(reservation, actual_quantity, metadata=metadata)
+        return result
 
-            return result
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                enforcer, reservation = reserve(kwargs)
+                try:
+                    # 执行原函数
+                    outcome = await func(*args, **kwargs)
+                except BaseException:
+                    enforcer.release(reservation)
+                    raise
+                return settle(enforcer, reservation, func, outcome)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                enforcer, reservation = reserve(kwargs)
+                try:
+                    outcome = func(*args, **kwargs)
+                except BaseException:
+                    enforcer.release(reservation)
+                    raise
+                return settle(enforcer, reservation, func, outcome)
         return wrapper
     return decorator
-
-
-class QuotaExceededError(Exception):
-    """Exception raised when quota is exceeded."""
-    
-    def __init__(self, message: str = "Quota exceeded"):
-        self.message = message
-        super().__init__(self.message)
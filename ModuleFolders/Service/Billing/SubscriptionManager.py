@@ -42,7 +42,10 @@ class SubscriptionManager:
     }
     
     def __init__(self):
+        from ModuleFolders.Service.Billing.UsageTracker import UsageTracker
+
         self.db = get_database()
+        self.usage_tracker = UsageTracker()
         self.stripe_api_key = os.getenv("STRIPE_API_KEY")
         
         if stripe and self.stripe_api_key:
@@ -88,19 +91,8 @@ class SubscriptionManager:
         if daily_limit == -1:  # Unlimited
             return {"allowed": True, "remaining": -1, "limit": -1}
         
-        # Get today's usage from usage_records table
-        today = datetime.now().date().isoformat()
-        cursor = self.db.cursor()
-        cursor.execute(
-            """SELECT COALESCE(SUM(quantity), 0) as total
-               FROM usage_records
-               WHERE user_id = ? AND metric_type = ?
-               AND date(recorded_at) = ?""",
-            (user_id, metric_type, today)
-        )
-        result = cursor.fetchone()
-
-        used = result[0] if result else 0
+        # Get today's usage from the pre-aggregated daily rollup
+        used = self.usage_tracker.get_today_usage(user_id, metric_type)
         remaining = max(0, daily_limit - used)
         
         return {
@@ -20,13 +20,157 @@ Tracks user usage across multiple metrics:
 - team_members: Team member count
 """
 
+import atexit
+import json
+import threading
 import uuid
+from collections import defaultdict
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from ModuleFolders.Infrastructure.Database.pgsql import get_database
 
 
+# 建表语句（幂等）。usage_rollups 按 用户 × 指标 × 周期(日/月) 预聚合使用量，
+# 写入原始记录时在同一事务内更新，查询配额时无需再扫描 usage_records。
+_SCHEMA_STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS usage_records (
+           id VARCHAR(36) PRIMARY KEY,
+           user_id VARCHAR(36) NOT NULL,
+           metric_type VARCHAR(50) NOT NULL,
+           quantity INTEGER NOT NULL DEFAULT 0,
+           recorded_at VARCHAR(32) NOT NULL,
+           metadata TEXT
+       )""",
+    """CREATE INDEX IF NOT EXISTS idx_usage_records_user_metric_time
+       ON usage_records (user_id, metric_type, recorded_at)""",
+    """CREATE TABLE IF NOT EXISTS usage_rollups (
+           user_id VARCHAR(36) NOT NULL,
+           metric_type VARCHAR(50) NOT NULL,
+           period_type VARCHAR(8) NOT NULL,
+           period_start VARCHAR(10) NOT NULL,
+           quantity INTEGER NOT NULL DEFAULT 0,
+           PRIMARY KEY (user_id, metric_type, period_type, period_start)
+       )""",
+    """CREATE INDEX IF NOT EXISTS idx_usage_rollups_metric_period
+       ON usage_rollups (metric_type, period_type, period_start)""",
+)
+
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO usage_rollups (user_id, metric_type, period_type, period_start, quantity)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (user_id, metric_type, period_type, period_start)
+    DO UPDATE SET quantity = usage_rollups.quantity + excluded.quantity
+"""
+
+_INSERT_RECORD_SQL = """
+    INSERT INTO usage_records
+    (id, user_id, metric_type, quantity, recorded_at, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+PERIOD_DAY = "day"
+PERIOD_MONTH = "month"
+
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def _period_starts(recorded_at: datetime) -> Tuple[str, str]:
+    """返回记录时间所属的 (日, 月) 周期起始日期"""
+    day = recorded_at.date()
+    return day.isoformat(), day.replace(day=1).isoformat()
+
+
+class UsageWriteBuffer:
+    """
+    进程内共享的使用量写入缓冲区。
+
+    事件先进入内存队列，由后台线程按间隔或达到批量大小时一次性写入：
+    原始记录用 executemany 批量插入，汇总表按 (用户, 指标, 周期) 预先合并后再 upsert，
+    整批在一个事务内完成。尚未落盘的量会计入 pending_quantity，保证配额查询不漏算。
+    """
+
+    def __init__(self, batch_size: int = 200, flush_interval: float = 2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._events: List[tuple] = []
+        self._pending: Dict[Tuple[str, str, str, str], int] = defaultdict(int)
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, record: tuple):
+        """加入一条待写入记录 (id, user_id, metric_type, quantity, recorded_at, metadata)"""
+        _, user_id, metric_type, quantity, recorded_at, _ = record
+        day_start, month_start = _period_starts(datetime.fromisoformat(recorded_at))
+        with self._lock:
+            self._events.append(record)
+            self._pending[(user_id, metric_type, PERIOD_DAY, day_start)] += quantity
+            self._pending[(user_id, metric_type, PERIOD_MONTH, month_start)] += quantity
+            full = len(self._events) >= self.batch_size
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="usage-flusher", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def pending_quantity(self, user_id: str, metric_type: str, period_type: str, period_start: str) -> int:
+        """获取尚未写入数据库的使用量"""
+        with self._lock:
+            return self._pending.get((user_id, metric_type, period_type, period_start), 0)
+
+    def flush(self, db=None) -> int:
+        """
+        立即写入所有缓冲事件
+
+        Returns:
+            写入的记录数
+        """
+        with self._flush_lock:
+            with self._lock:
+                events = self._events
+                pending = self._pending
+                self._events = []
+                self._pending = defaultdict(int)
+            if not events:
+                return 0
+            try:
+                UsageTracker.write_records(db or get_database(), events, pending)
+            except Exception:
+                # 写入失败时放回缓冲区，等待下次重试
+                with self._lock:
+                    self._events = events + self._events
+                    for key, quantity in pending.items():
+                        self._pending[key] += quantity
+                raise
+            return len(events)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[Billing] Failed to flush usage records: {e}")
+
+
+# 所有 UsageTracker 实例共享同一个缓冲区，保证未落盘的用量对配额检查可见
+usage_write_buffer = UsageWriteBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        usage_write_buffer.flush()
+    except Exception as e:
+        print(f"[Billing] Failed to flush usage records on exit: {e}")
+
+
 class UsageTracker:
     """Track usage for quota enforcement and analytics."""
 
@@ -41,6 +185,92 @@ class UsageTracker:
 
     def __init__(self):
         self.db = get_database()
+        self.buffer = usage_write_buffer
+        self.ensure_schema(self.db)
+
+    @staticmethod
+    def ensure_schema(db) -> None:
+        """
+        创建使用量表与汇总表（每个进程只执行一次）
+
+        首次创建汇总表时，会用已有的 usage_records 回填日/月汇总。
+        """
+        global _schema_ready
+        if _schema_ready:
+            return
+        with _schema_lock:
+            if _schema_ready:
+                return
+            cursor = db.cursor()
+            for statement in _SCHEMA_STATEMENTS:
+                cursor.execute(statement)
+            db.commit()
+
+            # 检查与回填在同一事务内完成；多个进程同时启动时，后回填的一方遇到已存在的汇总行直接跳过，
+            # 不会重复累加历史用量
+            with db.atomic():
+                cursor = db.cursor()
+                cursor.execute("SELECT 1 FROM usage_rollups LIMIT 1")
+                if cursor.fetchone() is None:
+                    cursor.execute(
+                        """INSERT INTO usage_rollups (user_id, metric_type, period_type, period_start, quantity)
+                           SELECT user_id, metric_type, ?, substr(recorded_at, 1, 10), SUM(quantity)
+                           FROM usage_records
+                           GROUP BY user_id, metric_type, substr(recorded_at, 1, 10)
+                           ON CONFLICT (user_id, metric_type, period_type, period_start) DO NOTHING""",
+                        (PERIOD_DAY,)
+                    )
+                    cursor.execute(
+                        """INSERT INTO usage_rollups (user_id, metric_type, period_type, period_start, quantity)
+                           SELECT user_id, metric_type, ?, substr(recorded_at, 1, 7) || '-01', SUM(quantity)
+                           FROM usage_records
+                           GROUP BY user_id, metric_type, substr(recorded_at, 1, 7)
+                           ON CONFLICT (user_id, metric_type, period_type, period_start) DO NOTHING""",
+                        (PERIOD_MONTH,)
+                    )
+            _schema_ready = True
+
+    @staticmethod
+    def write_records(db, records: List[tuple], rollups: Optional[Dict[tuple, int]] = None) -> None:
+        """
+        在一个事务内写入原始记录并更新汇总表
+
+        Args:
+            db: 数据库实例
+            records: (id, user_id, metric_type, quantity, recorded_at, metadata) 列表
+            rollups: 已按 (user_id, metric_type, period_type, period_start) 合并的使用量，
+                     为 None 时根据 records 计算
+        """
+        if rollups is None:
+            rollups = defaultdict(int)
+            for _, user_id, metric_type, quantity, recorded_at, _ in records:
+                day_start, month_start = _period_starts(datetime.fromisoformat(recorded_at))
+                rollups[(user_id, metric_type, PERIOD_DAY, day_start)] += quantity
+                rollups[(user_id, metric_type, PERIOD_MONTH, month_start)] += quantity
+
+        with db.atomic():
+            cursor = db.cursor()
+            cursor.executemany(_INSERT_RECORD_SQL, records)
+            cursor.executemany(
+                _UPSERT_ROLLUP_SQL,
+                [(*key, quantity) for key, quantity in rollups.items()]
+            )
+
+    def _get_rollup(self, user_id: str, metric_type: str, period_type: str, period_start: str) -> int:
+        """读取单个汇总值（含缓冲区中尚未写入的量）"""
+        cursor = self.db.cursor()
+        cursor.execute(
+            """SELECT quantity FROM usage_rollups
+               WHERE user_id = ? AND metric_type = ? AND period_type = ? AND period_start = ?""",
+            (user_id, metric_type, period_type, period_start)
+        )
+        result = cursor.fetchone()
+        stored = result[0] if result else 0
+        return stored + self.buffer.pending_quantity(user_id, metric_type, period_type, period_start)
+
+    def flush(self) -> int:
+        """立即写入缓冲区中的使用记录"""
+        return self.buffer.flush(self.db)
 
     def record_usage(
         self,
@@ -48,6 +278,7 @@ class UsageTracker:
         metric_type: str,
         quantity: int = 1,
         metadata: Optional[Dict[str, Any]] = None,
+        buffered: bool = False,
     ) -> Dict[str, Any]:
         """
         记录一次使用事件
@@ -57,6 +288,7 @@ class UsageTracker:
             metric_type: 指标类型 (characters, api_calls, storage_mb, etc.)
             quantity: 使用量
             metadata: 额外元数据 (task_id, project_id, etc.)
+            buffered: 为 True 时放入写入缓冲区由后台线程批量写入，立即返回
 
         Returns:
             记录信息字典
@@ -67,22 +299,18 @@ class UsageTracker:
         record_id = str(uuid.uuid4())
         now = datetime.now()
 
-        import json
-        cursor = self.db.cursor()
-        cursor.execute(
-            """INSERT INTO usage_records
-               (id, user_id, metric_type, quantity, recorded_at, metadata)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (
-                record_id,
-                user_id,
-                metric_type,
-                quantity,
-                now.isoformat(),
-                json.dumps(metadata, ensure_ascii=False) if metadata else None,
-            )
+        record = (
+            record_id,
+            user_id,
+            metric_type,
+            quantity,
+            now.isoformat(),
+            json.dumps(metadata, ensure_ascii=False) if metadata else None,
         )
-        self.db.commit()
+        if buffered:
+            self.buffer.add(record)
+        else:
+            self.write_records(self.db, [record])
 
         return {
             "id": record_id,
@@ -109,17 +337,7 @@ class UsageTracker:
             今日使用量
         """
         today = date.today().isoformat()
-
-        cursor = self.db.cursor()
-        cursor.execute(
-            """SELECT COALESCE(SUM(quantity), 0) as total
-               FROM usage_records
-               WHERE user_id = ? AND metric_type = ? AND date(recorded_at) = ?""",
-            (user_id, metric_type, today)
-        )
-        result = cursor.fetchone()
-
-        return result[0] if result else 0
+        return self._get_rollup(user_id, metric_type, PERIOD_DAY, today)
 
     def get_month_usage(
         self,
@@ -136,19 +354,8 @@ class UsageTracker:
         Returns:
             本月使用量
         """
-        today = date.today()
-        month_start = date(today.year, today.month, 1).isoformat()
-
-        cursor = self.db.cursor()
-        cursor.execute(
-            """SELECT COALESCE(SUM(quantity), 0) as total
-               FROM usage_records
-               WHERE user_id = ? AND metric_type = ? AND date(recorded_at) >= ?""",
-            (user_id, metric_type, month_start)
-        )
-        result = cursor.fetchone()
-
-        return result[0] if result else 0
+        month_start = date.today().replace(day=1).isoformat()
+        return self._get_rollup(user_id, metric_type, PERIOD_MONTH, month_start)
 
     def get_usage_history(
         self,
@@ -183,13 +390,14 @@ class UsageTracker:
             conditions.append("metric_type = ?")
             params.append(metric_type)
 
+        # recorded_at 以 ISO 字符串存储，直接按字符串范围比较即可命中索引
         if start_date:
-            conditions.append("date(recorded_at) >= ?")
+            conditions.append("recorded_at >= ?")
             params.append(start_date)
 
         if end_date:
-            conditions.append("date(recorded_at) <= ?")
-            params.append(end_date)
+            conditions.append("recorded_at < ?")
+            params.append((date.fromisoformat(end_date) + timedelta(days=1)).isoformat())
 
         where_clause = " AND ".join(conditions)
 
@@ -214,7 +422,6 @@ class UsageTracker:
 
         records = []
         for row in rows:
-            import json
             records.append({
                 "id": row[0],
                 "metric_type": row[1],
@@ -260,13 +467,11 @@ class UsageTracker:
 
         cursor = self.db.cursor()
         cursor.execute(
-            """SELECT date(recorded_at) as day, COALESCE(SUM(quantity), 0) as total
-               FROM usage_records
-               WHERE user_id = ? AND metric_type = ?
-               AND date(recorded_at) >= ? AND date(recorded_at) <= ?
-               GROUP BY date(recorded_at)
-               ORDER BY day ASC""",
-            (user_id, metric_type, start_date.isoformat(), end_date.isoformat())
+            """SELECT period_start, quantity
+               FROM usage_rollups
+               WHERE user_id = ? AND metric_type = ? AND period_type = ?
+               AND period_start >= ? AND period_start <= ?""",
+            (user_id, metric_type, PERIOD_DAY, start_date.isoformat(), end_date.isoformat())
         )
         rows = cursor.fetchall()
 
@@ -274,6 +479,10 @@ class UsageTracker:
         stats = {}
         for row in rows:
             stats[row[0]] = row[1]
+        today = end_date.isoformat()
+        stats[today] = stats.get(today, 0) + self.buffer.pending_quantity(
+            user_id, metric_type, PERIOD_DAY, today
+        )
 
         result = []
         current = start_date
@@ -300,48 +509,41 @@ class UsageTracker:
         Returns:
             包含今日、本月、总计使用量的字典
         """
-        today = date.today().isoformat()
-        month_start = date(today.year, today.month, 1).isoformat()
-
-        cursor = self.db.cursor()
+        today = date.today()
+        today_str = today.isoformat()
+        month_start = today.replace(day=1).isoformat()
 
         summary = {
-            "today": {},
-            "month": {},
-            "total": {},
+            "today": {metric_type: 0 for metric_type in self.METRIC_TYPES},
+            "month": {metric_type: 0 for metric_type in self.METRIC_TYPES},
+            "total": {metric_type: 0 for metric_type in self.METRIC_TYPES},
         }
 
-        # 统计每种指标类型
-        for metric_type in self.METRIC_TYPES.keys():
-            # 今日使用量
-            cursor.execute(
-                """SELECT COALESCE(SUM(quantity), 0) as total
-                   FROM usage_records
-                   WHERE user_id = ? AND metric_type = ? AND date(recorded_at) = ?""",
-                (user_id, metric_type, today)
-            )
-            today_usage = cursor.fetchone()[0]
-            summary["today"][metric_type] = today_usage
-
-            # 本月使用量
-            cursor.execute(
-                """SELECT COALESCE(SUM(quantity), 0) as total
-                   FROM usage_records
-                   WHERE user_id = ? AND metric_type = ? AND date(recorded_at) >= ?""",
-                (user_id, metric_type, month_start)
-            )
-            month_usage = cursor.fetchone()[0]
-            summary["month"][metric_type] = month_usage
-
-            # 总使用量
-            cursor.execute(
-                """SELECT COALESCE(SUM(quantity), 0) as total
-                   FROM usage_records
-                   WHERE user_id = ? AND metric_type = ?""",
-                (user_id, metric_type)
-            )
-            total_usage = cursor.fetchone()[0]
-            summary["total"][metric_type] = total_usage
+        # 总使用量由月汇总累加得到，查询量只与月份数相关
+        cursor = self.db.cursor()
+        cursor.execute(
+            """SELECT metric_type, period_type, period_start, quantity
+               FROM usage_rollups
+               WHERE user_id = ? AND (period_type = ? OR (period_type = ? AND period_start = ?))""",
+            (user_id, PERIOD_MONTH, PERIOD_DAY, today_str)
+        )
+        for metric_type, period_type, period_start, quantity in cursor.fetchall():
+            if metric_type not in self.METRIC_TYPES:
+                continue
+            if period_type == PERIOD_DAY:
+                summary["today"][metric_type] += quantity
+            else:
+                summary["total"][metric_type] += quantity
+                if period_start == month_start:
+                    summary["month"][metric_type] += quantity
+
+        # 计入缓冲区中尚未写入的量
+        for metric_type in self.METRIC_TYPES:
+            pending_today = self.buffer.pending_quantity(user_id, metric_type, PERIOD_DAY, today_str)
+            pending_month = self.buffer.pending_quantity(user_id, metric_type, PERIOD_MONTH, month_start)
+            summary["today"][metric_type] += pending_today
+            summary["month"][metric_type] += pending_month
+            summary["total"][metric_type] += pending_month
 
         return summary
 
@@ -367,13 +569,13 @@ class UsageTracker:
         cursor = self.db.cursor()
         cursor.execute(
             """SELECT ur.user_id, u.username, u.email, COALESCE(SUM(ur.quantity), 0) as total
-               FROM usage_records ur
+               FROM usage_rollups ur
                LEFT JOIN users u ON ur.user_id = u.id
-               WHERE ur.metric_type = ? AND date(ur.recorded_at) >= ?
-               GROUP BY ur.user_id
+               WHERE ur.metric_type = ? AND ur.period_type = ? AND ur.period_start >= ?
+               GROUP BY ur.user_id, u.username, u.email
                ORDER BY total DESC
                LIMIT ?""",
-            (metric_type, start_date, limit)
+            (metric_type, PERIOD_DAY, start_date, limit)
         )
         rows = cursor.fetchall()
 
@@ -394,6 +596,8 @@ class UsageTracker:
         """
         删除旧的使用记录（数据清理）
 
+        只删除原始明细，usage_rollups 中的日/月汇总保留，历史统计不受影响。
+
         Args:
             days: 保留天数（超过此天数的记录将被删除）
 
@@ -404,7 +608,7 @@ class UsageTracker:
 
         cursor = self.db.cursor()
         cursor.execute(
-            """DELETE FROM usage_records WHERE date(recorded_at) < ?""",
+            """DELETE FROM usage_records WHERE recorded_at < ?""",
             (cutoff_date,)
         )
         deleted_count = cursor.rowcount
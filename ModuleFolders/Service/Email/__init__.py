@@ -17,12 +17,17 @@ Environment variables:
     SMTP_USE_TLS: Use TLS (default: true)
     EMAIL_FROM: Default from email address
     EMAIL_FROM_NAME: Default from name (default: TranslateFlow)
+    EMAIL_OUTBOX: Queue emails in the database outbox (default: true)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: Delivery attempts before giving up (default: 6)
 """
 
 from .email_service import EmailService, EmailError, get_email_service
+from .outbox import EmailOutbox, get_email_outbox
 
 __all__ = [
     "EmailService",
     "EmailError",
     "get_email_service",
+    "EmailOutbox",
+    "get_email_outbox",
 ]
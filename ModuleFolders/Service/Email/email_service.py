@@ -2,7 +2,9 @@
 Email service for sending notifications.
 
 Provides a high-level interface for sending various types of emails
-with template support and provider abstraction.
+with template support and provider abstraction. Emails are queued in the
+durable outbox (see outbox.py) and delivered by a background sender, so
+callers never wait on the mail server.
 """
 
 import os
@@ -10,6 +12,7 @@ import logging
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
+from .outbox import EmailOutbox, get_email_outbox, outbox_enabled
 from .providers import EmailProvider, create_email_provider
 from .templates import (
     get_verification_email_template,
@@ -27,6 +30,7 @@ from .templates import (
     get_payment_notification_template,
     get_subscription_notification_template,
     get_invoice_notification_template,
+    get_team_invitation_template,
     EmailTemplate,
 )
 
@@ -60,12 +64,18 @@ class EmailService:
     - Login alerts
     """
 
-    def __init__(self, provider: Optional[EmailProvider] = None):
+    def __init__(
+        self,
+        provider: Optional[EmailProvider] = None,
+        outbox: Optional[EmailOutbox] = None,
+    ):
         """
         Initialize email service.
 
         Args:
             provider: Email provider instance (auto-created if not provided)
+            outbox: Outbox to queue emails in (the shared outbox if not provided,
+                none when EMAIL_OUTBOX is false or the database is unavailable)
         """
         if provider:
             self._provider = provider
@@ -76,6 +86,19 @@ class EmailService:
                 logger.warning(f"Email provider not configured: {e}")
                 self._provider = None
 
+        self._outbox = outbox
+        if self._outbox is None and self._provider is not None and outbox_enabled():
+            try:
+                self._outbox = get_email_outbox()
+            except Exception as e:
+                logger.warning(f"Email outbox unavailable, sending inline: {e}")
+        if self._outbox is not None:
+            # An explicitly passed provider takes over the shared sender
+            if provider or self._outbox.provider is None:
+                self._outbox.provider = self._provider
+            # Deliver messages left over from a previous run
+            self._outbox.start()
+
         # Load configuration
         self.config = EmailConfig(
             provider=os.getenv("EMAIL_PROVIDER", "resend"),
@@ -99,6 +122,9 @@ class EmailService:
         """
         Send an email using a template.
 
+        The email is queued in the outbox and this returns immediately;
+        without an outbox it is sent inline.
+
         Args:
             to: Recipient email address(es)
             template: EmailTemplate instance
@@ -107,7 +133,8 @@ class EmailService:
             reply_to: Reply-to address
 
         Returns:
-            Dict with send result
+            Dict with send result (status "queued" and the outbox message_id
+            when queued)
 
         Raises:
             EmailError: If sending fails
@@ -115,16 +142,28 @@ class EmailService:
         if not self.is_available():
             raise EmailError("Email service not available. Check configuration.")
 
+        message = {
+            "to": to,
+            "subject": template.subject,
+            "html": template.html,
+            "text": template.text,
+            "from_email": from_email or self.config.from_email,
+            "from_name": from_name or self.config.from_name,
+            "reply_to": reply_to or self.config.reply_to,
+        }
+
+        if self._outbox is not None:
+            try:
+                return {
+                    "provider": self.config.provider,
+                    "message_id": self._outbox.enqueue(**message),
+                    "status": "queued",
+                }
+            except Exception as e:
+                logger.error(f"Failed to queue email, sending inline: {e}")
+
         try:
-            return self._provider.send_email(
-                to=to,
-                subject=template.subject,
-                html=template.html,
-                text=template.text,
-                from_email=from_email or self.config.from_email,
-                from_name=from_name or self.config.from_name,
-                reply_to=reply_to or self.config.reply_to,
-            )
+            return self._provider.send_email(**message)
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
             raise EmailError(f"Failed to send email: {e}")
@@ -0,0 +1,353 @@
+"""
+Durable email outbox.
+
+EmailService writes each email to the `email_outbox` table and returns
+immediately. A background sender claims due rows in batches, hands each
+batch to the provider's send_many (SMTP reuses one authenticated connection
+for the whole batch) and retries failures with exponential backoff.
+
+A claimed row is leased by moving its next_attempt_at into the future, so
+rows left in `sending` by a crashed process are picked up again once the
+lease expires, and concurrent workers never claim the same row.
+
+Rendered messages contain one-time links and tokens, so the sender also
+purges old rows: sent rows are deleted and failed rows have their body
+redacted once they are older than the retention period.
+
+Environment variables:
+    EMAIL_OUTBOX: Queue emails instead of sending inline (default: true)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: Attempts before a message is marked failed (default: 6)
+    EMAIL_OUTBOX_RETENTION_DAYS: Days to keep sent/failed message bodies, 0 disables the purge (default: 7)
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .providers import EmailProvider
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+_SCHEMA_STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS email_outbox (
+           id VARCHAR(36) PRIMARY KEY,
+           recipients TEXT NOT NULL,
+           subject TEXT NOT NULL,
+           html TEXT NOT NULL,
+           text TEXT NOT NULL,
+           from_email VARCHAR(255),
+           from_name VARCHAR(255),
+           reply_to VARCHAR(255),
+           status VARCHAR(16) NOT NULL,
+           attempts INTEGER NOT NULL DEFAULT 0,
+           next_attempt_at VARCHAR(32) NOT NULL,
+           last_error TEXT,
+           created_at VARCHAR(32) NOT NULL,
+           sent_at VARCHAR(32)
+       )""",
+    """CREATE INDEX IF NOT EXISTS idx_email_outbox_status_next
+       ON email_outbox (status, next_attempt_at)""",
+)
+
+_INSERT_SQL = """
+    INSERT INTO email_outbox
+    (id, recipients, subject, html, text, from_email, from_name, reply_to,
+     status, attempts, next_attempt_at, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)
+"""
+
+_SELECT_DUE_SQL = """
+    SELECT id, recipients, subject, html, text, from_email, from_name, reply_to, attempts
+    FROM email_outbox
+    WHERE status IN (?, ?) AND next_attempt_at <= ?
+    ORDER BY next_attempt_at
+    LIMIT ?
+"""
+
+_CLAIM_SQL = """
+    UPDATE email_outbox SET status = ?, next_attempt_at = ?
+    WHERE id = ? AND status IN (?, ?) AND next_attempt_at <= ?
+"""
+
+_PURGE_SENT_SQL = "DELETE FROM email_outbox WHERE status = ? AND sent_at < ?"
+
+_REDACT_FAILED_SQL = """
+    UPDATE email_outbox SET html = ?, text = ?
+    WHERE status = ? AND created_at < ? AND (html <> ? OR text <> ?)
+"""
+
+REDACTED_BODY = "[redacted]"
+
+
+def _now() -> datetime:
+    return datetime.utcnow()
+
+
+def _timestamp(value: datetime) -> str:
+    # Fixed-width ISO strings so that string comparison follows time order
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class EmailOutbox:
+    """Durable queue of outgoing emails with a background batch sender."""
+
+    def __init__(
+        self,
+        provider: Optional[EmailProvider] = None,
+        db=None,
+        batch_size: int = 50,
+        poll_interval: float = 5.0,
+        lease_seconds: float = 300.0,
+        max_attempts: Optional[int] = None,
+        base_backoff: float = 30.0,
+        max_backoff: float = 3600.0,
+        retention_days: Optional[float] = None,
+        purge_interval: float = 3600.0,
+    ):
+        if db is None:
+            # Imported here so that importing the email package does not connect to the database
+            from ModuleFolders.Infrastructure.Database.pgsql import get_database
+            db = get_database()
+
+        self.provider = provider
+        self.db = db
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts or int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "6"))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        if retention_days is None:
+            retention_days = float(os.getenv("EMAIL_OUTBOX_RETENTION_DAYS", "7"))
+        self.retention_days = retention_days
+        self.purge_interval = purge_interval
+        self._last_purge: Optional[datetime] = None
+
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ensure_schema()
+
+    def ensure_schema(self) -> None:
+        """Create the outbox table (idempotent)."""
+        cursor = self.db.cursor()
+        for statement in _SCHEMA_STATEMENTS:
+            cursor.execute(statement)
+
+    def enqueue(
+        self,
+        to: str | List[str],
+        subject: str,
+        html: str,
+        text: str,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        reply_to: Optional[str] = None,
+    ) -> str:
+        """
+        Store an email for delivery and wake the sender.
+
+        Returns:
+            Outbox message id
+        """
+        message_id = str(uuid.uuid4())
+        recipients = [to] if isinstance(to, str) else list(to)
+        now = _timestamp(_now())
+        with self.db.atomic():
+            self.db.cursor().execute(_INSERT_SQL, (
+                message_id, json.dumps(recipients), subject, html, text,
+                from_email, from_name, reply_to, STATUS_PENDING, now, now,
+            ))
+        self.start()
+        self._wakeup.set()
+        return message_id
+
+    def start(self) -> None:
+        """Start the background sender if it is not running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+                self._thread.start()
+
+    def drain(self) -> int:
+        """
+        Send all messages that are due now.
+
+        Returns:
+            Number of messages sent successfully
+        """
+        sent = 0
+        while True:
+            batch_sent, claimed = self.process_batch()
+            sent += batch_sent
+            if claimed < self.batch_size:
+                return sent
+
+    def process_batch(self) -> tuple:
+        """
+        Claim and send one batch of due messages.
+
+        Returns:
+            (messages sent, messages claimed)
+        """
+        if self.provider is None or not self.provider.is_available():
+            return 0, 0
+
+        with self._drain_lock:
+            rows = self._claim_due()
+            if not rows:
+                return 0, 0
+
+            messages = [{
+                "to": json.loads(row[1]),
+                "subject": row[2],
+                "html": row[3],
+                "text": row[4],
+                "from_email": row[5],
+                "from_name": row[6],
+                "reply_to": row[7],
+            } for row in rows]
+            try:
+                results = self.provider.send_many(messages)
+            except Exception as e:
+                results = [e] * len(messages)
+
+            self._record_results(rows, results)
+            return sum(1 for result in results if not isinstance(result, Exception)), len(rows)
+
+    def _claim_due(self) -> List[tuple]:
+        now = _now()
+        now_text = _timestamp(now)
+        lease_until = _timestamp(now + timedelta(seconds=self.lease_seconds))
+        with self.db.atomic():
+            cursor = self.db.cursor()
+            cursor.execute(_SELECT_DUE_SQL, (STATUS_PENDING, STATUS_SENDING, now_text, self.batch_size))
+            candidates = cursor.fetchall()
+            claimed = []
+            for row in candidates:
+                cursor.execute(_CLAIM_SQL, (
+                    STATUS_SENDING, lease_until, row[0], STATUS_PENDING, STATUS_SENDING, now_text,
+                ))
+                # Another worker may have claimed the row between SELECT and UPDATE
+                if cursor.rowcount == 1:
+                    claimed.append(row)
+        return claimed
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_backoff, self.base_backoff * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _record_results(self, rows: List[tuple], results: List[Any]) -> None:
+        now = _now()
+        sent_rows = []
+        retry_rows = []
+        for row, result in zip(rows, results):
+            if not isinstance(result, Exception):
+                sent_rows.append((STATUS_SENT, _timestamp(now), row[0]))
+                continue
+            attempts = row[8] + 1
+            status = STATUS_FAILED if attempts >= self.max_attempts else STATUS_PENDING
+            next_attempt = _timestamp(now + timedelta(seconds=self._backoff(attempts)))
+            retry_rows.append((status, attempts, next_attempt, str(result)[:1000], row[0]))
+            if status == STATUS_FAILED:
+                logger.error(f"Email {row[0]} failed after {attempts} attempts: {result}")
+
+        with self.db.atomic():
+            cursor = self.db.cursor()
+            if sent_rows:
+                cursor.executemany(
+                    "UPDATE email_outbox SET status = ?, sent_at = ?, last_error = NULL WHERE id = ?",
+                    sent_rows,
+                )
+            if retry_rows:
+                cursor.executemany(
+                    "UPDATE email_outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? "
+                    "WHERE id = ?",
+                    retry_rows,
+                )
+
+    def purge(self) -> int:
+        """
+        Delete sent messages and redact failed ones older than the retention period.
+
+        Returns:
+            Number of rows deleted or redacted
+        """
+        if self.retention_days <= 0:
+            return 0
+        cutoff = _timestamp(_now() - timedelta(days=self.retention_days))
+        with self.db.atomic():
+            cursor = self.db.cursor()
+            cursor.execute(_PURGE_SENT_SQL, (STATUS_SENT, cutoff))
+            deleted = max(cursor.rowcount, 0)
+            cursor.execute(_REDACT_FAILED_SQL, (
+                REDACTED_BODY, REDACTED_BODY, STATUS_FAILED, cutoff, REDACTED_BODY, REDACTED_BODY,
+            ))
+            redacted = max(cursor.rowcount, 0)
+        if deleted or redacted:
+            logger.info(f"Email outbox purge: {deleted} sent deleted, {redacted} failed redacted")
+        return deleted + redacted
+
+    def _purge_if_due(self) -> None:
+        now = _now()
+        if self._last_purge is not None and (now - self._last_purge).total_seconds() < self.purge_interval:
+            return
+        self._last_purge = now
+        self.purge()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                self.drain()
+                self._purge_if_due()
+            except Exception as e:
+                logger.error(f"Email outbox sender error: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Number of outbox messages per status."""
+        cursor = self.db.cursor()
+        cursor.execute("SELECT status, COUNT(*) FROM email_outbox GROUP BY status")
+        return {status: count for status, count in cursor.fetchall()}
+
+
+# Shared by all EmailService instances so one sender thread serves the process
+_email_outbox: Optional[EmailOutbox] = None
+_outbox_lock = threading.Lock()
+
+
+def outbox_enabled() -> bool:
+    """Whether emails should be queued instead of sent inline."""
+    return os.getenv("EMAIL_OUTBOX", "true").lower() in ("true", "1", "yes")
+
+
+def get_email_outbox(provider: Optional[EmailProvider] = None) -> EmailOutbox:
+    """
+    Get the process-wide email outbox.
+
+    Args:
+        provider: Provider used by the sender; replaces the current one when given
+
+    Raises:
+        RuntimeError: If the database is not configured
+    """
+    global _email_outbox
+
+    with _outbox_lock:
+        if _email_outbox is None:
+            _email_outbox = EmailOutbox(provider)
+        elif provider is not None:
+            _email_outbox.provider = provider
+    return _email_outbox
@@ -54,6 +54,25 @@ class EmailProvider(ABC):
         """Check if the provider is configured and available."""
         pass
 
+    def send_many(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any] | Exception]:
+        """
+        Send a batch of emails.
+
+        Args:
+            messages: Keyword arguments for send_email, one dict per email
+
+        Returns:
+            One entry per message, in order: the send_email result, or the
+            exception raised for that message
+        """
+        results = []
+        for message in messages:
+            try:
+                results.append(self.send_email(**message))
+            except Exception as e:
+                results.append(e)
+        return results
+
 
 class ResendProvider(EmailProvider):
     """Resend email provider implementation."""
@@ -198,6 +217,13 @@ class SendGridProvider(EmailProvider):
 class SMTPProvider(EmailProvider):
     """SMTP email provider implementation."""
 
+    # Errors that only concern one message; the connection stays usable
+    MESSAGE_ERRORS = (
+        smtplib.SMTPRecipientsRefused,
+        smtplib.SMTPSenderRefused,
+        smtplib.SMTPDataError,
+    )
+
     def __init__(
         self,
         host: str,
@@ -205,12 +231,33 @@ class SMTPProvider(EmailProvider):
         username: str = None,
         password: str = None,
         use_tls: bool = True,
+        timeout: float = 30,
     ):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.use_tls = use_tls
+        self.timeout = timeout
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open an authenticated SMTP connection."""
+        if self.use_tls:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            server.starttls()
+        else:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
 
     def send_email(
         self,
@@ -223,6 +270,60 @@ class SMTPProvider(EmailProvider):
         reply_to: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Send email using SMTP."""
+        try:
+            server = self._connect()
+            try:
+                return self._send_on(server, to, subject, html, text, from_email, from_name, reply_to)
+            finally:
+                self._close(server)
+        except Exception as e:
+            logger.error(f"SMTP error: {e}")
+            raise
+
+    def send_many(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any] | Exception]:
+        """
+        Send a batch over one authenticated connection.
+
+        The connection is reopened after a connection-level failure. If it
+        cannot be opened at all, the remaining messages fail with that error
+        instead of each paying for another connect attempt.
+        """
+        results: List[Dict[str, Any] | Exception] = []
+        server = None
+        try:
+            for index, message in enumerate(messages):
+                if server is None:
+                    try:
+                        server = self._connect()
+                    except Exception as e:
+                        logger.error(f"SMTP connect error: {e}")
+                        results.extend([e] * (len(messages) - index))
+                        break
+                try:
+                    results.append(self._send_on(server, **message))
+                except Exception as e:
+                    logger.error(f"SMTP error: {e}")
+                    results.append(e)
+                    if not isinstance(e, self.MESSAGE_ERRORS):
+                        self._close(server)
+                        server = None
+        finally:
+            if server is not None:
+                self._close(server)
+        return results
+
+    def _send_on(
+        self,
+        server: smtplib.SMTP,
+        to: str | List[str],
+        subject: str,
+        html: str,
+        text: str,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        reply_to: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send one email on an open connection."""
         # Prepare recipients
         recipients = [to] if isinstance(to, str) else to
 
@@ -241,28 +342,13 @@ class SMTPProvider(EmailProvider):
         msg.attach(part1)
         msg.attach(part2)
 
-        try:
-            # Connect and send
-            if self.use_tls:
-                server = smtplib.SMTP(self.host, self.port)
-                server.starttls()
-            else:
-                server = smtplib.SMTP_SSL(self.host, self.port)
-
-            if self.username and self.password:
-                server.login(self.username, self.password)
-
-            server.sendmail(from_email, recipients, msg.as_string())
-            server.quit()
+        server.sendmail(from_email, recipients, msg.as_string())
 
-            logger.info(f"Email sent via SMTP to {recipients}")
-            return {
-                "provider": "smtp",
-                "status": "sent",
-            }
-        except Exception as e:
-            logger.error(f"SMTP error: {e}")
-            raise
+        logger.info(f"Email sent via SMTP to {recipients}")
+        return {
+            "provider": "smtp",
+            "status": "sent",
+        }
 
     def is_available(self) -> bool:
         """Check if SMTP is configured."""
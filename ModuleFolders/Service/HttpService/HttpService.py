@@ -15,7 +15,7 @@ class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
 
 class RequestHandler(BaseHTTPRequestHandler):
     """处理 HTTP 请求"""
-    
+
     def log_message(self, format, *args):
         # 屏蔽默认的控制台日志，避免刷屏
         pass
@@ -98,12 +98,65 @@ class RequestHandler(BaseHTTPRequestHandler):
                 response_data = {"status": "error", "message": "App is busy (Task running or stopping)"}
                 status_code = 409
 
+        # 2. 翻译字符串（不加载项目，可与项目任务同时运行）
+        elif path == '/api/translate/text':
+            self.handle_translate_text(service)
+            return
+
         # 发送响应
         self.send_response(status_code)
         self.send_header('Content-type', 'application/json')
         self.end_headers()
         self.wfile.write(json.dumps(response_data).encode('utf-8'))
 
+    def send_json(self, status_code: int, response_data: dict):
+        self.send_response(status_code)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(response_data).encode('utf-8'))
+
+    def handle_translate_text(self, service):
+        """翻译请求体中的字符串，stream 为真时按完成顺序逐行返回 NDJSON"""
+        from ModuleFolders.Service.HttpService.TextTranslator import (
+            collect_text_results, iter_text_results, parse_text_request
+        )
+
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            params = {}
+            if content_length > 0:
+                params = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            request = parse_text_request(params)
+            futures = service.get_text_translator().submit(
+                request["texts"], request["source_language"], request["target_language"]
+            )
+        except json.JSONDecodeError as e:
+            self.send_json(400, {"status": "error", "message": f"Invalid JSON: {str(e)}"})
+            return
+        except (TypeError, ValueError) as e:
+            self.send_json(400, {"status": "error", "message": str(e)})
+            return
+        except Exception as e:
+            service.error(f"处理文本翻译请求时发生错误: {e}")
+            self.send_json(500, {"status": "error", "message": str(e)})
+            return
+
+        try:
+            if request["stream"]:
+                self.send_response(200)
+                self.send_header('Content-type', 'application/x-ndjson')
+                self.end_headers()
+                for result in iter_text_results(request["texts"], futures, request["timeout"]):
+                    self.wfile.write((json.dumps(result) + "\n").encode('utf-8'))
+                    self.wfile.flush()
+                return
+
+            status_code, response_data = collect_text_results(request["texts"], futures, request["timeout"])
+            self.send_json(status_code, response_data)
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端提前断开，翻译结果仍会进入合批结果供其他调用方使用
+            pass
+
     def do_GET(self):
         """处理 GET 请求（保持向后兼容）"""
         service = self.server.service_instance
@@ -179,15 +232,26 @@ class HttpService(Base):
         # 依赖对象
         self.cache_manager = None
         self.file_reader = None
-        
+        self.request_limiter = None
+
         # 订阅任务完成事件
         self.subscribe(Base.EVENT.TASK_COMPLETED, self.on_task_completed)
         self.subscribe(Base.EVENT.APP_SHUT_DOWN, self.on_app_shutdown)
 
-    def set_dependencies(self, cache_manager, file_reader):
-        """设置依赖对象（在主程序中调用）"""
+    def set_dependencies(self, cache_manager, file_reader, request_limiter=None):
+        """
+        设置依赖对象（在主程序中调用）
+
+        request_limiter 传入翻译任务的限流器时，文本直译与项目任务共享同一份 RPM/TPM 额度
+        """
         self.cache_manager = cache_manager
         self.file_reader = file_reader
+        self.request_limiter = request_limiter
+
+    def get_text_translator(self):
+        """获取进程内共用的文本直译器（懒加载）"""
+        from ModuleFolders.Service.HttpService.TextTranslator import get_text_translator
+        return get_text_translator(self.request_limiter)
 
     def check_project_loaded(self) -> bool:
         """检查项目是否已加载"""
@@ -266,6 +330,7 @@ class HttpService(Base):
             self.info("可用接口:")
             self.info("  - GET  /api/translate  开始翻译 (使用配置文件路径)")
             self.info("  - POST /api/translate  开始翻译 (可传入自定义路径)")
+            self.info("  - POST /api/translate/text  翻译字符串 (不加载项目，可与任务同时运行)")
             self.info("  - GET  /api/stop       停止任务")
             self.info("  - GET  /api/status     查看状态")
             
@@ -315,6 +380,8 @@ class HttpService(Base):
 
     def on_app_shutdown(self, event: int, data: dict):
         """关闭服务"""
+        if self.text_translator:
+            self.text_translator.close()
         if self.httpd:
             self.info("正在关闭 HTTP 服务...")
             try:
@@ -0,0 +1,451 @@
+"""
+文本直译服务（/api/translate/text）
+
+游戏 Hook、聊天桥接等集成只需要翻译少量字符串，不应该为此走完整的项目流程
+（修改配置文件、读取项目、触发 TASK_START）。本模块直接翻译字符串：
+
+- 并发调用方提交的文本按 (源语言, 目标语言) 合批，在收集窗口内合并为同一个 LLM 请求
+- 相同文本只翻译一次，包括已经在请求中的文本
+- 每批沿用翻译任务的 TextProcessor / PromptBuilder / LLMRequester / ResponseExtractor / ResponseChecker
+- 经 RequestLimiter 与自适应并发窗口限流，可与后台项目任务共享限流器
+- 不读写项目缓存、不修改磁盘上的配置、不改变 Base.work_status，因此可以与项目任务同时运行
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ModuleFolders.Base.Base import Base
+from ModuleFolders.Domain.PromptBuilder.PromptBuilder import PromptBuilder
+from ModuleFolders.Domain.PromptBuilder.PromptBuilderLocal import PromptBuilderLocal
+from ModuleFolders.Domain.PromptBuilder.PromptBuilderSakura import PromptBuilderSakura
+from ModuleFolders.Domain.ResponseChecker.ResponseChecker import ResponseChecker
+from ModuleFolders.Domain.ResponseExtractor.ResponseExtractor import ResponseExtractor
+from ModuleFolders.Domain.TextProcessor.TextProcessor import TextProcessor
+from ModuleFolders.Infrastructure.LLMRequester.LLMRequester import LLMRequester
+from ModuleFolders.Infrastructure.RequestLimiter.ConcurrencyController import get_concurrency_controller
+from ModuleFolders.Infrastructure.RequestLimiter.RequestLimiter import RequestLimiter
+from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
+from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
+from ModuleFolders.Infrastructure.Tokener.Tokener import Tokener
+from ModuleFolders.Service.TaskExecutor.TranslatorUtil import get_source_language_for_file
+
+
+MAX_TEXTS_PER_REQUEST = 1000  # 单次请求的最大文本数
+DEFAULT_TEXT_TIMEOUT = 600  # 默认等待时间（秒）
+
+
+class TextTranslationError(Exception):
+    """单条文本翻译失败"""
+
+
+class _LanguageGroup:
+    """同一语言对的翻译配置与待发送文本"""
+
+    def __init__(self, config: TaskConfig, source_lang: str):
+        self.config = config
+        self.source_lang = source_lang
+        self.text_processor = TextProcessor(config)
+        self.loaded_at = time.monotonic()
+        # 文本 -> Future，保持提交顺序
+        self.pending: "OrderedDict[str, Future]" = OrderedDict()
+        self.first_pending_at = 0.0
+
+
+class TextTranslator(Base):
+    """合批翻译字符串，供 HTTP 文本接口使用"""
+
+    BATCH_WINDOW = 0.05  # 收集窗口（秒），窗口内到达的请求合并为一批
+    CONFIG_TTL = 30.0  # 语言组配置的有效期（秒），过期后重新读取配置以应用界面上的修改
+    MAX_ATTEMPTS = 3  # 单批请求失败或未通过检查时的最大尝试次数
+    LIMITER_TIMEOUT = 600  # 等待限流器的最长时间（秒）
+
+    def __init__(self, request_limiter: Optional[RequestLimiter] = None, batch_window: float = None,
+                 max_batch_lines: int = None) -> None:
+        """
+        Args:
+            request_limiter: 与翻译任务共享的限流器，为空时按平台限额自行创建
+            batch_window: 收集窗口（秒）
+            max_batch_lines: 每批最大行数，为空时使用配置中的 lines_limit
+        """
+        super().__init__()
+        self.request_limiter = request_limiter
+        self.batch_window = self.BATCH_WINDOW if batch_window is None else batch_window
+        self.max_batch_lines = max_batch_lines
+
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._groups: Dict[Tuple[str, str], _LanguageGroup] = {}
+        # (语言对, 文本) -> Future，包含待发送和请求中的文本
+        self._inflight: Dict[Tuple[Tuple[str, str], str], Future] = {}
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="text-translator", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, texts: List[str], source_language: str = None, target_language: str = None) -> List[Future]:
+        """
+        提交文本，返回与 texts 一一对应的 Future（结果为译文，失败时为 TextTranslationError）
+
+        空白文本不发送请求，直接原样返回。
+        """
+        group_key = (source_language or "", target_language or "")
+        loaded = None
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Text translator is closed")
+                group = self._fresh_group(group_key)
+                if group is None and loaded is not None:
+                    group = self._groups[group_key] = loaded
+                if group is not None:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=max(1, group.config.actual_thread_counts), thread_name_prefix="text-translate"
+                        )
+                    futures = self._enqueue(group_key, group, texts)
+                    break
+            # 读取配置涉及磁盘，不在 _lock 内进行；同一时间只有一个调用方读取，其余的下一轮直接使用
+            with self._load_lock:
+                with self._lock:
+                    ready = self._fresh_group(group_key) is not None
+                if not ready:
+                    loaded = self._load_group(source_language, target_language)
+
+        self._wakeup.set()
+        return futures
+
+    def close(self) -> None:
+        """停止分发线程，未完成的文本以错误结束"""
+        with self._lock:
+            self._closed = True
+            pending = list(self._inflight.values())
+            self._inflight.clear()
+            for group in self._groups.values():
+                group.pending.clear()
+        self._wakeup.set()
+        for future in pending:
+            if not future.done():
+                future.set_exception(TextTranslationError("Text translator is closed"))
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _enqueue(self, group_key: Tuple[str, str], group: _LanguageGroup, texts: List[str]) -> List[Future]:
+        """把文本加入语言组的待发送队列，已在队列或请求中的文本共用 Future（调用方持有 _lock）"""
+        futures = []
+        for text in texts:
+            if not text.strip():
+                future = Future()
+                future.set_result(text)
+                futures.append(future)
+                continue
+
+            future = self._inflight.get((group_key, text))
+            if future is None:
+                future = Future()
+                self._inflight[(group_key, text)] = future
+                if not group.pending:
+                    group.first_pending_at = time.monotonic()
+                group.pending[text] = future
+            futures.append(future)
+        return futures
+
+    def _fresh_group(self, group_key: Tuple[str, str]) -> Optional[_LanguageGroup]:
+        """返回仍在有效期内（或还有待发送文本）的语言组（调用方持有 _lock）"""
+        group = self._groups.get(group_key)
+        if group is not None and (group.pending or time.monotonic() - group.loaded_at < self.CONFIG_TTL):
+            return group
+        return None
+
+    def _load_group(self, source_language: Optional[str], target_language: Optional[str]) -> _LanguageGroup:
+        """读取配置并创建语言组（调用方持有 _load_lock，不持有 _lock）"""
+        # 只读取配置，语言覆盖只作用于本接口的 TaskConfig 副本
+        config = TaskConfig()
+        config.initialize()
+        if source_language:
+            config.source_language = source_language
+        if target_language:
+            config.target_language = target_language
+        config.prepare_for_translation(TaskType.TRANSLATION, persist=False)
+        source_lang = get_source_language_for_file(config.source_language, config.target_language, None)
+
+        # 共享的限流器尚未设置限额时（没有运行过翻译任务），按平台限额设置
+        if self.request_limiter is None:
+            self.request_limiter = RequestLimiter()
+        if not self.request_limiter.is_configured():
+            self.request_limiter.set_limit(
+                config.tpm_limit, config.rpm_limit,
+                getattr(config, 'enable_rate_limit', False),
+                getattr(config, 'custom_rpm_limit', 0),
+                getattr(config, 'custom_tpm_limit', 0)
+            )
+
+        return _LanguageGroup(config, source_lang)
+
+    def _dispatch_loop(self) -> None:
+        """收集窗口结束或达到行数上限时把待发送文本切成批次交给线程池"""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+            while True:
+                with self._lock:
+                    if self._closed:
+                        return
+                    batches, next_due = self._take_due_batches()
+                for group_key, group, items in batches:
+                    self._executor.submit(self._run_batch, group_key, group, items)
+                if next_due is None:
+                    break
+                # 窗口未结束，等到最早的批次到期或有新文本到达
+                self._wakeup.wait(next_due)
+                self._wakeup.clear()
+
+    def _take_due_batches(self) -> Tuple[list, Optional[float]]:
+        """取出已到期的批次，并返回下一个批次到期前的秒数（调用方持有 _lock）"""
+        now = time.monotonic()
+        batches = []
+        next_due = None
+        for group_key, group in self._groups.items():
+            max_lines = max(1, self.max_batch_lines or group.config.lines_limit or 20)
+            while group.pending:
+                remaining = self.batch_window - (now - group.first_pending_at)
+                if len(group.pending) < max_lines and remaining > 0:
+                    next_due = remaining if next_due is None else min(next_due, remaining)
+                    break
+                items = []
+                while group.pending and len(items) < max_lines:
+                    items.append(group.pending.popitem(last=False))
+                batches.append((group_key, group, items))
+                group.first_pending_at = now
+        return batches, next_due
+
+    def _run_batch(self, group_key: Tuple[str, str], group: _LanguageGroup, items: List[Tuple[str, Future]]) -> None:
+        try:
+            results = self._translate_with_split(group, [text for text, _ in items])
+        except Exception as e:
+            self.error(f"文本翻译批次执行异常: {e}")
+            results = [TextTranslationError(str(e))] * len(items)
+
+        with self._lock:
+            for text, _ in items:
+                self._inflight.pop((group_key, text), None)
+        for (_, future), result in zip(items, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _translate_with_split(self, group: _LanguageGroup, texts: List[str]) -> list:
+        """整批翻译，多次失败后拆成两半分别重试，避免一行坏数据拖垮整批"""
+        translations, error = self._translate_once(group, texts)
+        if translations is not None:
+            return translations
+        if len(texts) == 1:
+            return [TextTranslationError(error)]
+        middle = len(texts) // 2
+        return self._translate_with_split(group, texts[:middle]) + self._translate_with_split(group, texts[middle:])
+
+    def _translate_once(self, group: _LanguageGroup, texts: List[str]) -> Tuple[Optional[List[str]], str]:
+        """
+        发送一批文本，失败时按 MAX_ATTEMPTS 重试
+
+        Returns:
+            (与 texts 对应的译文, 错误信息)，失败时译文为 None
+        """
+        config = group.config
+        source_text_dict = {str(i): text for i, text in enumerate(texts)}
+
+        # 各种替换步骤，译前替换，提取首尾与占位中间代码
+        source_text_dict, prefix_codes, suffix_codes, placeholder_order, affix_whitespace_storage = \
+            group.text_processor.replace_all(config, group.source_lang, source_text_dict)
+
+        if config.target_platform == "sakura":
+            messages, system_prompt, _ = PromptBuilderSakura.generate_prompt_sakura(
+                config, source_text_dict, [], group.source_lang
+            )
+        elif config.target_platform == "LocalLLM":
+            messages, system_prompt, _ = PromptBuilderLocal.generate_prompt_LocalLLM(
+                config, source_text_dict, [], group.source_lang
+            )
+        else:
+            messages, system_prompt, _ = PromptBuilder.generate_prompt(
+                config, source_text_dict, [], group.source_lang
+            )
+        request_tokens_consume = Tokener.calculate_tokens(self, messages, system_prompt) or 0
+
+        error = ""
+        for attempt in range(self.MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(min(2 ** attempt, 10))
+
+            if not self._wait_limiter(request_tokens_consume):
+                return None, "Rate limiter wait timeout"
+
+            with self._concurrency_slot(config):
+                platform_config = config.get_platform_configuration("translationReq")
+                requester = LLMRequester()
+                skip, _, response_content, _, _ = requester.sent_request(messages, system_prompt, platform_config)
+
+            if skip or not response_content or not response_content.strip():
+                error = f"API request failed: {response_content}" if response_content else "API request failed"
+                continue
+
+            response_dict = ResponseExtractor.text_extraction(self, source_text_dict, response_content)
+            check_result, error_content = ResponseChecker.check_response_content(
+                self, config, placeholder_order, response_content, response_dict, source_text_dict, group.source_lang
+            )
+            if not check_result:
+                error = error_content
+                continue
+
+            response_dict = ResponseExtractor.remove_numbered_prefix(self, response_dict)
+            restored = group.text_processor.restore_all(
+                config, response_dict, prefix_codes, suffix_codes, placeholder_order, affix_whitespace_storage
+            )
+            return [restored.get(str(i), "") for i in range(len(texts))], ""
+
+        return None, error
+
+    def _wait_limiter(self, tokens: int) -> bool:
+        wait_start_time = time.time()
+        while not self.request_limiter.check_limiter(tokens):
+            if self._closed or time.time() - wait_start_time > self.LIMITER_TIMEOUT:
+                return False
+            time.sleep(0.1)
+        return True
+
+    @contextmanager
+    def _concurrency_slot(self, config: TaskConfig):
+        """占用平台的一个在途名额，与同进程中 TaskExecutor 的任务共用同一个门禁"""
+        controller = get_concurrency_controller()
+        scope = config.api_settings.get("translate")
+        while True:
+            if self._closed:
+                raise TextTranslationError("Text translator is closed")
+            # 平台全部 Key 都在限流暂停中时等待 retry-after
+            wait = controller.wait_time(scope)
+            if wait > 0:
+                time.sleep(min(wait, 0.5))
+                continue
+            if controller.try_acquire(scope, config.actual_thread_counts):
+                break
+            time.sleep(0.01)
+        try:
+            yield
+        finally:
+            controller.release(scope)
+
+
+_text_translator: Optional[TextTranslator] = None
+_text_translator_lock = threading.Lock()
+
+
+def get_text_translator(request_limiter: Optional[RequestLimiter] = None) -> TextTranslator:
+    """
+    获取进程内共用的文本直译器（首次调用时创建）
+
+    Args:
+        request_limiter: 首次创建时使用的限流器，传入翻译任务的限流器即可共享 RPM/TPM 额度
+    """
+    global _text_translator
+
+    with _text_translator_lock:
+        if _text_translator is None:
+            _text_translator = TextTranslator(request_limiter)
+    return _text_translator
+
+
+def parse_text_request(params: Any) -> Dict[str, Any]:
+    """
+    校验 /api/translate/text 的请求体
+
+    Returns:
+        {"texts", "source_language", "target_language", "timeout", "stream"}
+
+    Raises:
+        ValueError: 请求体不合法
+    """
+    if not isinstance(params, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    texts = params.get("texts")
+    if texts is None and "text" in params:
+        texts = [params["text"]]
+    if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+        raise ValueError("'texts' must be a non-empty list of strings")
+    if len(texts) > MAX_TEXTS_PER_REQUEST:
+        raise ValueError(f"Too many texts (max {MAX_TEXTS_PER_REQUEST})")
+    for key in ("source_language", "target_language"):
+        if params.get(key) is not None and not isinstance(params[key], str):
+            raise ValueError(f"'{key}' must be a string")
+
+    return {
+        "texts": texts,
+        "source_language": params.get("source_language"),
+        "target_language": params.get("target_language"),
+        "timeout": float(params.get("timeout", DEFAULT_TEXT_TIMEOUT)),
+        "stream": bool(params.get("stream")),
+    }
+
+
+def _text_result(texts: List[str], index: int, future: Future) -> dict:
+    if future.done() and not future.cancelled() and future.exception() is None:
+        return {"index": index, "source": texts[index], "translation": future.result()}
+    error = future.exception() if future.done() and not future.cancelled() else None
+    return {"index": index, "source": texts[index], "error": str(error) if error else "Timed out"}
+
+
+def _group_indexes(futures: List[Future]) -> Dict[Future, List[int]]:
+    # 同一请求中的重复文本共用一个 Future
+    indexes: Dict[Future, List[int]] = {}
+    for index, future in enumerate(futures):
+        indexes.setdefault(future, []).append(index)
+    return indexes
+
+
+def collect_text_results(texts: List[str], futures: List[Future], timeout: float) -> Tuple[int, dict]:
+    """等待全部文本完成（或超时），返回 (HTTP 状态码, 响应体)"""
+    wait(_group_indexes(futures), timeout=timeout)
+    results = [_text_result(texts, index, future) for index, future in enumerate(futures)]
+    errors = [{"index": result["index"], "message": result["error"]} for result in results if "error" in result]
+    if not errors:
+        status, status_code = "success", 200
+    elif len(errors) < len(results):
+        status, status_code = "partial", 200
+    else:
+        status, status_code = "error", 502
+    return status_code, {
+        "status": status,
+        "translations": [result.get("translation") for result in results],
+        "errors": errors,
+    }
+
+
+def iter_text_results(texts: List[str], futures: List[Future], timeout: float) -> Iterator[dict]:
+    """按完成顺序逐条产出结果，超时的文本以错误产出，最后是一行汇总"""
+    indexes = _group_indexes(futures)
+    failed = 0
+    finished = set()
+    try:
+        for future in as_completed(indexes, timeout=timeout):
+            finished.add(future)
+            for index in indexes[future]:
+                result = _text_result(texts, index, future)
+                failed += "error" in result
+                yield result
+    except FuturesTimeoutError:
+        for future, future_indexes in indexes.items():
+            if future not in finished:
+                for index in future_indexes:
+                    failed += 1
+                    yield _text_result(texts, index, future)
+    yield {"status": "done", "count": len(texts), "failed": failed}
@@ -13,6 +13,10 @@ class NERProcessor(Base):
                         "|","ｰ","%","if","Lv","(","\\","]","[","◆",":","_","ｗｗｗ","、","ぁぁ","んえ","んんん",
                     )
 
+    # 不会产生实体的组件，批量识别时关闭以节省时间；entity_ruler、tok2vec 等可能影响识别结果的组件保持启用
+    NON_ENTITY_PIPES = ("parser", "tagger", "morphologizer", "lemmatizer", "attribute_ruler",
+                        "senter", "sentencizer", "textcat", "textcat_multilabel")
+
     def __init__(self):
         super().__init__()
         self.nlp_models = {}
@@ -117,7 +121,27 @@ class NERProcessor(Base):
         self.info("正在按类型对术语进行排序...")
         return sorted(results, key=lambda item: item['type'])
 
-    def extract_terms(self, items_data: list, model_name: str, entity_types: list) -> list:
+    def _recognize_entities(self, nlp, texts: list, batch_size: int, n_process: int) -> dict:
+        """
+        使用 nlp.pipe 批量识别实体。
+
+        Returns:
+            dict: 原文 -> [(实体文本, 实体类型), ...]
+        """
+        disable = [name for name in nlp.pipe_names if name in self.NON_ENTITY_PIPES]
+        total = len(texts)
+        entities = {}
+
+        docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+        for processed_count, (text, doc) in enumerate(zip(texts, docs), start=1):
+            entities[text] = [(ent.text, ent.label_) for ent in doc.ents]
+            if processed_count % batch_size == 0 or processed_count == total:
+                self.info(f"实体识别进度: {processed_count}/{total}...")
+
+        return entities
+
+    def extract_terms(self, items_data: list, model_name: str, entity_types: list,
+                      batch_size: int = 256, n_process: int = 1) -> list:
         """
         从提供的原文数据列表中提取、去重、过滤和排序命名实体。
 
@@ -125,6 +149,8 @@ class NERProcessor(Base):
             items_data (list): 包含待处理数据的列表。
             model_name (str): 要使用的模型名称 (文件夹名)。
             entity_types (list): 需要提取的实体类型标签列表。
+            batch_size (int): nlp.pipe 每批处理的文本数。
+            n_process (int): nlp.pipe 使用的进程数。
 
         Returns:
             list: 包含最终处理结果的字典列表。
@@ -133,34 +159,38 @@ class NERProcessor(Base):
         if not nlp:
             return []
 
-        total_items = len(items_data)
-        self.info(f"开始对 {total_items} 条原文进行实体识别...")
-
-        raw_results = []
-        processed_count = 0
+        # 相同原文只识别一次，结果按原顺序展开，与逐条识别完全一致
+        valid_items = [
+            (item_data.get("source_text"), item_data.get("file_path"))
+            for item_data in items_data
+            if item_data.get("source_text") and item_data.get("source_text").strip()
+        ]
+        unique_texts = list(dict.fromkeys(source_text for source_text, _ in valid_items))
 
-        # 步骤 1: 从文本中提取原始实体
-        for item_data in items_data:
-            source_text = item_data.get("source_text")
-            file_path = item_data.get("file_path")
+        self.info(f"开始对 {len(items_data)} 条原文进行实体识别（去重后 {len(unique_texts)} 条）...")
 
-            if not source_text or not source_text.strip():
-                continue
+        batch_size = max(1, batch_size)
+        n_process = max(1, n_process)
+        try:
+            entities = self._recognize_entities(nlp, unique_texts, batch_size, n_process)
+        except Exception as e:
+            if n_process == 1:
+                raise
+            self.warning(f"多进程实体识别失败，改为单进程: {e}")
+            entities = self._recognize_entities(nlp, unique_texts, batch_size, 1)
 
-            doc = nlp(source_text)
-            for ent in doc.ents:
-                if ent.label_ in entity_types:
+        # 步骤 1: 从文本中提取原始实体
+        raw_results = []
+        for source_text, file_path in valid_items:
+            for term, label in entities[source_text]:
+                if label in entity_types:
                     raw_results.append({
-                        "term": ent.text,
-                        "type": ent.label_,
+                        "term": term,
+                        "type": label,
                         "context": source_text,
                         "file_path": file_path,
                     })
 
-            processed_count += 1
-            if processed_count % 50 == 0 or processed_count == total_items:
-                self.info(f"实体识别进度: {processed_count}/{total_items}...")
-
         # 步骤 2: 对提取结果进行去重
         unique_results = self._deduplicate_results(raw_results)
 
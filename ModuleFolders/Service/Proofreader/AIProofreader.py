@@ -4,8 +4,11 @@ AI校对器 - 调用LLM进行翻译校对
 
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 
 @dataclass
@@ -32,10 +35,79 @@ class AICheckResult:
 class AIProofreader:
     """AI校对器"""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, request_limiter=None):
+        """
+        Args:
+            config: 配置字典
+            request_limiter: 与翻译任务共享的限流器，为空时按平台限额自行创建
+        """
         self.config = config
         self.prompt_template = self._load_prompt()
         self.confidence_threshold = config.get("proofread_confidence_threshold", 0.7)
+        self.request_limiter = request_limiter
+        self._task_config = None
+        self._init_lock = threading.Lock()
+
+    def _get_task_config(self):
+        """
+        准备一次平台配置并复用：API Key 的轮询状态保存在 TaskConfig 中，
+        每次请求重新创建会导致始终使用第一个 Key
+        """
+        with self._init_lock:
+            if self._task_config is None:
+                from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
+                from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
+
+                task_config = TaskConfig()
+                task_config.load_config_from_dict(self.config)
+                task_config.prepare_for_translation(TaskType.TRANSLATION)
+
+                if self.request_limiter is None or not self.request_limiter.is_configured():
+                    from ModuleFolders.Infrastructure.RequestLimiter.RequestLimiter import RequestLimiter
+
+                    # 共享的限流器尚未设置限额时（没有运行过翻译任务），按平台限额设置
+                    if self.request_limiter is None:
+                        self.request_limiter = RequestLimiter()
+                    self.request_limiter.set_limit(
+                        task_config.tpm_limit, task_config.rpm_limit,
+                        getattr(task_config, 'enable_rate_limit', False),
+                        getattr(task_config, 'custom_rpm_limit', 0),
+                        getattr(task_config, 'custom_tpm_limit', 0)
+                    )
+                self._task_config = task_config
+            return self._task_config
+
+    def _send_request(self, messages: List[dict]) -> Tuple[bool, str, int, int]:
+        """
+        经限流器发送一次请求（与翻译任务相同的限流与 Key 轮询逻辑）
+
+        Returns:
+            (skip, response_content, prompt_tokens, completion_tokens)
+        """
+        from ModuleFolders.Base.Base import Base
+        from ModuleFolders.Infrastructure.LLMRequester.LLMRequester import LLMRequester
+        from ModuleFolders.Infrastructure.Tokener.Tokener import Tokener
+
+        task_config = self._get_task_config()
+
+        # 预估 Token 消费并等待限流
+        request_tokens_consume = Tokener.calculate_tokens(self, messages, self.prompt_template) or 0
+        wait_start_time = time.time()
+        while not self.request_limiter.check_limiter(request_tokens_consume):
+            if getattr(Base, "work_status", None) == Base.STATUS.STOPING:
+                return True, "", 0, 0
+            if time.time() - wait_start_time > 600:
+                return True, "", 0, 0
+            time.sleep(0.1)
+
+        platform_config = task_config.get_platform_configuration("translationReq")
+        requester = LLMRequester()
+        skip, _, response_content, prompt_tokens, completion_tokens = requester.sent_request(
+            messages=messages,
+            system_prompt=self.prompt_template,
+            platform_config=platform_config
+        )
+        return skip, response_content, prompt_tokens, completion_tokens
 
     def _load_prompt(self) -> str:
         """加载校对提示词，根据用户配置自动选择语言"""
@@ -202,9 +274,6 @@ class AIProofreader:
         characterization: List[dict] = None
     ) -> AICheckResult:
         """校对单条翻译（同步方法）"""
-        from ModuleFolders.Infrastructure.LLMRequester.LLMRequester import LLMRequester
-        from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
-
         user_message = self._build_user_message(
             source, translation, glossary, context, 
             world_building, writing_style, characterization
@@ -213,18 +282,7 @@ class AIProofreader:
         messages = [{"role": "user", "content": user_message}]
 
         try:
-            from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
-            task_config = TaskConfig()
-            task_config.load_config_from_dict(self.config)
-            task_config.prepare_for_translation(TaskType.TRANSLATION)
-            platform_config = task_config.get_platform_configuration("translationReq")
-
-            requester = LLMRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.sent_request(
-                messages=messages,
-                system_prompt=self.prompt_template,
-                platform_config=platform_config
-            )
+            skip, response_content, prompt_tokens, completion_tokens = self._send_request(messages)
 
             if skip:
                 return AICheckResult(has_issues=False, issues=[])
@@ -238,20 +296,20 @@ class AIProofreader:
             print(f"[AI校对错误] {e}")
             return AICheckResult(has_issues=False, issues=[])
 
-    def proofread_lines_block(
+    def _request_block(
         self,
         items: List[Dict[str, Any]],
         glossary: List[dict] = None,
         world_building: str = "",
         writing_style: str = "",
         characterization: List[dict] = None
-    ) -> Dict[int, AICheckResult]:
-        """
-        批量打包校对：将多行内容打包进一次 API 请求
+    ) -> Tuple[Optional[Dict[int, AICheckResult]], int, int]:
         """
-        if not items:
-            return {}
+        将多行内容打包进一次 API 请求
 
+        Returns:
+            (结果字典, prompt_tokens, completion_tokens)；请求失败或响应无法解析时结果为 None
+        """
         # 构建规则前缀
         rule_parts = []
         if world_building: rule_parts.append(f"世界观: {world_building}")
@@ -280,109 +338,216 @@ class AIProofreader:
             glossary_str = "\n".join([f"- {i.get('src')} -> {i.get('dst')}" for i in glossary])
             user_message += f"\n\n## 术语表\n{glossary_str}"
 
-        # 发送请求 (复用 platform 配置逻辑)
-        from ModuleFolders.Infrastructure.LLMRequester.LLMRequester import LLMRequester
-        from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
-        from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
-
         messages = [{"role": "user", "content": user_message}]
-        results = {}
 
         try:
-            task_config = TaskConfig()
-            task_config.load_config_from_dict(self.config)
-            task_config.prepare_for_translation(TaskType.TRANSLATION)
-            platform_config = task_config.get_platform_configuration("translationReq")
-
-            requester = LLMRequester()
-            skip, _, response_content, p_tok, c_tok = requester.sent_request(
-                messages=messages,
-                system_prompt=self.prompt_template,
-                platform_config=platform_config
-            )
-
-            if skip or not response_content:
-                return {}
-
-            import json
-            import re
-            json_match = response_content
-            if "```json" in response_content:
-                start = response_content.find("```json") + 7
-                end = response_content.find("```", start)
-                json_match = response_content[start:end].strip()
-            
-            try:
-                data_list = json.loads(json_match)
-                if isinstance(data_list, list):
-                    for entry in data_list:
-                        line_id = entry.get("line_id")
-                        if line_id is not None:
-                            issues = []
-                            for iss in entry.get("issues", []):
-                                issues.append(AICheckIssue(
-                                    type=iss.get("type", "unknown"),
-                                    severity=iss.get("severity", "medium"),
-                                    location="",
-                                    description=iss.get("description", ""),
-                                    suggestion=iss.get("suggestion", ""),
-                                    confidence=iss.get("confidence", 0.8)
-                                ))
-                            if issues:
-                                results[line_id] = AICheckResult(
-                                    has_issues=True,
-                                    issues=issues,
-                                    corrected_translation=entry.get("corrected_translation", ""),
-                                    prompt_tokens=p_tok // len(items),
-                                    completion_tokens=c_tok // len(items)
-                                )
-            except: pass
+            skip, response_content, p_tok, c_tok = self._send_request(messages)
         except Exception as e:
             print(f"[AI批量校对错误] {e}")
+            return None, 0, 0
+
+        if skip or not response_content:
+            return None, p_tok, c_tok
 
-        return results
+        json_match = response_content
+        if "```json" in response_content:
+            start = response_content.find("```json") + 7
+            end = response_content.find("```", start)
+            json_match = response_content[start:end].strip()
+
+        try:
+            data_list = json.loads(json_match)
+        except (json.JSONDecodeError, TypeError):
+            return None, p_tok, c_tok
+        if not isinstance(data_list, list):
+            return None, p_tok, c_tok
+
+        results = {}
+        for entry in data_list:
+            if not isinstance(entry, dict):
+                continue
+            line_id = entry.get("line_id")
+            if line_id is not None:
+                issues = []
+                for iss in entry.get("issues", []):
+                    issues.append(AICheckIssue(
+                        type=iss.get("type", "unknown"),
+                        severity=iss.get("severity", "medium"),
+                        location="",
+                        description=iss.get("description", ""),
+                        suggestion=iss.get("suggestion", ""),
+                        confidence=iss.get("confidence", 0.8)
+                    ))
+                if issues:
+                    results[line_id] = AICheckResult(
+                        has_issues=True,
+                        issues=issues,
+                        corrected_translation=entry.get("corrected_translation", ""),
+                        prompt_tokens=p_tok // len(items),
+                        completion_tokens=c_tok // len(items)
+                    )
+        return results, p_tok, c_tok
+
+    def proofread_lines_block(
+        self,
+        items: List[Dict[str, Any]],
+        glossary: List[dict] = None,
+        world_building: str = "",
+        writing_style: str = "",
+        characterization: List[dict] = None
+    ) -> Dict[int, AICheckResult]:
+        """
+        批量打包校对：将多行内容打包进一次 API 请求
+        """
+        if not items:
+            return {}
+
+        results, _, _ = self._request_block(
+            items, glossary, world_building, writing_style, characterization
+        )
+        return results or {}
+
+    def _build_context(self, items: List[Dict[str, Any]], i: int, context_lines: int) -> str:
+        """构建第 i 条的上下文"""
+        context_parts = []
+        start = max(0, i - context_lines)
+        end = min(len(items), i + context_lines + 1)
+
+        for j in range(start, end):
+            if j != i:
+                ctx_item = items[j]
+                context_parts.append(
+                    f"[{j}] {ctx_item.get('source', '')[:50]}"
+                )
+
+        return "\n".join(context_parts)
+
+    def _filter_confident(self, result: AICheckResult) -> AICheckResult:
+        """按置信度阈值过滤批量结果中的问题，与单条校对保持一致"""
+        result.issues = [issue for issue in result.issues if issue.confidence >= self.confidence_threshold]
+        result.has_issues = len(result.issues) > 0
+        return result
 
     def proofread_batch(
         self,
         items: List[Dict[str, Any]],
         glossary: List[dict] = None,
         context_lines: int = 5,
-        progress_callback=None
+        progress_callback=None,
+        batch_size: int = None,
+        max_workers: int = None,
+        world_building: str = "",
+        writing_style: str = "",
+        characterization: List[dict] = None,
+        should_stop=None
     ) -> Dict[int, AICheckResult]:
-        """批量校对"""
-        results = {}
-        total_prompt_tokens = 0
-        total_completion_tokens = 0
-
-        for i, item in enumerate(items):
-            # 构建上下文
-            context_parts = []
-            start = max(0, i - context_lines)
-            end = min(len(items), i + context_lines + 1)
-
-            for j in range(start, end):
-                if j != i:
-                    ctx_item = items[j]
-                    context_parts.append(
-                        f"[{j}] {ctx_item.get('source', '')[:50]}"
-                    )
+        """
+        批量校对
+
+        每 batch_size 条打包为一次请求，多个请求并发执行（共享限流器与 API Key 轮询）；
+        打包请求失败或响应无法解析时，该批次退回逐条校对。
+
+        Args:
+            items: 待校对数据 (index, source, translation)
+            glossary: 术语表
+            context_lines: 逐条校对时的上下文行数
+            progress_callback: 进度回调 (已完成条数, 总条数, prompt_tokens, completion_tokens)
+            batch_size: 每次请求打包的条数，默认读取 proofread_batch_size
+            max_workers: 并发请求数，默认使用实际线程数
+            world_building / writing_style / characterization: 随请求发送的规则设定
+            should_stop: 返回 True 时不再发送新的请求，已完成的结果照常返回
+
+        Returns:
+            {行索引: AICheckResult}，仅包含有问题的行
+        """
+        from ModuleFolders.Base.Base import Base
+
+        if not items:
+            return {}
 
-            context = "\n".join(context_parts)
+        # 行索引作为批量响应中的 line_id，缺失时使用列表位置
+        indexed_items = [
+            item if "index" in item else {**item, "index": i}
+            for i, item in enumerate(items)
+        ]
+        positions = {id(item): i for i, item in enumerate(indexed_items)}
 
+        if batch_size is None:
+            batch_size = self.config.get("proofread_batch_size", 20)
+        batch_size = max(1, batch_size)
+        if max_workers is None:
+            max_workers = self._get_task_config().actual_thread_counts
+        max_workers = max(1, max_workers)
+
+        blocks = [indexed_items[i:i + batch_size] for i in range(0, len(indexed_items), batch_size)]
+
+        results = {}
+        state = {"done": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        state_lock = threading.Lock()
+
+        def report(done: int, prompt_tokens: int, completion_tokens: int):
+            with state_lock:
+                state["done"] += done
+                state["prompt_tokens"] += prompt_tokens
+                state["completion_tokens"] += completion_tokens
+                if progress_callback:
+                    progress_callback(state["done"], len(items), state["prompt_tokens"], state["completion_tokens"])
+
+        def stopped() -> bool:
+            if getattr(Base, "work_status", None) == Base.STATUS.STOPING:
+                return True
+            return bool(should_stop and should_stop())
+
+        def proofread_one(item: Dict[str, Any]) -> Optional[AICheckResult]:
             result = self.proofread_single(
                 source=item.get("source", ""),
                 translation=item.get("translation", ""),
                 glossary=glossary,
-                context=context
+                context=self._build_context(indexed_items, positions[id(item)], context_lines),
+                world_building=world_building,
+                writing_style=writing_style,
+                characterization=characterization
             )
+            report(1, result.prompt_tokens, result.completion_tokens)
+            return result
 
-            total_prompt_tokens += result.prompt_tokens
-            total_completion_tokens += result.completion_tokens
-
-            if result.has_issues:
-                results[item.get("index", i)] = result
-
-            if progress_callback:
-                progress_callback(i + 1, len(items), total_prompt_tokens, total_completion_tokens)
+        def process_block(block: List[Dict[str, Any]]) -> Dict[int, AICheckResult]:
+            if stopped():
+                return {}
 
-        return results
+            block_results = None
+            if len(block) > 1:
+                block_results, p_tok, c_tok = self._request_block(
+                    block, glossary, world_building, writing_style, characterization
+                )
+                if block_results is not None:
+                    report(len(block), p_tok, c_tok)
+                    valid_ids = {item["index"] for item in block}
+                    return {
+                        line_id: result
+                        for line_id, result in block_results.items()
+                        if line_id in valid_ids and self._filter_confident(result).has_issues
+                    }
+                report(0, p_tok, c_tok)
+
+            # 单条或打包失败：逐条校对
+            block_results = {}
+            for item in block:
+                if stopped():
+                    break
+                result = proofread_one(item)
+                if result.has_issues:
+                    block_results[item["index"]] = result
+            return block_results
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai_proofread") as executor:
+            futures = [executor.submit(process_block, block) for block in blocks]
+            for future in as_completed(futures):
+                results.update(future.result())
+
+        # 保持与输入相同的顺序
+        return {
+            item["index"]: results[item["index"]]
+            for item in indexed_items
+            if item["index"] in results
+        }
@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from typing import List
 from abc import ABC, abstractmethod
 
+from ModuleFolders.Infrastructure.Parallel.ShardedPool import run_sharded
+
 
 @dataclass
 class RuleCheckResult:
@@ -41,11 +43,14 @@ class QuotePairRule(BaseRule):
     def name(self) -> str:
         return "quote_pair"
 
-    def _count_apostrophes(self, text: str, quote_char: str) -> int:
+    # 匹配 I'm, don't, it's 等缩写形式
+    APOSTROPHE_REG = re.compile("[a-zA-Z]\u2019[a-zA-Z]")
+
+    def _count_apostrophes(self, text: str) -> int:
         """计算英文缩写中的撇号数量（字母+撇号+字母的模式）"""
-        # 匹配 I'm, don't, it's 等缩写形式
-        pattern = r"[a-zA-Z]" + re.escape(quote_char) + r"[a-zA-Z]"
-        return len(re.findall(pattern, text))
+        if '\u2019' not in text:
+            return 0
+        return len(self.APOSTROPHE_REG.findall(text))
 
     def check(self, source: str, target: str) -> List[RuleCheckResult]:
         results = []
@@ -72,8 +77,8 @@ class QuotePairRule(BaseRule):
             # 对于中文单引号，右引号'可能被用作英文撇号（I'm, don't等）
             # 需要排除这些缩写形式
             if right == '\u2019':
-                src_apostrophes = self._count_apostrophes(source, right)
-                tgt_apostrophes = self._count_apostrophes(target, right)
+                src_apostrophes = self._count_apostrophes(source)
+                tgt_apostrophes = self._count_apostrophes(target)
                 # 调整计数，排除撇号
                 src_right = src_right - src_apostrophes
                 right_count = right_count - tgt_apostrophes
@@ -147,6 +152,23 @@ class BracketPairRule(BaseRule):
 class PlaceholderRule(BaseRule):
     """占位符保留检查"""
 
+    # 严格匹配的占位符（内容必须完全相同）
+    STRICT_PATTERNS = [
+        (re.compile(r'%[sd]'), '百分号占位符'),
+        (re.compile(r'%\d*[sd]'), '带数字占位符'),
+        (re.compile(r'\$\{[^}]+\}'), '模板占位符'),
+        (re.compile(r'\[\[[^\]]+\]\]'), '双方括号占位符'),
+    ]
+
+    # 数量匹配的占位符（内容可以翻译，但数量要一致）
+    COUNT_PATTERNS = [
+        (re.compile(r'\{[^}]+\}'), '花括号占位符'),
+        (re.compile(r'<[^>]+/?>'), 'HTML/XML标签'),
+    ]
+
+    HTML_OPEN_REG = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*(?<!/)>')
+    HTML_CLOSE_REG = re.compile(r'</[a-zA-Z][a-zA-Z0-9]*>')
+
     @property
     def name(self) -> str:
         return "placeholder"
@@ -154,24 +176,10 @@ class PlaceholderRule(BaseRule):
     def check(self, source: str, target: str) -> List[RuleCheckResult]:
         results = []
 
-        # 严格匹配的占位符（内容必须完全相同）
-        strict_patterns = [
-            (r'%[sd]', '百分号占位符'),
-            (r'%\d*[sd]', '带数字占位符'),
-            (r'\$\{[^}]+\}', '模板占位符'),
-            (r'\[\[[^\]]+\]\]', '双方括号占位符'),
-        ]
-
-        # 数量匹配的占位符（内容可以翻译，但数量要一致）
-        count_patterns = [
-            (r'\{[^}]+\}', '花括号占位符'),
-            (r'<[^>]+/?>', 'HTML/XML标签'),
-        ]
-
         # 严格匹配检查
-        for pattern, pattern_name in strict_patterns:
-            source_matches = set(re.findall(pattern, source))
-            target_matches = set(re.findall(pattern, target))
+        for pattern, pattern_name in self.STRICT_PATTERNS:
+            source_matches = set(pattern.findall(source))
+            target_matches = set(pattern.findall(target))
 
             missing = source_matches - target_matches
             if missing:
@@ -186,9 +194,9 @@ class PlaceholderRule(BaseRule):
                 ))
 
         # 数量匹配检查（内容可以翻译，但数量要一致）
-        for pattern, pattern_name in count_patterns:
-            source_matches = re.findall(pattern, source)
-            target_matches = re.findall(pattern, target)
+        for pattern, pattern_name in self.COUNT_PATTERNS:
+            source_matches = pattern.findall(source)
+            target_matches = pattern.findall(target)
 
             src_count = len(source_matches)
             tgt_count = len(target_matches)
@@ -196,8 +204,8 @@ class PlaceholderRule(BaseRule):
             # 对于HTML标签，检查原文开闭标签是否配对
             # 如果原文本身不配对，跳过检查（可能是原文问题，译文补全了）
             if pattern_name == 'HTML/XML标签':
-                src_open = len(re.findall(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*(?<!/)>', source))
-                src_close = len(re.findall(r'</[a-zA-Z][a-zA-Z0-9]*>', source))
+                src_open = len(self.HTML_OPEN_REG.findall(source))
+                src_close = len(self.HTML_CLOSE_REG.findall(source))
                 if src_open != src_close:
                     continue
 
@@ -226,14 +234,14 @@ class ControlCharRule(BaseRule):
         results = []
 
         control_chars = [
-            (r'\n', '换行符'),
-            (r'\t', '制表符'),
-            (r'\r', '回车符'),
+            ('\n', '换行符'),
+            ('\t', '制表符'),
+            ('\r', '回车符'),
         ]
 
-        for pattern, char_name in control_chars:
-            source_count = len(re.findall(pattern, source))
-            target_count = len(re.findall(pattern, target))
+        for char, char_name in control_chars:
+            source_count = source.count(char)
+            target_count = target.count(char)
 
             if source_count > 0 and target_count == 0:
                 results.append(RuleCheckResult(
@@ -297,11 +305,16 @@ class RuleBasedChecker:
             all_results.extend(results)
         return all_results
 
-    def check_batch(self, items: List[tuple]) -> dict:
-        """批量检查，返回按索引分组的结果"""
-        results_by_index = {}
-        for index, source, target in items:
+    def _check_shard(self, items: List[tuple]) -> List[tuple]:
+        """检查一个分片，返回 (分片内序号, 结果) 列表，只包含有问题的条目"""
+        shard_results = []
+        for position, (_, source, target) in enumerate(items):
             results = self.check(source, target)
             if results:
-                results_by_index[index] = results
-        return results_by_index
+                shard_results.append((position, results))
+        return shard_results
+
+    def check_batch(self, items: List[tuple], max_workers: int = None) -> dict:
+        """批量检查，返回按索引分组的结果，条目较多时使用进程池"""
+        results = run_sharded(items, self, RuleBasedChecker._check_shard, max_workers)
+        return {items[position][0]: shard_results for position, shard_results in results.items()}
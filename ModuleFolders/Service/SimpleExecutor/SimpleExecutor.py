@@ -602,7 +602,9 @@ class SimpleExecutor(Base):
         results = processor.extract_terms(
             items_data=items_data,
             model_name=params.get("model_name"), # 使用 model_name
-            entity_types=params.get("entity_types")
+            entity_types=params.get("entity_types"),
+            batch_size=params.get("batch_size", 256),
+            n_process=params.get("n_process", 1),
         )
         
         self.info(f"术语提取完成，共找到 {len(results)} 个术语。")
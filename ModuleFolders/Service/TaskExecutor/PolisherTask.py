@@ -13,6 +13,7 @@ from ModuleFolders.Base.PluginManager import PluginManager
 from ModuleFolders.Infrastructure.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.Infrastructure.LLMRequester.LLMRequester import LLMRequester
+from ModuleFolders.Infrastructure.LLMRequester.ResponseCache import get_response_cache
 from ModuleFolders.Domain.PromptBuilder.PromptBuilderPolishing import PromptBuilderPolishing
 from ModuleFolders.Domain.ResponseExtractor.ResponseExtractor import ResponseExtractor
 from ModuleFolders.Domain.ResponseChecker.ResponseChecker import ResponseChecker
@@ -200,7 +201,8 @@ class PolisherTask(Base):
             skip, status_tag, error_msg, p_tokens, c_tokens = requester.sent_request(
                 self.messages,
                 self.system_prompt,
-                platform_config
+                platform_config,
+                use_cache=True
             )
 
             # 3. 处理失败
@@ -317,6 +319,10 @@ class PolisherTask(Base):
         if check_result == False:
             error = f"[{self.task_id}] [ERROR] 译文文本未通过检查，将在下一轮次的翻译中重新翻译 - {error_content}"
 
+            # 未通过检查的回复不能再从响应缓存返回，否则下一轮会得到同样的结果
+            if getattr(self.config, "enable_response_cache", False):
+                get_response_cache().invalidate(self.messages, self.system_prompt, platform_config)
+
             # 打印任务结果
             if self.is_debug() and not self.config.show_detailed_logs:
                 self.print(
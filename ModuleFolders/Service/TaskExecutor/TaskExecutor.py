@@ -19,6 +19,9 @@ from ModuleFolders.Domain.PromptBuilder.PromptBuilderEnum import PromptBuilderEn
 from ModuleFolders.Domain.PromptBuilder.PromptBuilderLocal import PromptBuilderLocal
 from ModuleFolders.Domain.PromptBuilder.PromptBuilderSakura import PromptBuilderSakura
 from ModuleFolders.Infrastructure.RequestLimiter.RequestLimiter import RequestLimiter
+from ModuleFolders.Infrastructure.RequestLimiter.ConcurrencyController import get_concurrency_controller
+from ModuleFolders.Infrastructure.LLMRequester.ResponseCache import get_response_cache
+from ModuleFolders.Infrastructure.Metrics.StageMetrics import build_summary, diff_snapshots, get_stage_metrics, write_summary
 from ModuleFolders.Service.TaskExecutor.TranslatorUtil import get_source_language_for_file
 
 
@@ -57,8 +60,9 @@ class TaskExecutor(Base):
         self.current_mode = None
         
         # Concurrency Control for Mission Control
-        self._concurrency_lock = threading.Lock()
-        self._current_active = 0
+        self._concurrency_scope = None  # 自适应并发窗口所属的平台
+        self._metrics_before = None  # 本次任务开始时的指标快照
+        self._metrics_start = 0.0
         self.executor = None
 
     # API 状态报告事件处理
@@ -102,29 +106,78 @@ class TaskExecutor(Base):
                 self.skipped_files.add(path)
                 self.print(f"[bold yellow]Skip request received for {os.path.basename(path)}. New tasks for this file will be ignored.[/bold yellow]")
 
+    def _configure_concurrency(self, mode) -> None:
+        """按当前平台与 Key 初始化自适应并发窗口，线程数设置作为上限"""
+        self._concurrency_scope = self.config.api_settings["polish" if mode == TaskType.POLISH else "translate"]
+        get_concurrency_controller().configure(
+            self._concurrency_scope,
+            self.config.apikey_list,
+            self.config.actual_thread_counts,
+            getattr(self.config, 'enable_adaptive_concurrency', True),
+        )
+
+    def _try_acquire_slot(self) -> bool:
+        """占用一个在途名额：配置的线程数与自适应窗口取小，与同进程的文本直译共用"""
+        return get_concurrency_controller().try_acquire(self._concurrency_scope, self.config.actual_thread_counts)
+
+    def _release_slot(self) -> None:
+        get_concurrency_controller().release(self._concurrency_scope)
+
+    def _begin_metrics_run(self) -> None:
+        """记录任务开始时的指标快照；由 WebServer 启动时定时推送指标"""
+        metrics = get_stage_metrics()
+        self._metrics_before = metrics.snapshot()
+        self._metrics_start = time.time()
+        api_url = os.environ.get("AINIEE_INTERNAL_API_URL")
+        if api_url:
+            metrics.start_push(api_url, str(os.getpid()))
+
+    def _finish_metrics_run(self) -> None:
+        """把本次任务的指标增量写入输出目录的 cache/metrics_summary.json"""
+        if self._metrics_before is None:
+            return
+        metrics = get_stage_metrics()
+        delta = diff_snapshots(metrics.snapshot(), self._metrics_before)
+        self._metrics_before = None
+        summary = build_summary(delta, time.time() - self._metrics_start)
+        try:
+            write_summary(os.path.join(self.session_output_path, "cache", "metrics_summary.json"), summary)
+        except OSError as e:
+            self.warning(f"指标摘要写入失败: {e}")
+        api_url = os.environ.get("AINIEE_INTERNAL_API_URL")
+        if api_url:
+            metrics.push(api_url, str(os.getpid()))
+
     def _gated_run(self, task):
         """指挥中心：动态门禁控制"""
+        controller = get_concurrency_controller()
+        metrics = get_stage_metrics()
+        wait_start = time.perf_counter()
         while True:
             if Base.work_status == Base.STATUS.STOPING: return None
-            with self._concurrency_lock:
-                # 实时检查配置中的线程限制
-                if self._current_active < self.config.actual_thread_counts:
-                    self._current_active += 1
-                    break
+            # 平台全部 Key 都在限流暂停中时等待 retry-after
+            wait = controller.wait_time(self._concurrency_scope)
+            if wait > 0:
+                time.sleep(min(wait, 0.5))
+                continue
+            # 实时检查配置中的线程限制与自适应并发窗口
+            if self._try_acquire_slot():
+                break
             time.sleep(0.01)
         
+        metrics.observe("concurrency_wait", time.perf_counter() - wait_start)
         if Base.work_status == Base.STATUS.STOPING:
-            with self._concurrency_lock: self._current_active -= 1
+            self._release_slot()
             return {}
 
         try:
             with self._skip_lock:
                 if hasattr(task, 'file_path_full') and task.file_path_full in self.skipped_files:
                     return None # Skip execution
-            return task.start()
+            with metrics.timer("task_total"):
+                return task.start()
         finally:
-            with self._concurrency_lock:
-                self._current_active -= 1
+            self._release_slot()
 
     def _execute_tasks_async(self, tasks_list):
         """异步执行模式：使用 aiohttp 处理高并发请求"""
@@ -141,6 +194,8 @@ class TaskExecutor(Base):
 
         # 引用 self 以便在异步函数中使用
         executor_self = self
+        controller = get_concurrency_controller()
+        metrics = get_stage_metrics()
 
         async def run_single_task(task, semaphore):
             """执行单个异步任务"""
@@ -153,6 +208,23 @@ class TaskExecutor(Base):
             # 等待暂停恢复
             await signal_hub.wait_if_paused()
 
+            # 自适应并发窗口：限流时收缩在途请求数
+            wait_start = time_module.perf_counter()
+            while (controller.wait_time(executor_self._concurrency_scope) > 0
+                   or not executor_self._try_acquire_slot()):
+                if Base.work_status == Base.STATUS.STOPING:
+                    return None
+                await asyncio.sleep(0.05)
+            metrics.observe("concurrency_wait", time_module.perf_counter() - wait_start)
+            try:
+                with metrics.timer("task_total"):
+                    return await run_gated_task(task, semaphore, task_start)
+            finally:
+                executor_self._release_slot()
+
+        async def run_gated_task(task, semaphore, task_start):
+            import time as time_module
+
             # 信号量控制：保护本地系统资源
             async with semaphore:
                 if Base.work_status == Base.STATUS.STOPING:
@@ -173,9 +245,11 @@ class TaskExecutor(Base):
 
                 # 发起异步请求
                 requester = AsyncLLMRequester()
-                skip, error_type, content, pt, ct = await requester.send_request_async(
-                    task.messages, task.system_prompt, platform_config
-                )
+                with metrics.timer("llm_request"):
+                    skip, error_type, content, pt, ct = await requester.send_request_async(
+                        task.messages, task.system_prompt, platform_config, use_cache=True
+                    )
+                metrics.inc("requests_total", result="failed" if skip else "success")
 
                 elapsed = time_module.time() - task_start
 
@@ -197,9 +271,13 @@ class TaskExecutor(Base):
                 # 结果处理
                 if content:
                     from ModuleFolders.Domain.ResponseExtractor.ResponseExtractor import ResponseExtractor
-                    response_dict = ResponseExtractor.text_extraction(task, task.source_text_dict, content)
+                    metrics.inc("tokens_total", pt or 0, kind="prompt")
+                    metrics.inc("tokens_total", ct or 0, kind="completion")
+                    with metrics.timer("response_extract"):
+                        response_dict = ResponseExtractor.text_extraction(task, task.source_text_dict, content)
 
                     if response_dict:
+                        metrics.inc("lines_total", len(task.items), result="accepted")
                         for item, response in zip(task.items, response_dict.values()):
                             with item.atomic_scope():
                                 item.model = executor_self.config.model
@@ -217,6 +295,9 @@ class TaskExecutor(Base):
                             "extra_info": getattr(task, "extra_info", {})
                         }
 
+                # 无法提取译文的回复不能再从响应缓存返回
+                if getattr(executor_self.config, "enable_response_cache", False):
+                    get_response_cache().invalidate(task.messages, task.system_prompt, platform_config)
                 return {"check_result": False, "row_count": 0, "prompt_tokens": pt, "completion_tokens": ct}
 
         async def run_all_tasks():
@@ -247,6 +328,8 @@ class TaskExecutor(Base):
         if not result or not isinstance(result, dict):
             return
 
+        get_stage_metrics().inc("tasks_total", result="success" if result.get("check_result") else "failed")
+
         with self.project_status_data.atomic_scope():
             self.project_status_data.total_requests += 1
             is_error = not result.get("check_result")
@@ -307,6 +390,7 @@ class TaskExecutor(Base):
                 getattr(self.config, 'custom_rpm_limit', 0),
                 getattr(self.config, 'custom_tpm_limit', 0)
             )
+            self._configure_concurrency(self.current_mode)
             
             self.info(f"Successfully switched to {new_api}. New Model: {self.config.model}")
             
@@ -356,7 +440,10 @@ class TaskExecutor(Base):
             "translated_suffix": config.get('output_filename_suffix', ''),
             "bilingual_suffix": "_bilingual",
             "bilingual_order": config.get('bilingual_text_order', 'translation_first'),
-            "enable_bilingual_output": config.get('enable_bilingual_output', True)
+            "enable_bilingual_output": config.get('enable_bilingual_output', True),
+            "export_thread_counts": config.get('export_thread_counts', 1),
+            # 重复手动导出时只重写内容有变化的文件
+            "skip_unchanged_output": config.get('skip_unchanged_output', True),
         }
 
         # 写入文件
@@ -457,6 +544,7 @@ class TaskExecutor(Base):
 
             # 配置翻译平台信息
             self.config.prepare_for_translation(TaskType.TRANSLATION)
+            self._begin_metrics_run()
 
             # 配置请求限制器
             self.request_limiter.set_limit(
@@ -465,6 +553,7 @@ class TaskExecutor(Base):
                 getattr(self.config, 'custom_rpm_limit', 0),
                 getattr(self.config, 'custom_tpm_limit', 0)
             )
+            self._configure_concurrency(TaskType.TRANSLATION)
 
             # --- 修复：确保总行数始终被正确初始化 ---
             if continue_status == False or self.cache_manager.project.stats_data is None:
@@ -538,15 +627,16 @@ class TaskExecutor(Base):
                         self.config.lines_limit = max(1, int(self.config.lines_limit / 2))
 
                 # 生成缓存数据条目片段的合集列表，原文列表与上文列表一一对应
-                chunks, previous_chunks, file_paths, source_context_chunks = self.cache_manager.generate_item_chunks(
-                    "line" if self.config.tokens_limit_switch == False else "token",
-                    self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
-                    self.config.pre_line_counts,
-                    TaskType.TRANSLATION,
-                    getattr(self.config, 'enable_context_enhancement', False),
-                    self.config.pre_line_counts,
-                    getattr(self.config, 'force_retranslate', False)
-                )
+                with get_stage_metrics().timer("chunk_generation"):
+                    chunks, previous_chunks, file_paths, source_context_chunks = self.cache_manager.generate_item_chunks(
+                        "line" if self.config.tokens_limit_switch == False else "token",
+                        self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
+                        self.config.pre_line_counts,
+                        TaskType.TRANSLATION,
+                        getattr(self.config, 'enable_context_enhancement', False),
+                        self.config.pre_line_counts,
+                        getattr(self.config, 'force_retranslate', False)
+                    )
 
                 # 生成翻译任务合集列表
                 tasks_list = []
@@ -637,9 +727,6 @@ class TaskExecutor(Base):
                 if getattr(self.config, 'enable_async_mode', False):
                     self._execute_tasks_async(tasks_list)
                 else:
-                    # 重置并发计数器，防止上一轮异常退出后卡死
-                    with self._concurrency_lock:
-                        self._current_active = 0
                     # 开始执行翻译任务,构建异步线程池 (使用 100 高限额，由 gated_run 实际控制并发)
                     self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = 100, thread_name_prefix = "translator")
                     try:
@@ -677,17 +764,19 @@ class TaskExecutor(Base):
                 "translated_suffix": self.config.output_filename_suffix,
                 "bilingual_suffix": "_bilingual",
                 "bilingual_order": self.config.bilingual_text_order,
-                "enable_bilingual_output": self.config.enable_bilingual_output
+                "enable_bilingual_output": self.config.enable_bilingual_output,
+                "export_thread_counts": self.config.export_thread_counts,
             }
 
             # 写入文件
-            self.file_writer.output_translated_content(
-                self.cache_manager.project,
-                self.session_output_path,
-                self.session_input_path,
-                output_config,
-                self.config
-            )
+            with get_stage_metrics().timer("file_output"):
+                self.file_writer.output_translated_content(
+                    self.cache_manager.project,
+                    self.session_output_path,
+                    self.session_input_path,
+                    output_config,
+                    self.config
+                )
             self.print("")
             self.info(f"翻译结果已保存至 {self.session_output_path} 目录 ...")
             self.print("")
@@ -704,6 +793,8 @@ class TaskExecutor(Base):
             self.error(f"翻译任务异常终止: {e}", e)
             Base.work_status = Base.STATUS.TASKSTOPPED
             self.emit(Base.EVENT.TASK_STOP_DONE, {})
+        finally:
+            self._finish_metrics_run()
 
     def _initialize_failover(self):
         self.consecutive_errors = 0
@@ -739,6 +830,7 @@ class TaskExecutor(Base):
                 getattr(self.config, 'custom_rpm_limit', 0),
                 getattr(self.config, 'custom_tpm_limit', 0)
             )
+            self._configure_concurrency(TaskType.POLISH)
 
             # --- 修复：确保总行数始终被正确初始化 ---
             if continue_status == False or self.cache_manager.project.stats_data is None:
@@ -889,9 +981,6 @@ class TaskExecutor(Base):
                     time.sleep(3)
                     self.print("")
 
-                # 重置并发计数器，防止上一轮异常退出后卡死
-                with self._concurrency_lock:
-                    self._current_active = 0
                 # 开始执行润色务,构建异步线程池 (使用 100 高限额，由 gated_run 实际控制并发)
                 self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = 100, thread_name_prefix = "translator")
                 try:
@@ -911,7 +1000,8 @@ class TaskExecutor(Base):
                 "translated_suffix": self.config.output_filename_suffix,
                 "bilingual_suffix": "_bilingual",
                 "bilingual_order": self.config.bilingual_text_order,
-                "enable_bilingual_output": self.config.enable_bilingual_output
+                "enable_bilingual_output": self.config.enable_bilingual_output,
+                "export_thread_counts": self.config.export_thread_counts,
             }
 
             # 写入文件
@@ -950,6 +1040,8 @@ class TaskExecutor(Base):
             if not isinstance(result, dict):
                 return
 
+            get_stage_metrics().inc("tasks_total", result="success" if result.get("check_result") else "failed")
+
             with self.project_status_data.atomic_scope():
                 self.project_status_data.total_requests += 1
                 is_error = not result.get("check_result")
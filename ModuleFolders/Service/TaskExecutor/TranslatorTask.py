@@ -14,6 +14,8 @@ from ModuleFolders.Base.PluginManager import PluginManager
 from ModuleFolders.Infrastructure.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.Infrastructure.LLMRequester.LLMRequester import LLMRequester
+from ModuleFolders.Infrastructure.LLMRequester.ResponseCache import get_response_cache
+from ModuleFolders.Infrastructure.Metrics.StageMetrics import get_stage_metrics
 from ModuleFolders.Domain.PromptBuilder.PromptBuilder import PromptBuilder
 from ModuleFolders.Domain.PromptBuilder.PromptBuilderLocal import PromptBuilderLocal
 from ModuleFolders.Domain.PromptBuilder.PromptBuilderSakura import PromptBuilderSakura
@@ -94,43 +96,48 @@ class TranslatorTask(Base):
         self.plugin_manager.broadcast_event("build_rag_context", self.config, rag_context_data)
         self.rag_context = rag_context_data.get("rag_context", "")
 
+        metrics = get_stage_metrics()
+
         # 各种替换步骤，译前替换，提取首尾与占位中间代码
-        self.source_text_dict, self.prefix_codes, self.suffix_codes, self.placeholder_order, self.affix_whitespace_storage = \
-            self.text_processor.replace_all(
-                self.config,
-                self.source_lang, 
-                self.source_text_dict
-            )
+        with metrics.timer("text_preprocess"):
+            self.source_text_dict, self.prefix_codes, self.suffix_codes, self.placeholder_order, self.affix_whitespace_storage = \
+                self.text_processor.replace_all(
+                    self.config,
+                    self.source_lang, 
+                    self.source_text_dict
+                )
         
         # 生成请求指令
-        if target_platform == "sakura":
-            self.messages, self.system_prompt, self.extra_log = PromptBuilderSakura.generate_prompt_sakura(
-                self.config,
-                self.source_text_dict,
-                self.previous_text_list, 
-                self.source_lang, 
-                self.rag_context
-            )
-        elif target_platform == "LocalLLM":
-            self.messages, self.system_prompt, self.extra_log = PromptBuilderLocal.generate_prompt_LocalLLM(
-                self.config,
-                self.source_text_dict,
-                self.previous_text_list,
-                self.source_lang,
-                self.rag_context
-            )
-        else:
-            self.messages, self.system_prompt, self.extra_log = PromptBuilder.generate_prompt(
-                self.config,
-                self.source_text_dict,
-                self.previous_text_list,
-                self.source_lang,
-                self.rag_context,
-                self.source_context_text_list
-            )
+        with metrics.timer("prompt_build"):
+            if target_platform == "sakura":
+                self.messages, self.system_prompt, self.extra_log = PromptBuilderSakura.generate_prompt_sakura(
+                    self.config,
+                    self.source_text_dict,
+                    self.previous_text_list, 
+                    self.source_lang, 
+                    self.rag_context
+                )
+            elif target_platform == "LocalLLM":
+                self.messages, self.system_prompt, self.extra_log = PromptBuilderLocal.generate_prompt_LocalLLM(
+                    self.config,
+                    self.source_text_dict,
+                    self.previous_text_list,
+                    self.source_lang,
+                    self.rag_context
+                )
+            else:
+                self.messages, self.system_prompt, self.extra_log = PromptBuilder.generate_prompt(
+                    self.config,
+                    self.source_text_dict,
+                    self.previous_text_list,
+                    self.source_lang,
+                    self.rag_context,
+                    self.source_context_text_list
+                )
 
         # 预估 Token 消费
-        self.request_tokens_consume = Tokener.calculate_tokens(self,self.messages,self.system_prompt,)
+        with metrics.timer("tokenize"):
+            self.request_tokens_consume = Tokener.calculate_tokens(self,self.messages,self.system_prompt,)
 
 
     # 启动任务
@@ -141,6 +148,7 @@ class TranslatorTask(Base):
     # 单请求翻译任务
     def unit_translation_task(self) -> dict:
         
+        metrics = get_stage_metrics()
         wait_start_time = time.time()
         while True:
             # 检测是否收到停止翻译事件
@@ -161,6 +169,7 @@ class TranslatorTask(Base):
             
         # 任务开始的时间 (真正开始处理，通过限流后)
         task_start_time = time.time()
+        metrics.observe("limiter_wait", task_start_time - wait_start_time)
 
         # Log source text for UI feedback (Moved to after rate limit)
         if Base.work_status != Base.STATUS.STOPING:
@@ -246,11 +255,14 @@ class TranslatorTask(Base):
 
             # 2. 发起请求
             requester = LLMRequester()
-            skip, status_tag, error_msg, p_tokens, c_tokens = requester.sent_request(
-                self.messages,
-                self.system_prompt,
-                platform_config
-            )
+            with metrics.timer("llm_request"):
+                skip, status_tag, error_msg, p_tokens, c_tokens = requester.sent_request(
+                    self.messages,
+                    self.system_prompt,
+                    platform_config,
+                    use_cache=True
+                )
+            metrics.inc("requests_total", result="failed" if skip else "success")
 
             # 3. 处理失败
             if skip:
@@ -314,6 +326,8 @@ class TranslatorTask(Base):
             
             prompt_tokens = p_tokens
             completion_tokens = c_tokens
+            metrics.inc("tokens_total", prompt_tokens or 0, kind="prompt")
+            metrics.inc("tokens_total", completion_tokens or 0, kind="completion")
             break 
         
         # 0.5 检查停止信号
@@ -330,7 +344,8 @@ class TranslatorTask(Base):
              return { "check_result": False, "row_count": 0, "prompt_tokens": prompt_tokens, "completion_tokens": 0 }
 
         # 提取回复内容
-        response_dict = ResponseExtractor.text_extraction(self, self.source_text_dict, response_content)
+        with metrics.timer("response_extract"):
+            response_dict = ResponseExtractor.text_extraction(self, self.source_text_dict, response_content)
 
         # 获取漏翻检测重试次数（从第一个item的extra中获取）
         untranslated_retry_count = 0
@@ -338,19 +353,21 @@ class TranslatorTask(Base):
             untranslated_retry_count = self.items[0].extra.get('untranslated_retry_count', 0)
 
         # 检查回复内容
-        check_result, error_content = ResponseChecker.check_response_content(
-            self,
-            self.config,
-            self.placeholder_order,
-            response_content,
-            response_dict,
-            self.source_text_dict,
-            self.source_lang,
-            untranslated_retry_count
-        )
+        with metrics.timer("response_check"):
+            check_result, error_content = ResponseChecker.check_response_content(
+                self,
+                self.config,
+                self.placeholder_order,
+                response_content,
+                response_dict,
+                self.source_text_dict,
+                self.source_lang,
+                untranslated_retry_count
+            )
 
         # 去除回复内容的数字序号
-        response_dict = ResponseExtractor.remove_numbered_prefix(self, response_dict)
+        with metrics.timer("response_extract"):
+            response_dict = ResponseExtractor.remove_numbered_prefix(self, response_dict)
 
         # ---------------------------------------------------------
         # 结果处理与数据发送
@@ -361,7 +378,8 @@ class TranslatorTask(Base):
         if response_dict:
             try:
                 temp_dict = copy.copy(response_dict)
-                restore_response_dict = self.text_processor.restore_all(self.config, temp_dict, self.prefix_codes, self.suffix_codes, self.placeholder_order, self.affix_whitespace_storage)
+                with metrics.timer("text_restore"):
+                    restore_response_dict = self.text_processor.restore_all(self.config, temp_dict, self.prefix_codes, self.suffix_codes, self.placeholder_order, self.affix_whitespace_storage)
             except Exception as e:
                 self.error(f"[{self.task_id}] Post-processing error: {e}")
                 restore_response_dict = response_dict
@@ -398,6 +416,12 @@ class TranslatorTask(Base):
         if check_result == False:
             error = f"[{self.task_id}] [ERROR] 译文文本未通过检查，将在下一轮次的翻译中重新翻译 - {error_content}"
 
+            metrics.inc("lines_total", self.row_count, result="rejected")
+
+            # 未通过检查的回复不能再从响应缓存返回，否则下一轮会得到同样的结果
+            if getattr(self.config, "enable_response_cache", False):
+                get_response_cache().invalidate(self.messages, self.system_prompt, platform_config)
+
             # 如果是漏翻检测失败，增加重试计数
             if "漏翻检测" in error_content:
                 for item in self.items:
@@ -431,6 +455,8 @@ class TranslatorTask(Base):
                 "extra_info": getattr(self, "extra_info", {})
             }
         else:
+            metrics.inc("lines_total", self.row_count, result="accepted")
+
             # 更新译文结果到缓存数据中
             for item, response in zip(self.items, restore_response_dict.values()):
                 with item.atomic_scope():
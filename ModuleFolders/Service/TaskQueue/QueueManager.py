@@ -1,6 +1,9 @@
 import threading
 import time
 import os
+import re
+import subprocess
+import sys
 import rapidjson as json
 from datetime import datetime, timedelta
 from ModuleFolders.Base.Base import Base
@@ -635,6 +638,16 @@ class QueueManager(Base):
         threading.Thread(target=self._process_queue, args=(cli_menu,), daemon=True).start()
 
     def _process_queue(self, cli_menu):
+        parallel_projects = self._get_parallel_projects(cli_menu)
+        if parallel_projects > 1:
+            self._process_queue_parallel(cli_menu, parallel_projects)
+        else:
+            self._process_queue_serial(cli_menu)
+
+        self.is_running = False
+        self.info("Task queue processing finished.")
+
+    def _process_queue_serial(self, cli_menu):
         self.info("Starting task queue processing with full API overrides...")
 
         # Phase 1: Translation
@@ -704,8 +717,238 @@ class QueueManager(Base):
                 if not found_task:
                     break  # 没有更多润色任务
 
-        self.is_running = False
-        self.info("Task queue processing finished.")
+    # ================ 多项目并行执行 ================
+
+    def _get_parallel_projects(self, cli_menu):
+        """读取队列并行项目数，非法值按串行处理"""
+        try:
+            return max(1, int(cli_menu.config.get("queue_parallel_projects", 1)))
+        except (TypeError, ValueError):
+            return 1
+
+    def _split_budget(self, cli_menu, parallel_projects):
+        """
+        把全局线程数与 RPM/TPM 限额平分给并行的项目，保证总消耗不超过串行执行时的上限
+
+        Returns:
+            dict: 每个项目可用的 threads、rpm 与 tpm
+        """
+        cfg = cli_menu.config
+        platform_conf = cfg.get("platforms", {}).get(cfg.get("target_platform"), {})
+
+        # 与 TaskConfig 一致：平台限额按密钥数量倍增，自定义限额优先
+        api_key = platform_conf.get("api_key") or cfg.get("api_key") or ""
+        key_count = max(1, len([k for k in re.sub(r"\s+", "", api_key).split(",") if k]))
+        rpm = platform_conf.get("rpm_limit", 4096) * key_count
+        tpm = platform_conf.get("tpm_limit", 10000000) * key_count
+        if cfg.get("enable_rate_limit"):
+            rpm = cfg.get("custom_rpm_limit") or rpm
+            tpm = cfg.get("custom_tpm_limit") or tpm
+
+        threads = cfg.get("user_thread_counts") or 0
+        if threads <= 0:
+            # 自动线程数在这里按完整限额解析一次再平分，否则每个子进程都会各自得到完整的自动线程数
+            from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
+            task_config = TaskConfig()
+            task_config.load_config_from_dict(cfg)
+            threads = task_config.thread_counts_setting(0, cfg.get("target_platform"), rpm)
+        return {
+            "threads": max(1, threads // parallel_projects),
+            "rpm": max(1, rpm // parallel_projects),
+            "tpm": max(1, tpm // parallel_projects),
+        }
+
+    def _task_id(self, task):
+        return f"{task.task_type}_{task.input_path}"
+
+    def _find_task_index(self, task_id):
+        for i, task in enumerate(self.tasks):
+            if self._task_id(task) == task_id:
+                return i
+        return None
+
+    def _next_parallel_step(self, busy_paths):
+        """
+        按队列顺序查找下一个可执行的步骤。翻译完成的翻译并润色任务会立即进入润色，
+        不必等待其他项目的翻译全部结束。
+
+        Returns:
+            tuple: (index, task, step_type)，没有可执行步骤时为 (None, None, None)
+        """
+        for i, task in enumerate(self.tasks):
+            if task.locked or os.path.normpath(task.input_path) in busy_paths:
+                continue
+
+            if task.status == "waiting":
+                if task.task_type in [TaskType.TRANSLATION, TaskType.TRANSLATE_AND_POLISH]:
+                    return i, task, TaskType.TRANSLATION
+                # 与串行模式一致：未翻译的纯润色任务直接标记完成
+                self.mark_task_completed(i, "completed")
+            elif task.status == "translated" and task.task_type in [TaskType.POLISH, TaskType.TRANSLATE_AND_POLISH]:
+                return i, task, TaskType.POLISH
+
+        return None, None, None
+
+    def _build_step_command(self, cli_menu, task, step_type, budget):
+        """把任务的覆盖参数转换为 ainiee_cli.py 的命令行参数"""
+        project_root = getattr(cli_menu, "PROJECT_ROOT", os.getcwd())
+        command = [
+            sys.executable, os.path.join(project_root, "ainiee_cli.py"),
+            "polish" if step_type == TaskType.POLISH else "translate",
+            task.input_path, "-y", "--web-mode",
+            # 显式指定 Profile，覆盖参数只作用于子进程本身，不写回 Profile 与根配置
+            "--profile", task.profile or cli_menu.active_profile_name,
+            "--rules-profile", task.rules_profile or cli_menu.active_rules_profile_name,
+            "--no-save-config",
+        ]
+        if step_type == TaskType.POLISH:
+            command.append("--resume")
+
+        options = [
+            ("-s", task.source_lang), ("-t", task.target_lang), ("--type", task.project_type),
+            ("-o", task.output_path), ("--platform", task.platform), ("--api-url", task.api_url),
+            ("--model", task.model), ("--threads", task.threads),
+            ("--retry", task.retry), ("--timeout", task.timeout), ("--rounds", task.rounds),
+            ("--pre-lines", task.pre_lines), ("--lines", task.lines_limit), ("--tokens", task.tokens_limit),
+            ("--think-depth", task.think_depth), ("--thinking-budget", task.thinking_budget),
+            ("--rpm", budget["rpm"]), ("--tpm", budget["tpm"]), ("--max-threads", budget["threads"]),
+        ]
+        for flag, value in options:
+            if value is not None and value != "":
+                command.extend([flag, str(value)])
+        return command
+
+    def _start_parallel_step(self, cli_menu, index, task, step_type, budget):
+        """在独立进程中执行一个步骤，输出带上任务序号转发到控制台"""
+        self.mark_task_executing(index)
+        command = self._build_step_command(cli_menu, task, step_type, budget)
+        env = os.environ.copy()
+        env["PYTHONIOENCODING"] = "utf-8"
+        # API Key 经环境变量传递，不出现在命令行中
+        env.pop("AINIEE_API_KEY", None)
+        if task.api_key:
+            env["AINIEE_API_KEY"] = task.api_key
+
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=getattr(cli_menu, "PROJECT_ROOT", None),
+            env=env,
+        )
+
+        task_name = os.path.basename(task.input_path)
+        step_name = "polish" if step_type == TaskType.POLISH else "translate"
+        self._log_queue_operation(f"Task {index+1} [{task_name}] {step_name} started (pid {process.pid})")
+
+        def drain():
+            for line in iter(process.stdout.readline, ''):
+                line = line.rstrip()
+                if line:
+                    print(f"[Q{index+1}] {line}")
+
+        threading.Thread(target=drain, daemon=True).start()
+        return process
+
+    def _stop_parallel_step(self, process):
+        if process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def _finish_parallel_step(self, task_id, task_type, step_type, returncode, stopped):
+        index = self._find_task_index(task_id)
+        if index is None:
+            return  # 任务已被移出队列
+
+        if stopped:
+            # 中断的步骤回到可续跑的状态，下次启动队列时继续
+            final_status = "translated" if step_type == TaskType.POLISH else "waiting"
+        elif returncode != 0:
+            self.error(f"Task {index+1} failed with exit code {returncode}")
+            final_status = "error"
+        elif step_type == TaskType.TRANSLATION and task_type == TaskType.TRANSLATE_AND_POLISH:
+            final_status = "translated"
+        else:
+            final_status = "completed"
+        self.mark_task_completed(index, final_status)
+
+    def _process_queue_parallel(self, cli_menu, parallel_projects, heartbeat_interval=30):
+        """
+        多项目并行执行队列：每个步骤在独立的 ainiee_cli.py 进程中运行，
+        线程数与 RPM/TPM 限额由所有并行项目共享。
+
+        Args:
+            cli_menu: 队列所属的 CLIMenu，提供全局配置与当前 Profile
+            parallel_projects: 同时执行的项目数
+            heartbeat_interval: 刷新运行中任务活动时间的间隔（秒）
+        """
+        budget = self._split_budget(cli_menu, parallel_projects)
+        self.info(
+            f"Starting task queue processing with {parallel_projects} parallel projects "
+            f"(per project: threads={budget['threads']}, rpm={budget['rpm']}, tpm={budget['tpm']})..."
+        )
+
+        running = {}  # task_id -> (process, task_type, step_type, input_path)
+        last_heartbeat = time.time()
+
+        while True:
+            stopping = Base.work_status == Base.STATUS.STOPING
+
+            # 热重载队列（运行中的任务保持锁定状态）
+            self.hot_reload_queue(quiet=True)
+
+            # 回收已结束的步骤；停止时结束全部子进程
+            for task_id, (process, task_type, step_type, _) in list(running.items()):
+                if stopping:
+                    self._stop_parallel_step(process)
+                returncode = process.poll()
+                if returncode is None:
+                    continue
+                del running[task_id]
+                self._finish_parallel_step(task_id, task_type, step_type, returncode, stopping)
+
+            if stopping:
+                break
+
+            # 心跳：避免长时间运行的项目被当作过期锁清理
+            if time.time() - last_heartbeat >= heartbeat_interval:
+                for task_id in running:
+                    index = self._find_task_index(task_id)
+                    if index is not None:
+                        self.update_task_activity(index)
+                last_heartbeat = time.time()
+
+            self.cleanup_stale_locks()
+
+            # 填充空闲槽位，同一项目同时只运行一个步骤
+            while len(running) < parallel_projects:
+                busy_paths = {entry[3] for entry in running.values()}
+                index, task, step_type = self._next_parallel_step(busy_paths)
+                if index is None:
+                    break
+                try:
+                    process = self._start_parallel_step(cli_menu, index, task, step_type, budget)
+                except Exception as e:
+                    self.error(f"Task {index+1} failed to start: {e}")
+                    self.mark_task_completed(index, "error")
+                    continue
+                running[self._task_id(task)] = (
+                    process, task.task_type, step_type, os.path.normpath(task.input_path)
+                )
+
+            if not running:
+                break
+
+            time.sleep(1)
 
     def _run_single_step(self, cli_menu, task, step_type, resume=False):
         original_active_profile = cli_menu.active_profile_name
@@ -0,0 +1,298 @@
+"""
+规则检查的预编译规则集
+
+TranslationChecker 的禁翻表 / 术语表 / 自动处理规则在检查开始时编译一次：
+- 每条规则单独编译，无效正则直接跳过（与逐条 re.finditer 时忽略异常的行为一致）
+- 纯文本术语按其中可原样比较的片段建立二元组索引，每条原文只需查一次索引即可得到候选术语
+- 其余连续的无分组规则每 MERGE_SIZE 条合并为一个预筛正则，原文不匹配预筛正则时整组跳过
+- 条目较多时按分片交给进程池检查（ShardedPool.run_sharded），结果按原顺序合并
+
+本模块只依赖标准库，进程池的工作进程导入它时不会加载界面与缓存模块。
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ModuleFolders.Infrastructure.Parallel.ShardedPool import run_sharded
+
+# 错误类型，由 TranslationChecker 转换为界面文本
+ERROR_EXCLUSION = "exclusion"
+ERROR_TERMINOLOGY = "terminology"
+ERROR_AUTO_PROCESS = "auto_process"
+ERROR_PLACEHOLDER = "placeholder"
+ERROR_NUMBER = "number"
+ERROR_EXAMPLE = "example"
+ERROR_NEWLINE = "newline"
+
+PLACEHOLDER_RESIDUE_REG = re.compile(r'\[P\d+\]')
+NUMBER_RESIDUE_REG = re.compile(r'\d+\.\d+\.')
+EXAMPLE_RESIDUE_REG = re.compile(r'示例文本[A-Z]-\d+')
+
+MERGE_SIZE = 32  # 每个预筛正则合并的规则数
+
+
+_REGEX_SPECIAL = frozenset(".^$*+?{}[]\\|()")
+
+
+# IGNORECASE 下能匹配 ASCII 字母的非 ASCII 字符（其余字符只匹配自身或同为非 ASCII 的大小写形式）
+_SOURCE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+
+def _is_cased(char: str) -> bool:
+    """字符在忽略大小写匹配时是否可能匹配其他字符（按完整大小写映射判断，比正则引擎更保守）"""
+    return char.lower() != char or char.upper() != char
+
+
+def _fold_source(text: str) -> str:
+    """
+    术语索引使用的原文形式
+
+    IGNORECASE 匹配中，ASCII 字母只与其大小写形式及 _SOURCE_FOLD 中的字符相等，
+    不区分大小写的字符只与自身相等，因此原文中的匹配经此转换后必定包含术语的索引片段。
+    """
+    return text.translate(_SOURCE_FOLD).lower()
+
+
+def _literal_anchor(pattern: str) -> str:
+    """纯文本术语中最长的可索引片段（ASCII 或不区分大小写的字符，小写形式），含正则元字符时返回空串"""
+    if any(char in _REGEX_SPECIAL for char in pattern):
+        return ""
+    return max(_indexable_runs(pattern), key=len, default="").lower()
+
+
+def _indexable_runs(text: str) -> List[str]:
+    """按不可索引的字符切分后剩余的连续片段"""
+    runs = []
+    current = []
+    for char in text:
+        if char.isascii() or not _is_cased(char):
+            current.append(char)
+        elif current:
+            runs.append("".join(current))
+            current = []
+    if current:
+        runs.append("".join(current))
+    return runs
+
+
+def _merge_patterns(patterns: List[re.Pattern], flags: int) -> Optional[re.Pattern]:
+    """把一组无分组的正则合并为一个预筛正则，任一规则在某处匹配时预筛正则也匹配"""
+    if len(patterns) < 2:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns), flags)
+    except (re.error, RecursionError, OverflowError):
+        return None
+
+
+def _build_buckets(entries: list, flags: int) -> List[Tuple[Optional[re.Pattern], list]]:
+    """
+    按原顺序把规则分组，每组附带一个预筛正则（None 表示逐条检查）
+
+    entries 中每项的第一个元素为编译好的正则或 None（非正则规则）。
+    含分组（可能有反向引用）或行内全局标志的正则不参与合并，避免改变其含义。
+    """
+    base_flags = re.compile("", flags).flags
+    buckets = []
+    run = []
+
+    def flush():
+        if run:
+            buckets.append((_merge_patterns([entry[0] for entry in run], flags), list(run)))
+            run.clear()
+
+    for entry in entries:
+        pattern = entry[0]
+        if pattern is None or pattern.groups or pattern.flags != base_flags:
+            flush()
+            buckets.append((None, [entry]))
+            continue
+        run.append(entry)
+        if len(run) >= MERGE_SIZE:
+            flush()
+    flush()
+    return buckets
+
+
+class PatternGroup:
+    """按顺序检查的一组正则：原文中任一匹配未出现在译文中即判定为错误"""
+
+    def __init__(self, patterns: List[str]):
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append((re.compile(pattern),))
+            except (re.error, TypeError, RecursionError, OverflowError):
+                continue
+        self.buckets = _build_buckets(compiled, 0)
+
+    def __bool__(self) -> bool:
+        return bool(self.buckets)
+
+    def has_missing_match(self, src: str, dst: str) -> bool:
+        for prefilter, entries in self.buckets:
+            if prefilter is not None and prefilter.search(src) is None:
+                continue
+            for (pattern,) in entries:
+                for match in pattern.finditer(src):
+                    if match.group(0) not in dst:
+                        return True
+        return False
+
+
+class CompiledRuleSet:
+    """一次检查使用的全部规则，可序列化后发送给进程池"""
+
+    def __init__(self, rules_config: dict, exclusion_data: list, term_data: list, auto_process_patterns: List[str]):
+        """
+        Args:
+            rules_config: 规则开关
+            exclusion_data: 禁翻表（rules_config["exclusion"] 关闭时传空列表）
+            term_data: 术语表（prompt_dictionary_data）
+            auto_process_patterns: 自动处理检查使用的正则
+        """
+        self.exclusion = None
+        if rules_config.get("exclusion") and exclusion_data:
+            patterns = []
+            for item in exclusion_data:
+                if not isinstance(item, dict):
+                    continue
+                regex = item.get("regex")
+                markers = item.get("markers")
+                pattern = regex if regex else (re.escape(markers) if markers else None)
+                if pattern:
+                    patterns.append(pattern)
+            self.exclusion = PatternGroup(patterns)
+
+        # 术语按原顺序保存，检查时先用索引和预筛正则找出候选术语，再逐条确认
+        self.terms = []
+        self.term_index: Dict[str, List[int]] = {}
+        self.term_key_lengths: List[int] = []
+        self.term_buckets = []
+        self.string_terms: List[int] = []
+        if rules_config.get("terminology"):
+            for term in term_data:
+                if isinstance(term, dict):
+                    src_term = term.get("src")
+                    dst_term = term.get("dst")
+                    if src_term and dst_term:
+                        try:
+                            self.terms.append((re.compile(src_term, re.IGNORECASE), None, dst_term))
+                        except re.error:
+                            # 编译失败则作为普通字符串处理，使用忽略大小写包含检测
+                            self.terms.append((None, src_term.lower(), dst_term))
+            self._index_terms()
+        self.auto_process = None
+        if rules_config.get("auto_process") and auto_process_patterns:
+            self.auto_process = PatternGroup(auto_process_patterns)
+
+        self.placeholder = bool(rules_config.get("placeholder"))
+        self.number = bool(rules_config.get("number"))
+        self.example = bool(rules_config.get("example"))
+        self.newline = bool(rules_config.get("newline"))
+
+    def has_content_rules(self) -> bool:
+        """是否有需要检查文本内容的规则"""
+        return bool(self.exclusion or self.terms or self.auto_process
+                    or self.placeholder or self.number or self.example or self.newline)
+
+    def check(self, src: str, dst: str) -> List[Tuple[str, Optional[str]]]:
+        """检查一条文本，返回 (错误类型, 参数) 列表，顺序与逐条规则检查一致"""
+        errors = []
+        if self.exclusion and self.exclusion.has_missing_match(src, dst):
+            errors.append((ERROR_EXCLUSION, None))
+        if self.terms:
+            errors.extend((ERROR_TERMINOLOGY, dst_term) for dst_term in self._missing_terms(src, dst))
+        if self.auto_process and self.auto_process.has_missing_match(src.rstrip('\n'), dst.rstrip('\n')):
+            errors.append((ERROR_AUTO_PROCESS, None))
+        if self.placeholder and PLACEHOLDER_RESIDUE_REG.search(dst):
+            errors.append((ERROR_PLACEHOLDER, None))
+        if self.number and NUMBER_RESIDUE_REG.search(dst):
+            errors.append((ERROR_NUMBER, None))
+        if self.example and EXAMPLE_RESIDUE_REG.search(dst):
+            errors.append((ERROR_EXAMPLE, None))
+        if self.newline:
+            src_stripped = src.strip()
+            dst_stripped = dst.strip()
+            if (src_stripped.count('\n') + src_stripped.count('\\n')
+                    != dst_stripped.count('\n') + dst_stripped.count('\\n')):
+                errors.append((ERROR_NEWLINE, None))
+        return errors
+
+    def _index_terms(self) -> None:
+        """
+        建立术语的候选索引
+
+        不含正则元字符的术语中，ASCII 字符与不区分大小写的字符（汉字、假名、数字等）组成的片段，
+        其小写形式必定出现在 _fold_source 转换后的原文中。以最长片段的前两个字符为键建立索引，
+        检查时只需遍历原文的字符二元组即可找出候选术语，耗时与术语数量无关。
+        其余术语（正则、含其他大小写字母等）放入预筛正则分组，首字符不区分大小写的与区分大小写的分开合并，
+        使前者的预筛正则可以按首字符跳过不可能匹配的位置。
+        """
+        uncased_first = []
+        cased_first = []
+        for index, (pattern, _, _) in enumerate(self.terms):
+            if pattern is None:
+                self.string_terms.append(index)
+                continue
+            anchor = _literal_anchor(pattern.pattern)
+            if anchor:
+                key = anchor[:2]
+                self.term_index.setdefault(key, []).append(index)
+                continue
+            first = pattern.pattern[0]
+            (cased_first if _is_cased(first) or first in _REGEX_SPECIAL else uncased_first).append((pattern, index))
+
+        self.term_key_lengths = sorted({len(key) for key in self.term_index})
+        self.term_buckets = _build_buckets(uncased_first, re.IGNORECASE) + _build_buckets(cased_first, re.IGNORECASE)
+
+    def _missing_terms(self, src: str, dst: str) -> List[str]:
+        """原文中出现、但译文中缺少译名的术语（按术语表顺序去重）"""
+        candidates = set(self.string_terms)
+        term_index = self.term_index
+        if term_index:
+            folded = _fold_source(src)
+        for length in self.term_key_lengths:
+            keys = {folded[i:i + length] for i in range(len(folded) - length + 1)}
+            for key in keys & term_index.keys():
+                candidates.update(term_index[key])
+        for prefilter, entries in self.term_buckets:
+            if prefilter is None or prefilter.search(src) is not None:
+                candidates.update(index for _, index in entries)
+        if not candidates:
+            return []
+
+        missing = []
+        src_lower = None
+        for index in sorted(candidates):
+            pattern, src_term_lower, dst_term = self.terms[index]
+            # 先做开销最小的译文包含判断
+            if dst_term in dst or dst_term in missing:
+                continue
+            if pattern is not None:
+                found = pattern.search(src) is not None
+            else:
+                if src_lower is None:
+                    src_lower = src.lower()
+                found = src_term_lower in src_lower
+            if found:
+                missing.append(dst_term)
+        return missing
+
+    def check_shard(self, pairs: List[Tuple[str, str]]) -> List[Tuple[int, list]]:
+        """检查一个分片，只返回有错误的 (分片内序号, 错误列表)"""
+        results = []
+        for index, (src, dst) in enumerate(pairs):
+            errors = self.check(src, dst)
+            if errors:
+                results.append((index, errors))
+        return results
+
+    def check_pairs(self, pairs: List[Tuple[str, str]], max_workers: int = None) -> Dict[int, list]:
+        """
+        检查全部 (原文, 译文)，条目较多时使用进程池
+
+        Returns:
+            序号 -> 错误列表，只包含有错误的条目
+        """
+        return run_sharded(pairs, self, CompiledRuleSet.check_shard, max_workers)
@@ -10,6 +10,16 @@ from ModuleFolders.Infrastructure.Cache.CacheItem import CacheItem, TranslationS
 from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
 from ModuleFolders.Domain.FileReader import ReaderUtil
 from ModuleFolders.Service.TaskExecutor import TranslatorUtil
+from ModuleFolders.Service.TranslationChecker.CompiledRules import (
+    CompiledRuleSet,
+    ERROR_AUTO_PROCESS,
+    ERROR_EXAMPLE,
+    ERROR_EXCLUSION,
+    ERROR_NEWLINE,
+    ERROR_NUMBER,
+    ERROR_PLACEHOLDER,
+    ERROR_TERMINOLOGY,
+)
 
 # 定义结果码，便于UI判断
 class CheckResult:
@@ -223,44 +233,32 @@ class TranslationChecker(Base):
         if not any(rules_config.values()):
             return []
 
+        start_time = time.time()
         self.info(self.tra("开始执行规则检查..."))
         errors_list = []
-
-        # 准备正则表达式模式
-        patterns = []
-        if rules_config.get("auto_process"):
-            patterns = self._prepare_regex_patterns(rules_config.get("exclusion", False))
-
-        # 准备禁翻表数据
-        exclusion_data = self.config.get("exclusion_list_data", []) if rules_config.get("exclusion") else []
         check_attr = "polished_text" if target_type == "polish" else "translated_text"
 
-        # 准备术语表数据 (预处理正则)
-        term_data = []
-        if rules_config.get("terminology"):
-            raw_term_data = self.config.get("prompt_dictionary_data", [])
-            for term in raw_term_data:
-                if isinstance(term, dict):
-                    src_term = term.get("src")
-                    dst_term = term.get("dst")
-                    if src_term and dst_term:
-                        try:
-                            # 尝试编译为正则
-                            pattern = re.compile(src_term, re.IGNORECASE)
-                            term_data.append({
-                                "type": "regex",
-                                "pattern": pattern,
-                                "src": src_term, # 保留原始字符串用于调试或显示
-                                "dst": dst_term
-                            })
-                        except re.error:
-                            # 编译失败则作为普通字符串处理，后续将使用忽略大小写包含检测
-                            term_data.append({
-                                "type": "string",
-                                "src": src_term,
-                                "dst": dst_term
-                            })
+        # 规则集只编译一次，可在进程池中复用
+        rule_set = CompiledRuleSet(
+            rules_config,
+            self.config.get("exclusion_list_data", []) if rules_config.get("exclusion") else [],
+            self.config.get("prompt_dictionary_data", []) if rules_config.get("terminology") else [],
+            self._prepare_regex_patterns(rules_config.get("exclusion", False)) if rules_config.get("auto_process") else [],
+        )
+        check_content = rule_set.has_content_rules()
+        error_messages = {
+            ERROR_EXCLUSION: self.tra("禁翻表错误"),
+            ERROR_AUTO_PROCESS: self.tra("自动处理错误"),
+            ERROR_PLACEHOLDER: self.tra("占位符残留"),
+            ERROR_NUMBER: self.tra("数字序号残留"),
+            ERROR_EXAMPLE: self.tra("示例文本复读"),
+            ERROR_NEWLINE: self.tra("换行符错误"),
+        }
+        terminology_message = self.tra("术语缺失: {}")
 
+        # 先按条目顺序收集未翻译条目与待检查文本，内容检查完成后再按原顺序合并
+        ordered_entries = []
+        pairs = []
         for file_path, file_obj in self.cache_manager.project.files.items():
             file_name = os.path.basename(file_path)
             for item in file_obj.items:
@@ -269,7 +267,6 @@ class TranslationChecker(Base):
                     continue
 
                 text_content = getattr(item, check_attr, "")
-                current_errors = []
 
                 # 1. 未翻译/漏翻检查
                 if rules_config.get("untranslated"):
@@ -282,87 +279,48 @@ class TranslationChecker(Base):
                             is_untranslated = True
 
                     if is_untranslated:
-                        errors_list.append({
-                            "row_id": f"{file_name} : {item.text_index + 1}",
-                            "error_type": self.tra("条目未翻译/内容为空"),
-                            "source": item.source_text,
-                            "check_text": text_content,
-                            "file_path": file_path,
-                            "text_index": item.text_index,
-                            "target_field": check_attr
-                        })
+                        ordered_entries.append((file_path, file_name, item, text_content, None))
                         # 如果已确定未翻译，通常内容为空或无意义，跳过后续的内容检查
                         continue
 
                 # 2. 跳过空文本 (如果内容为空且不是为了检查未翻译，则跳过后续正则检查)
-                if not text_content or not item.source_text:
+                if not check_content or not text_content or not item.source_text:
                     continue
 
-                # 3. 禁翻表
-                if rules_config.get("exclusion") and exclusion_data:
-                    current_errors.extend(self._rule_check_exclusion(item.source_text, text_content, exclusion_data))
-                # 4. 术语表
-                if rules_config.get("terminology") and term_data:
-                    current_errors.extend(self._rule_check_terminology(item.source_text, text_content, term_data))
-                # 5. 自动处理
-                if rules_config.get("auto_process") and patterns:
-                    current_errors.extend(self._rule_check_auto_process(item.source_text, text_content, patterns))
-                # 6. 占位符
-                if rules_config.get("placeholder"):
-                    current_errors.extend(self._rule_check_placeholder(text_content))
-                # 7. 数字序号
-                if rules_config.get("number"):
-                    current_errors.extend(self._rule_check_number(text_content))
-                # 8. 示例复读
-                if rules_config.get("example"):
-                    current_errors.extend(self._rule_check_example(text_content))
-                # 9. 换行符
-                if rules_config.get("newline"):
-                    current_errors.extend(self._rule_check_newline(item.source_text, text_content))
-
-                # 收集结果
-                for err in current_errors:
-                    errors_list.append({
-                        "row_id": f"{file_name} : {item.text_index + 1}",
-                        "error_type": err,
-                        "source": item.source_text,
-                        "check_text": text_content,
-                        "file_path": file_path,
-                        "text_index": item.text_index,
-                        "target_field": check_attr
-                    })
+                ordered_entries.append((file_path, file_name, item, text_content, len(pairs)))
+                pairs.append((item.source_text, text_content))
+
+        # 3-9. 禁翻表、术语表、自动处理、占位符、数字序号、示例复读、换行符
+        content_errors = rule_set.check_pairs(pairs) if pairs else {}
+
+        # 收集结果
+        for file_path, file_name, item, text_content, pair_index in ordered_entries:
+            if pair_index is None:
+                messages = [self.tra("条目未翻译/内容为空")]
+            else:
+                errors = content_errors.get(pair_index)
+                if not errors:
+                    continue
+                messages = [
+                    terminology_message.format(argument) if code == ERROR_TERMINOLOGY else error_messages[code]
+                    for code, argument in errors
+                ]
+            for message in messages:
+                errors_list.append({
+                    "row_id": f"{file_name} : {item.text_index + 1}",
+                    "error_type": message,
+                    "source": item.source_text,
+                    "check_text": text_content,
+                    "file_path": file_path,
+                    "text_index": item.text_index,
+                    "target_field": check_attr
+                })
 
         self.info(self.tra("规则检查完成，发现 {} 个问题。").format(len(errors_list)))
+        self.debug(f"规则检查 {len(pairs)} 条文本，耗时 {time.time() - start_time:.2f} 秒")
         return errors_list
 
     # --- 规则检查辅助方法 ---
-    def _rule_check_terminology(self, src, dst, prepared_data):
-        """
-        检查术语一致性
-        prepared_data: 包含预编译正则或字符串信息的列表
-        """
-        errs = []
-        for term_item in prepared_data:
-            match_found = False
-
-            # 检测原文中是否存在该术语
-            if term_item["type"] == "regex":
-                if term_item["pattern"].search(src):
-                    match_found = True
-            else:
-                # 字符串模式：使用忽略大小写包含，与PromptBuilder回退逻辑保持一致
-                if term_item["src"].lower() in src.lower():
-                    match_found = True
-
-            # 如果原文中存在术语，则检查译文中是否包含对应的译名
-            if match_found:
-                dst_term = term_item["dst"]
-                if dst_term not in dst:
-                    err_msg = self.tra("术语缺失: {}").format(dst_term)
-                    if err_msg not in errs:
-                        errs.append(err_msg)
-        return errs
-
     def _prepare_regex_patterns(self, include_exclusion: bool):
         patterns = []
         regex_file = os.path.join(".", "Resource", "Regex", "check_regex.json")
@@ -380,56 +338,6 @@ class TranslationChecker(Base):
                 elif item.get("markers"): patterns.append(re.escape(item["markers"]))
         return patterns
 
-    def _rule_check_exclusion(self, src, dst, data):
-        errs = []
-        for item in data:
-            regex = item.get("regex")
-            markers = item.get("markers")
-            pat = regex if regex else (re.escape(markers) if markers else None)
-            if pat:
-                try:
-                    for match in re.finditer(pat, src):
-                        if match.group(0) not in dst:
-                            if self.tra("禁翻表错误") not in errs: errs.append(self.tra("禁翻表错误"))
-                            break
-                except: continue
-        return errs
-
-    def _rule_check_auto_process(self, src, dst, patterns):
-        errs = []
-        _src = src.rstrip('\n')
-        _dst = dst.rstrip('\n')
-        for pat in patterns:
-            try:
-                for match in re.finditer(pat, _src):
-                    if match.group(0) not in _dst:
-                        if self.tra("自动处理错误") not in errs: errs.append(self.tra("自动处理错误"))
-                        break
-            except: continue
-        return errs
-
-    def _rule_check_placeholder(self, text):
-        if re.search(r'\[P\d+\]', text):
-            return [self.tra("占位符残留")]
-        return []
-
-    def _rule_check_number(self, text):
-        if re.search(r'\d+\.\d+\.', text):
-            return [self.tra("数字序号残留")]
-        return []
-
-    def _rule_check_example(self, text):
-        if re.search(r'示例文本[A-Z]-\d+', text):
-            return [self.tra("示例文本复读")]
-        return []
-
-    def _rule_check_newline(self, src, dst):
-        s_n = src.strip().count('\n') + src.strip().count('\\n')
-        d_n = dst.strip().count('\n') + dst.strip().count('\\n')
-        if s_n != d_n:
-            return [self.tra("换行符错误")]
-        return []
-
     # 辅助方法
     def _perform_pre_checks(self, mode: str) -> Tuple[str | None, Dict]:
         """执行预检查，确保项目和缓存数据有效"""
@@ -3,10 +3,14 @@
 User manager for profile management operations.
 """
 
+import base64
+import json
+import logging
 import re
+import threading
 import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from urllib.parse import urlparse
 
 
@@ -15,6 +19,88 @@ class UserError(Exception):
     pass
 
 
+# Indexes behind the admin user listing. The users table predates them and
+# init_database skips existing tables, so they are created on first use.
+_LIST_INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_users_status_created_at_id ON users (status, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_users_role_created_at_id ON users (role, created_at, id)",
+)
+
+# PostgreSQL only: trigram indexes let ILIKE '%term%' search use an index.
+# SQLite keeps the plain LIKE scan, which is fine at SQLite scale.
+_TRIGRAM_INDEX_STATEMENTS = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON users USING gin (username gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_users_email_trgm ON users USING gin (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_users_full_name_trgm ON users USING gin (full_name gin_trgm_ops)",
+)
+
+# total modes for list_users
+TOTAL_MODES = ("auto", "exact", "none")
+
+# In "auto" mode, totals estimated below this are counted exactly
+EXACT_COUNT_THRESHOLD = 10000
+
+_list_indexes_lock = threading.Lock()
+_list_indexes_ready = False
+
+
+def _is_postgresql(db) -> bool:
+    from peewee import PostgresqlDatabase
+
+    return isinstance(db, PostgresqlDatabase)
+
+
+def _ensure_list_indexes(db) -> None:
+    """Create the user listing indexes (once per process)."""
+    global _list_indexes_ready
+    if _list_indexes_ready:
+        return
+    with _list_indexes_lock:
+        if _list_indexes_ready:
+            return
+        statements = _LIST_INDEX_STATEMENTS
+        if _is_postgresql(db):
+            statements += _TRIGRAM_INDEX_STATEMENTS
+        for statement in statements:
+            try:
+                with db.atomic():
+                    db.execute_sql(statement)
+            except Exception as e:
+                # e.g. no privilege to create pg_trgm; search still works, only slower
+                logging.getLogger(__name__).warning(f"Could not create user list index: {e}")
+        _list_indexes_ready = True
+
+
+def _encode_cursor(created_at: datetime, user_id: str) -> str:
+    """Opaque cursor for the row after which the next page starts."""
+    raw = json.dumps([created_at.isoformat(), str(user_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(user_id)
+    except (ValueError, TypeError) as e:
+        raise UserError("Invalid cursor") from e
+
+
+def _estimate_count(db, query) -> Optional[int]:
+    """Planner row estimate for a query, None where the database has none."""
+    if not _is_postgresql(db):
+        return None
+    sql, params = query.sql()
+    try:
+        row = db.execute_sql(f"EXPLAIN (FORMAT JSON) {sql}", params).fetchone()
+        plan = json.loads(row[0]) if isinstance(row[0], str) else row[0]
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
+
+
 class UserManager:
     """Manages user profile operations."""
 
@@ -400,16 +486,25 @@ class UserManager:
         search: Optional[str] = None,
         role: Optional[str] = None,
         status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        total: str = "auto",
     ) -> Dict[str, Any]:
         """
         List users with filtering and pagination (admin only).
 
+        Users are ordered newest first by (created_at, id). Pass the returned
+        next_cursor to get the following page; its cost does not grow with
+        the position. Page numbers still work but use OFFSET.
+
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when cursor is given
             per_page: Items per page
             search: Search query (username, email, full_name)
             role: Filter by role
             status: Filter by status
+            cursor: next_cursor from the previous page
+            total: "exact" counts all matches, "auto" uses the planner estimate
+                for large results on PostgreSQL, "none" skips the count
 
         Returns:
             Paginated user list
@@ -426,6 +521,12 @@ class UserManager:
         if per_page < 1 or per_page > 100:
             raise UserError("Per page must be between 1 and 100")
 
+        if total not in TOTAL_MODES:
+            raise UserError(f"Total must be one of: {', '.join(TOTAL_MODES)}")
+
+        db = User._meta.database
+        _ensure_list_indexes(db)
+
         # Build query
         query = User.select()
 
@@ -444,12 +545,36 @@ class UserManager:
         if status:
             query = query.where(User.status == status)
 
-        # Get total count
-        total = query.count()
+        filtered = query
 
         # Apply pagination
-        offset = (page - 1) * per_page
-        users = query.offset(offset).limit(per_page).order_by(User.created_at.desc())
+        if cursor:
+            created_at, user_id = _decode_cursor(cursor)
+            query = query.where(
+                (User.created_at < created_at) |
+                ((User.created_at == created_at) & (User.id < user_id))
+            )
+        elif page > 1:
+            query = query.offset((page - 1) * per_page)
+
+        # One extra row tells whether another page exists
+        users = list(query.order_by(User.created_at.desc(), User.id.desc()).limit(per_page + 1))
+        has_more = len(users) > per_page
+        users = users[:per_page]
+        next_cursor = _encode_cursor(users[-1].created_at, users[-1].id) if has_more else None
+
+        # Get total count
+        total_count = None
+        total_is_estimate = False
+        if total != "none":
+            if not cursor and page == 1 and not has_more:
+                total_count = len(users)
+            else:
+                estimate = _estimate_count(db, filtered) if total == "auto" else None
+                if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+                    total_count, total_is_estimate = estimate, True
+                else:
+                    total_count = filtered.count()
 
         return {
             "users": [
@@ -469,8 +594,11 @@ class UserManager:
             "pagination": {
                 "page": page,
                 "per_page": per_page,
-                "total": total,
-                "pages": (total + per_page - 1) // per_page,
+                "total": total_count,
+                "pages": (total_count + per_page - 1) // per_page if total_count is not None else None,
+                "total_is_estimate": total_is_estimate,
+                "has_more": has_more,
+                "next_cursor": next_cursor,
             },
         }
 
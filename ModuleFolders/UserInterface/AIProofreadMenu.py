@@ -3,7 +3,6 @@ AI校对菜单模块
 从 ainiee_cli.py 分离
 """
 import os
-import time
 import threading
 import rapidjson as json
 
@@ -13,11 +12,8 @@ from rich.prompt import Prompt, IntPrompt, Confirm
 from rich.table import Table
 from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, SpinnerColumn
 
-from ModuleFolders.Base.Base import Base
 from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
 from ModuleFolders.Infrastructure.Cache.CacheItem import TranslationStatus
-from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
-from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
 
 console = Console()
 
@@ -161,8 +157,12 @@ class AIProofreadMenu:
 
         # 执行规则检查
         console.print("[dim]执行规则检查...[/dim]")
+        # 按位置检查，条目的 text_index 可能重复
+        results_by_position = rule_checker.check_batch(
+            [(i, item["source"], item["translation"]) for i, item in enumerate(to_check)]
+        )
         for i, item in enumerate(to_check):
-            rule_results = rule_checker.check(item["source"], item["translation"])
+            rule_results = results_by_position.get(i)
             if rule_results:
                 report_item = ProofreadReportItem(
                     index=item["index"],
@@ -174,8 +174,6 @@ class AIProofreadMenu:
                     }
                 )
                 report.add_item(report_item)
-            if (i + 1) % 100 == 0:
-                console.print(f"[dim]规则检查: {i + 1}/{len(to_check)}[/dim]")
 
         console.print(f"[green]规则检查完成，发现 {len(report.items)} 个问题[/green]")
 
@@ -192,94 +190,22 @@ class AIProofreadMenu:
         self._handle_proofread_result(report, project_path)
 
     def _execute_ai_proofread(self, to_check: list, report, project_path: str):
-        """执行AI校对 - 批量处理，复用翻译任务逻辑"""
-        import concurrent.futures
-        from ModuleFolders.Service.Proofreader.ProofreaderTask import ProofreaderTask
+        """执行AI校对 - 打包请求并发执行，与翻译任务共享限流器"""
+        from ModuleFolders.Service.Proofreader import AIProofreader
         from ModuleFolders.Service.Proofreader.ProofreadReport import ProofreadReportItem
-        from ModuleFolders.Infrastructure.RequestLimiter.RequestLimiter import RequestLimiter
-
-        # 初始化TaskConfig (复用翻译配置逻辑)
-        task_config = TaskConfig()
-        task_config.load_config_from_dict(self.config)
-        task_config.prepare_for_translation(TaskType.TRANSLATION)
-
-        # 初始化限流器
-        request_limiter = RequestLimiter()
-        tpm_limit = self.config.get("tpm_limit", 100000)
-        rpm_limit = self.config.get("rpm_limit", 60)
-        request_limiter.set_limit(tpm_limit, rpm_limit)
-
-        # 获取批量大小 (和翻译一样使用lines_limit)
-        lines_limit = self.config.get("lines_limit", 30)
-        pre_line_counts = self.config.get("pre_line_counts", 3)
-
-        # 分割数据为批次
-        chunks = []
-        previous_chunks = []
-        for i in range(0, len(to_check), lines_limit):
-            chunk = to_check[i:i + lines_limit]
-            chunks.append(chunk)
-            # 上文
-            start = max(0, i - pre_line_counts)
-            previous_chunks.append(to_check[start:i])
-
-        # 生成校对任务
-        tasks_list = []
-        for i, (chunk, prev_chunk) in enumerate(zip(chunks, previous_chunks)):
-            task = ProofreaderTask(task_config, request_limiter)
-            task.task_id = f"P-{i+1:03d}"
-            task.set_items(chunk)
-            task.set_previous_items(prev_chunk)
-            task.prepare()
-            tasks_list.append(task)
-
-        # 统计数据
-        total_tokens = 0
-        issues_found = 0
-        completed_tasks = 0
-        lock = threading.Lock()
-
-        # 任务完成回调
-        def task_done_callback(future):
-            nonlocal total_tokens, issues_found, completed_tasks
-            try:
-                result = future.result()
-                with lock:
-                    completed_tasks += 1  # 无论成功失败都计数
-
-                    if result is None or result.get("skip", True):
-                        return
-
-                    total_tokens += result.get("prompt_tokens", 0) + result.get("completion_tokens", 0)
-
-                    # 处理发现的问题 (key是行ID)
-                    issues = result.get("issues", {})
-                    corrections = result.get("corrections", {})
-                    task = future.task_ref
-
-                    # 建立行ID到item的映射
-                    id_to_item = {item["index"]: item for item in task.items}
-
-                    for line_id, issue_list in issues.items():
-                        item = id_to_item.get(line_id)
-                        if item:
-                            issues_found += 1
-                            report_item = ProofreadReportItem(
-                                index=line_id,
-                                source_text=item["source"],
-                                translated_text=item["translation"],
-                                ai_check={
-                                    "has_issues": True,
-                                    "issues": issue_list,
-                                    "corrected_translation": corrections.get(line_id, "")
-                                }
-                            )
-                            report.add_item(report_item)
-            except Exception as e:
-                with lock:
-                    completed_tasks += 1
-
-        # 并发执行任务
+
+        task_executor = getattr(self.host, "task_executor", None)
+        request_limiter = task_executor.request_limiter if task_executor else None
+        ai_proofreader = AIProofreader(self.config, request_limiter=request_limiter)
+
+        # 条目的 text_index 可能重复，按位置作为行ID
+        indexed_items = [{**item, "index": i} for i, item in enumerate(to_check)]
+        state = {"done": 0, "tokens": 0}
+
+        def progress_callback(done, total, prompt_tokens, completion_tokens):
+            state["done"] = done
+            state["tokens"] = prompt_tokens + completion_tokens
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[bold blue]AI校对"),
@@ -289,35 +215,54 @@ class AIProofreadMenu:
             TextColumn("{task.completed}/{task.total}"),
             TextColumn("•"),
             TextColumn("[cyan]Token: {task.fields[tokens]}"),
-            TextColumn("•"),
-            TextColumn("[yellow]问题: {task.fields[issues]}"),
             TimeElapsedColumn(),
             console=console,
             refresh_per_second=10
         ) as progress:
-            progress_task = progress.add_task("AI校对", total=len(tasks_list), tokens=0, issues=0)
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=task_config.actual_thread_counts, thread_name_prefix="proofreader") as executor:
-                futures = []
-                for task in tasks_list:
-                    if Base.work_status == Base.STATUS.STOPING:
-                        break
-                    future = executor.submit(task.run)
-                    future.task_ref = task
-                    future.add_done_callback(task_done_callback)
-                    futures.append(future)
-
-                # 等待所有任务完成，同时更新进度
-                while not all(f.done() for f in futures):
-                    with lock:
-                        progress.update(progress_task, completed=completed_tasks, tokens=total_tokens, issues=issues_found)
-                    time.sleep(0.1)
-
-                # 最终更新
-                with lock:
-                    progress.update(progress_task, completed=len(tasks_list), tokens=total_tokens, issues=issues_found)
-
-        console.print(f"[green]AI校对完成，共消耗 {total_tokens} Token，发现 {issues_found} 个问题[/green]")
+            progress_task = progress.add_task("AI校对", total=len(indexed_items), tokens=0)
+            results = {}
+
+            def run():
+                results.update(ai_proofreader.proofread_batch(
+                    indexed_items,
+                    glossary=self.config.get("prompt_dictionary_data", []),
+                    context_lines=self.config.get("pre_line_counts", 3),
+                    progress_callback=progress_callback,
+                    world_building=self.config.get("world_building_content", ""),
+                    writing_style=self.config.get("writing_style_content", ""),
+                    characterization=self.config.get("characterization_data", [])
+                ))
+
+            worker = threading.Thread(target=run, daemon=True)
+            worker.start()
+            while worker.is_alive():
+                progress.update(progress_task, completed=state["done"], tokens=state["tokens"])
+                worker.join(0.1)
+            progress.update(progress_task, completed=len(indexed_items), tokens=state["tokens"])
+
+        for position, result in results.items():
+            item = to_check[position]
+            report.add_item(ProofreadReportItem(
+                index=item["index"],
+                source_text=item["source"],
+                translated_text=item["translation"],
+                ai_check={
+                    "has_issues": True,
+                    "issues": [
+                        {
+                            "type": issue.type,
+                            "severity": issue.severity,
+                            "description": issue.description,
+                            "suggestion": issue.suggestion,
+                            "confidence": issue.confidence,
+                            "check_type": "ai"  # 标记为AI检查
+                        } for issue in result.issues
+                    ],
+                    "corrected_translation": result.corrected_translation
+                }
+            ))
+
+        console.print(f"[green]AI校对完成，共消耗 {state['tokens']} Token，发现 {len(results)} 个问题[/green]")
 
     def _handle_proofread_result(self, report, project_path: str):
         """处理校对结果"""
@@ -1,9 +1,29 @@
+import os
+
+import msgspec
+
 from ModuleFolders.Infrastructure.Cache.CacheItem import TranslationStatus
 from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
 from ModuleFolders.Infrastructure.Cache.CacheProject import CacheProject
 from PluginScripts.PluginBase import PluginBase
 
 
+# 只解码合并所需的字段，其余字段由 msgspec 直接跳过，不构造完整的缓存对象
+class _CachedItem(msgspec.Struct):
+    translation_status: int = 0
+    model: str | None = ''
+    source_text: str | None = ''
+    translated_text: str | None = None
+
+
+class _CachedFile(msgspec.Struct):
+    items: list[_CachedItem] = []
+
+
+class _CachedProject(msgspec.Struct):
+    files: dict[str, _CachedFile] = {}
+
+
 class IncrementalFilePlugin(PluginBase):
     def __init__(self):
         super().__init__()
@@ -24,28 +44,65 @@ class IncrementalFilePlugin(PluginBase):
             self.read_incremental_files(config, event_data)
 
     def read_incremental_files(self, config, event_data: CacheProject):
-
-        cache_manager = CacheManager()
-        cache_manager.load_from_file(config.label_output_path)
-        if not hasattr(cache_manager, "project") or cache_manager.project is None:
+        cache_files = self.load_cached_files(config.label_output_path)
+        if not cache_files:
             return
-        cache_files = cache_manager.project.files
 
         for file in event_data.files.values():
-            if file.storage_path in cache_files:
-                cache_line_set = set(x.source_text for x in cache_files[file.storage_path].items)
-                cache_items = iter(cache_files[file.storage_path].items)  # 用迭代器代替下标
-
-                for line in file.items:
-                    # 防止中间插入的行遍历完迭代器
-                    if line.source_text not in cache_line_set:
-                        continue
-                    for cache_line in cache_items:
-                        # 在缓存中找到当前的片段
-                        if cache_line.source_text == line.source_text:
-                            # 更新已翻译的片段
-                            if cache_line.translation_status == TranslationStatus.TRANSLATED and line.translation_status == TranslationStatus.UNTRANSLATED:
-                                line.translation_status = cache_line.translation_status
-                                line.model = cache_line.model
-                                line.translated_text = cache_line.translated_text
-                            break
+            cache_file = cache_files.get(file.storage_path)
+            if cache_file is not None:
+                self.merge_translations(file.items, cache_file.items)
+
+    @staticmethod
+    def load_cached_files(output_path: str) -> dict | None:
+        """读取上次的缓存，返回 storage_path -> 文件（只保证 items 可用）"""
+        path = os.path.join(output_path, "cache", "TranslateFlowCacheData.json")
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "rb") as reader:
+                return msgspec.json.decode(reader.read(), type=_CachedProject).files
+        except msgspec.DecodeError:
+            # 旧格式或损坏的缓存交给 CacheManager（兼容旧格式并从备份自动修复）
+            cache_manager = CacheManager()
+            cache_manager.load_from_file(output_path)
+            project = getattr(cache_manager, "project", None)
+            return project.files if project is not None else None
+
+    @staticmethod
+    def merge_translations(items, cache_items):
+        """
+        把缓存中已翻译的片段复制到新读取的未翻译片段上
+
+        以 (原文, 该原文在文件中第几次出现) 为键一次性建立索引，插入、删除、移动的行都不会
+        影响其他行的匹配；重复出现次数超过缓存时，复用同一原文最后一次的译文。
+        """
+        by_occurrence = {}
+        by_text = {}
+        occurrences = {}
+        for cache_line in cache_items:
+            source_text = cache_line.source_text or ""
+            index = occurrences.get(source_text, 0)
+            occurrences[source_text] = index + 1
+            if cache_line.translation_status == TranslationStatus.TRANSLATED:
+                by_occurrence[(source_text, index)] = cache_line
+                by_text[source_text] = cache_line
+
+        if not by_text:
+            return
+
+        occurrences.clear()
+        for line in items:
+            source_text = line.source_text
+            index = occurrences.get(source_text, 0)
+            occurrences[source_text] = index + 1
+            if line.translation_status != TranslationStatus.UNTRANSLATED:
+                continue
+
+            cache_line = by_occurrence.get((source_text, index)) or by_text.get(source_text)
+            if cache_line is not None:
+                # 更新已翻译的片段
+                line.translation_status = cache_line.translation_status
+                line.model = cache_line.model
+                line.translated_text = cache_line.translated_text
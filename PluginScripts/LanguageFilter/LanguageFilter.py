@@ -1,4 +1,5 @@
-from tqdm import tqdm
+import re
+
 from rich import print
 
 from ModuleFolders.Infrastructure.Cache.CacheProject import CacheProject
@@ -8,6 +9,11 @@ from ModuleFolders.Infrastructure.Cache.CacheItem import TranslationStatus
 from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
 
 
+def _char_class(*ranges: tuple) -> re.Pattern:
+    """把若干字符范围编译成一个字符类正则，查找在 C 层一次完成"""
+    return re.compile("[" + "".join(f"{re.escape(start)}-{re.escape(end)}" for start, end in ranges) + "]")
+
+
 class LanguageFilter(PluginBase):
     # 平假名
     HIRAGANA = ("\u3040", "\u309F")
@@ -74,6 +80,21 @@ class LanguageFilter(PluginBase):
     CYRILLIC_SUPPLEMENTAL_EXTRA = ("\u2DE0", "\u2DFF")  # 其他扩展字符（例如：斯拉夫语言的一些符号）
     CYRILLIC_OTHER = ("\u0500", "\u050F")  # 其他字符区块（包括斯拉夫语系其他语言的字符，甚至一些特殊符号）
 
+    # 预编译的字符类，与下方 is_* 的范围一一对应
+    CJK_PATTERN = _char_class(CJK)
+    LATIN_PATTERN = _char_class(LATIN_1, LATIN_2, LATIN_EXTENDED_A, LATIN_EXTENDED_B, LATIN_SUPPLEMENTAL)
+    KOREAN_PATTERN = _char_class(
+        CJK, HANGUL_JAMO, HANGUL_JAMO_EXTENDED_A, HANGUL_JAMO_EXTENDED_B,
+        HANGUL_SYLLABLES, HANGUL_COMPATIBILITY_JAMO,
+    )
+    RUSSIAN_PATTERN = _char_class(
+        CYRILLIC_BASIC, CYRILLIC_SUPPLEMENT, CYRILLIC_EXTENDED_A, CYRILLIC_EXTENDED_B,
+        CYRILLIC_SUPPLEMENTAL, CYRILLIC_SUPPLEMENTAL_EXTRA, CYRILLIC_OTHER,
+    )
+    JAPANESE_PATTERN = _char_class(
+        CJK, KATAKANA, HIRAGANA, KATAKANA_HALF_WIDTH, KATAKANA_PHONETIC_EXTENSIONS, VOICED_SOUND_MARKS,
+    )
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -152,7 +173,7 @@ class LanguageFilter(PluginBase):
                 target.extend(self._filter_normal_language(file, file_items, config.source_language))
 
         print("")
-        for item in tqdm(target):
+        for item in target:
             item.translation_status = TranslationStatus.EXCLUDED
 
         # 输出结果
@@ -211,23 +232,23 @@ class LanguageFilter(PluginBase):
 
     # 检查字符串是否包含至少一个汉字（中文）字符
     def has_any_cjk(self, text: str) -> bool:
-        return any(self.is_cjk(char) for char in text)
+        return LanguageFilter.CJK_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个拉丁字符
     def has_any_latin(self, text: str) -> bool:
-        return any(self.is_latin(char) for char in text)
+        return LanguageFilter.LATIN_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个韩文（含汉字）字符
     def has_any_korean(self, text: str) -> bool:
-        return any(self.is_korean(char) for char in text)
+        return LanguageFilter.KOREAN_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个俄文字符
     def has_any_russian(self, text: str) -> bool:
-        return any(self.is_russian(char) for char in text)
+        return LanguageFilter.RUSSIAN_PATTERN.search(text) is not None
 
     # 检查字符串是否包含至少一个日文（含汉字）字符
     def has_any_japanese(self, text: str) -> bool:
-        return any(self.is_japanese(char) for char in text)
+        return LanguageFilter.JAPANESE_PATTERN.search(text) is not None
 
     def get_filter_function(self, language_code: str, path: str):
         """根据语言代码获取相应的语言过滤函数"""
@@ -7,6 +7,7 @@ import openpyxl
 from chardet import detect
 import csv
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
 version = "v3.00"
 
@@ -17,6 +18,32 @@ pd.options.display.max_rows = None
 pd.options.display.max_columns = None
 pd.options.display.width = None
 
+# 判断文本是否包含日语字符的正则表达式（预编译，避免逐节点查找缓存）
+JA_PATTERN = re.compile("[\u4e00-\u9fa5\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fa5ー々〆〤]")
+
+# 多进程工作进程内复用的 Jr_Tpp 实例
+_worker_tpp = None
+
+
+def _init_worker(config: dict):
+    """
+    初始化工作进程，在进程内创建一个 Jr_Tpp 实例供后续任务复用。
+
+    :param config: 配置字典。
+    """
+    global _worker_tpp
+    _worker_tpp = Jr_Tpp(config)
+
+
+def _read_game_file_in_worker(File: str, name: str):
+    """在工作进程中读取单个游戏文件。"""
+    return _worker_tpp.ReadGameFile(File, name)
+
+
+def _inject_game_file_in_worker(File: str, name: str, ops: list, Scenario: bool, data_dir: str):
+    """在工作进程中向单个游戏文件注入翻译。"""
+    return _worker_tpp.InjectGameFile(File, name, ops, Scenario, data_dir)
+
 
 class Jr_Tpp:
     def __init__(self, config: dict, path: str = False):
@@ -27,14 +54,6 @@ class Jr_Tpp:
         :param path: 可选的项目路径，如果提供，将从该路径加载项目。
         """
         self.ProgramData = {}  # 存储项目数据的字典
-        self.__tempdata = [  # 临时数据列表，用于存储提取的文本行
-            "原文",
-            "译文",
-            "地址",
-            "标签",
-            "code",
-        ]
-        self.__sumlen = 0  # 记录合并文本的长度
 
         # 初始化日志记录器
         self.logger = logging.getLogger(__name__)
@@ -56,8 +75,10 @@ class Jr_Tpp:
         :param config: 配置字典。
         :param clean: 是否清除现有的项目数据（默认为 False）。
         """
+        self.config = config  # 保留原始配置，供多进程工作进程初始化使用
         # 从配置中获取各项设置，如果配置中没有，则使用默认值
         self.BlackDir = config.get("BlackDir", [])  # 黑名单目录
+        self.__BlackDirPatterns = [re.compile(x) for x in self.BlackDir]  # 预编译的黑名单目录规则
         self.BlackFiles = config.get("BlackFiles", [])  # 黑名单文件
         self.BlackCode = config.get("BlackCode", [])  # 黑名单代码
         self.NameWithout = config.get("NameWithout", [])  # 提取人名时需要排除的文件
@@ -89,6 +110,7 @@ class Jr_Tpp:
         self.translation_header = config.get("translation_header", "Initial")
         self.source_column = config.get("source_column", 0)
         self.translation_column = config.get("translation_column", 1)
+        self.max_workers = config.get("max_workers", 1)  # 读取和注入游戏文件的并行进程数，1 为串行
 
         if clean:
             self.ProgramData = {}  # 如果 clean 为 True，清空项目数据
@@ -193,106 +215,136 @@ class Jr_Tpp:
             data = re.findall(rule, data)
             for i in data:
                 # 检查提取的文本中是否包含日语字符
-                if re.search(
-                    "[\u4e00-\u9fa5\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fa5ー々〆〤]", i
-                ):
+                if JA_PATTERN.search(i):
                     res.append([i, "", Dir, "", code])  # 将提取的文本添加到结果列表
         return res
 
-    def __ReadFile(self, data, FileName: str, code: int = False) -> list:
+    @staticmethod
+    def __IterChildren(data, code):
         """
-        递归地读取文件内容，提取需要翻译的文本。
+        按顺序产出容器节点的子节点。
+
+        :param data: 字典或列表。
+        :param code: 父节点传下来的 code（仅对列表生效）。
+        :return: 生成器，产出 (键, 子节点, code)。
+        """
+        if type(data) is dict:
+            current_code = data.get("code", False)  # 字典的子节点使用字典自身的 code
+            for key, value in data.items():
+                yield key, value, current_code
+        else:
+            for i, value in enumerate(data):
+                yield str(i), value, code
+
+    def __IterLeaves(self, data, FileName: str):
+        """
+        以显式栈代替递归，按深度优先顺序遍历数据，产出所有字符串叶子节点。
+        地址只在到达字符串节点时才拼接，避免为每个中间节点构造路径字符串。
 
         :param data: 要读取的数据（可以是字典、列表或字符串）。
-        :param FileName: 当前处理的文件名或路径。
-        :param code: 当前文本的 code（可选，默认为 False）。
-        :return: 包含提取的文本的列表，每个元素是一个包含原文、译文、地址、标签和 code 的列表。
+        :param FileName: 当前处理的文件名。
+        :return: 生成器，产出 (地址, 文本, code)。
         """
-        res = []
         tp = type(data)
+        if tp is str:
+            yield FileName, data, False
+            return
+        if tp is not dict and tp is not list:
+            return
 
-        if tp == dict:
-            # 如果数据是字典，遍历键值对
-            for key in data.keys():
-                current_code = data.get("code", False)  # 获取当前的 code
-                # 递归调用 __ReadFile 处理子元素
-                res += self.__ReadFile(data[key], FileName + "\\" + key, current_code)
+        path = [FileName]
+        stack = [(self.__IterChildren(data, False), 1)]
+        while stack:
+            children, depth = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+            key, value, code = child
+            del path[depth:]
+            path.append(key)
+            tp = type(value)
+            if tp is dict or tp is list:
+                stack.append((self.__IterChildren(value, code), depth + 1))
+            elif tp is str:
+                yield "\\".join(path), value, code
 
-        elif tp == list:
-            # 如果数据是列表，遍历元素
-            for i in range(0, len(data)):
-                # 递归调用 __ReadFile 处理子元素
-                res += self.__ReadFile(data[i], FileName + "\\" + str(i), code)
+    def __IterFile(self, data, FileName: str):
+        """
+        读取文件内容，逐条产出需要翻译的文本。合并文本的状态保存在局部变量中，
+        因此可以在多个文件（或多个进程）之间独立运行。
 
-        elif tp == str:
-            # 如果数据是字符串，处理文本提取逻辑
+        :param data: 要读取的数据（可以是字典、列表或字符串）。
+        :param FileName: 当前处理的文件名。
+        :return: 生成器，每个元素是一个包含原文、译文、地址、标签和 code 的列表。
+        """
+        tempdata = ["原文", "译文", "地址", "标签", "code"]  # 正在合并的文本行
+        sumlen = 0  # 已合并的文本行数
+
+        for Dir, text, code in self.__IterLeaves(data, FileName):
             current_code = str(code) if code else "-1"  # 将 code 转换为字符串
 
             if current_code in self.sptext.keys():
                 # 如果当前 code 在 sptext 字典中，应用特殊规则提取文本
                 for mark in self.sptext[current_code].keys():
-                    if mark in data or mark == "空":
+                    if mark in text or mark == "空":
                         rule = self.sptext[current_code][mark]
-                        # 使用正则表达式提取文本
-                        [
-                            res.append(x)
-                            for x in self.__GetSptext(
-                                data, FileName, current_code, rule
-                            )
-                        ]
-            else:
-                # 检查是否包含日语字符或特殊情况下的处理
-                if (
-                    not self.ja
-                    or re.search(
-                        r"[\u4e00-\u9fa5\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fa5ー々〆〤]",
-                        data,
-                    )
-                    or r"System.json\gameTitle" in FileName
-                ):
-                    if r"System.json\gameTitle" in FileName and data == "":
-                        data = " "  # 确保 gameTitle 不为空
-                    textdata = [data, "", FileName, "", current_code]
+                        yield from self.__GetSptext(text, Dir, current_code, rule)
+                continue
 
-                    # 处理 code 为 108 或 408 时的文本合并逻辑
-                    if (
-                        current_code == self.__tempdata[4]
-                        or (self.__tempdata[4] == "108" and current_code == "408")
-                    ) and current_code in self.sumcode:
-                        self.__tempdata[0] += "\n" + textdata[0]
-                        self.__sumlen += 1
-                    else:
-                        # 如果存在合并的文本，添加到结果列表
-                        if self.__sumlen:
-                            self.__tempdata[2] += "\u200B" + str(self.__sumlen)
-                            if self.__tempdata[0] != "":
-                                res.append(self.__tempdata)
-
-                        # 根据 ReadCode 设置决定是否添加到结果列表
-                        if current_code in self.ReadCode or not self.ReadCode:
-                            self.__tempdata = textdata
-                            self.__sumlen = 1
-                        else:
-                            self.__tempdata = ["原文", "译文", "地址", "标签", "code"]
-                            self.__sumlen = 0
+            # 处理 code 为 108 或 408 时的文本合并逻辑
+            merge = (
+                current_code == tempdata[4]
+                or (tempdata[4] == "108" and current_code == "408")
+            ) and current_code in self.sumcode
+
+            # 检查是否包含日语字符或特殊情况下的处理
+            if (
+                not self.ja
+                or JA_PATTERN.search(text)
+                or r"System.json\gameTitle" in Dir
+            ):
+                if r"System.json\gameTitle" in Dir and text == "":
+                    text = " "  # 确保 gameTitle 不为空
+
+                if merge:
+                    tempdata[0] += "\n" + text
+                    sumlen += 1
                 else:
-                    # 处理不包含日语字符的情况
-                    if (
-                        current_code == self.__tempdata[4]
-                        or (self.__tempdata[4] == "108" and current_code == "408")
-                    ) and current_code in self.sumcode:
-                        self.__tempdata[0] += "\n" + data
-                        self.__sumlen += 1
-                    elif self.__sumlen:
-                        self.__tempdata[2] += "\u200B" + str(self.__sumlen)
-                        if self.__tempdata[0] != "":
-                            res.append(self.__tempdata)
-                        self.__tempdata = ["原文", "译文", "地址", "标签", "code"]
-                        self.__sumlen = 0
+                    # 如果存在合并的文本，产出合并结果
+                    if sumlen:
+                        tempdata[2] += "\u200B" + str(sumlen)
+                        if tempdata[0] != "":
+                            yield tempdata
+
+                    # 根据 ReadCode 设置决定是否开始新的文本行
+                    if current_code in self.ReadCode or not self.ReadCode:
+                        tempdata = [text, "", Dir, "", current_code]
+                        sumlen = 1
                     else:
-                        self.__tempdata = ["原文", "译文", "地址", "标签", "code"]
-                        self.__sumlen = 0
-        return res
+                        tempdata = ["原文", "译文", "地址", "标签", "code"]
+                        sumlen = 0
+            else:
+                # 处理不包含日语字符的情况
+                if merge:
+                    tempdata[0] += "\n" + text
+                    sumlen += 1
+                elif sumlen:
+                    tempdata[2] += "\u200B" + str(sumlen)
+                    if tempdata[0] != "":
+                        yield tempdata
+                    tempdata = ["原文", "译文", "地址", "标签", "code"]
+                    sumlen = 0
+                else:
+                    tempdata = ["原文", "译文", "地址", "标签", "code"]
+                    sumlen = 0
+
+        # 产出文件末尾仍在合并中的文本
+        if sumlen:
+            if "\u200B" not in tempdata[2]:
+                tempdata[2] += "\u200B" + str(sumlen)
+            if tempdata[0] != "":
+                yield tempdata
 
     def __ReadFolder(self, dir: str) -> list:
         """
@@ -315,10 +367,9 @@ class Jr_Tpp:
         :param Dir: 要检查的目录。
         :return: 如果目录在黑名单中，则返回 True，否则返回 False。
         """
-        for blackdir in self.BlackDir:
-            pattern = re.compile(blackdir)  # 创建正则表达式对象
+        for pattern in self.__BlackDirPatterns:
             # 如果目录与黑名单中的任何一个模式匹配，则返回 True
-            if re.search(pattern, Dir):
+            if pattern.search(Dir):
                 return True
         return False
 
@@ -502,16 +553,62 @@ class Jr_Tpp:
             for i in nanlist:
                 print(i)
 
-    def ReadGame(self, GameDir: str):
+    def __LoadJson(self, File: str, name: str):
+        """
+        读取 JSON 文件，UTF-8 失败时自动检测编码。
+
+        :param File: 文件路径。
+        :param name: 文件名。
+        :return: 读取到的数据，失败时返回 None。
+        """
+        try:
+            # 尝试使用 UTF-8 编码读取 JSON 文件
+            with open(File, "r", encoding="utf8") as f:
+                return json.load(f)
+        except Exception:
+            # 如果 UTF-8 编码失败，尝试自动检测编码并读取
+            try:
+                with open(File, "rb") as f:
+                    encoding = detect(f.read())["encoding"]
+                    encoding = (
+                        encoding if encoding else "ansi"
+                    )  # 如果未检测到编码，则使用 ansi
+                with open(File, "r", encoding=encoding) as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.error(f"读取文件 {name} 失败")
+                self.logger.error(traceback.format_exc())
+                print(
+                    f"无法确定{name}文件编码, 且无法用ANSI编码打开，读取失败"
+                )
+                return None
+
+    def ReadGameFile(self, File: str, name: str):
+        """
+        读取单个游戏 JSON 文件，提取需要翻译的文本。
+
+        :param File: 文件路径。
+        :param name: 文件名（相对于数据文件夹）。
+        :return: (文件名, 文本数据列表)，读取失败时文本数据为 None。
+        """
+        print(f"正在读取{name}")
+        data = self.__LoadJson(File, name)
+        if data is None:
+            return name, None
+        return name, list(self.__IterFile(data, name))
+
+    def ReadGame(self, GameDir: str, max_workers: int = None):
         """
         读取游戏目录中的 JSON 文件，提取需要翻译的文本。
 
         :param GameDir: 游戏目录的路径。
+        :param max_workers: 并行读取的进程数（默认使用配置中的 max_workers，1 为串行）。
         """
         self.logger.info(f"开始读取游戏目录: {GameDir}")
         data_folder_name = "data"  # 数据文件夹的名称
         data_dir = os.path.join(GameDir, data_folder_name)  # 构造数据文件夹的完整路径
         Files = self.__ReadFolder(GameDir)  # 读取游戏目录下的所有文件
+        targets = []
         for File in Files:
             # 计算文件相对于数据文件夹的路径
             relative_path = os.path.relpath(File, data_dir)
@@ -524,54 +621,107 @@ class Jr_Tpp:
             # 处理数据文件夹内的 JSON 文件
             if data_folder_name in File.lower() and name.endswith(".json"):
                 if name not in self.BlackFiles:
-                    print(f"正在读取{name}")
-                    try:
-                        # 尝试使用 UTF-8 编码读取 JSON 文件
-                        with open(File, "r", encoding="utf8") as f:
-                            data = json.load(f)
-                    except Exception:
-                        # 如果 UTF-8 编码失败，尝试自动检测编码并读取
-                        try:
-                            with open(File, "rb") as f:
-                                encoding = detect(f.read())["encoding"]
-                                encoding = (
-                                    encoding if encoding else "ansi"
-                                )  # 如果未检测到编码，则使用 ansi
-                            with open(File, "r", encoding=encoding) as f:
-                                data = json.load(f)
-                        except Exception as e:
-                            self.logger.error(f"读取文件 {name} 失败")
-                            self.logger.error(traceback.format_exc())
-                            print(
-                                f"无法确定{name}文件编码, 且无法用ANSI编码打开，读取失败"
-                            )
-                            continue
+                    targets.append((File, name))
+
+        max_workers = max_workers or self.max_workers
+        if max_workers > 1 and len(targets) > 1:
+            # 按文件分发到多个进程，结果按原始文件顺序合并
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(self.config,)
+            ) as executor:
+                results = list(
+                    executor.map(_read_game_file_in_worker, *zip(*targets), chunksize=4)
+                )
+        else:
+            results = (self.ReadGameFile(File, name) for File, name in targets)
 
-                    # 调用 __ReadFile 提取文本数据
-                    TextDatas = self.__ReadFile(data, name)
-                    # 处理可能存在的文本合并
-                    if self.__sumlen and self.__tempdata not in TextDatas:
-                        if "\u200B" not in self.__tempdata[2]:
-                            self.__tempdata[2] += "\u200B" + str(self.__sumlen)
-                        if self.__tempdata[0] != "":
-                            TextDatas.append(self.__tempdata)
-                    # 重置临时数据和合并长度
-                    self.__tempdata = [
-                        "原文",
-                        "译文",
-                        "地址",
-                        "标签",
-                        "code",
-                    ]
-                    self.__sumlen = 0
-                    # 将提取的文本数据转换为 DataFrame 并添加到 ProgramData 中
-                    if TextDatas:
-                        self.ProgramData.update({name: self.__toDataFrame(TextDatas)})
+        for name, TextDatas in results:
+            # 将提取的文本数据转换为 DataFrame 并添加到 ProgramData 中
+            if TextDatas:
+                self.ProgramData.update({name: self.__toDataFrame(TextDatas)})
         self.logger.info("游戏读取完成")
         print("########################读取游戏完成########################")
 
+    def __BuildWriteOps(self, DataFrame: pd.DataFrame, BlackLabel: list, BlackCode: list) -> list:
+        """
+        按列一次性取出 DataFrame 的数据，生成该文件的写入操作列表（地址 → 译文）。
+
+        :param DataFrame: 文件对应的翻译数据。
+        :param BlackLabel: 要排除的标签列表。
+        :param BlackCode: 要排除的 code 列表。
+        :return: 写入操作列表，每个元素为 (地址列表, 原文, 译文, 长度, code)，顺序与 DataFrame 一致。
+        """
+        ops = []
+        for untrs, trsed, Dirs, codes, labels in zip(
+            DataFrame.index,
+            DataFrame["译文"],
+            DataFrame["地址"],
+            DataFrame["code"],
+            DataFrame["标签"],
+        ):
+            # 检查是否存在需要排除的标签
+            if any(label in BlackLabel for label in labels.split(",")):
+                continue
+            codelist = codes.split(",")
+            for i, address in enumerate(Dirs.split("☆↑↓")):
+                # 解析地址、长度和 code
+                Dir, length = address.split("\u200B")[:2]
+                code = codelist[i]
+                # 排除黑名单中的文本和目录
+                if code not in BlackCode and not self.__IfBlackDir(Dir):
+                    # 解析地址为列表形式
+                    ops.append((Dir.split("json\\")[1].split("\\"), untrs, trsed, int(length), code))
+        return ops
+
+    def InjectGameFile(self, File: str, name: str, ops: list, Scenario: bool, data_dir: str):
+        """
+        将写入操作应用到单个游戏 JSON 文件，并写入输出目录。
+
+        :param File: 原始文件路径。
+        :param name: 文件名（相对于数据文件夹）。
+        :param ops: 由 __BuildWriteOps 生成的写入操作列表，为 None 时原样输出。
+        :param Scenario: 是否为 Scenario.json 文件。
+        :param data_dir: 输出数据目录。
+        """
+        print(f"正在写入{name}")
+        try:
+            # 尝试使用 UTF-8 编码读取 JSON 文件
+            with open(File, "r", encoding="utf8") as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.error(f"读取文件 {name} 失败")
+            self.logger.error(traceback.format_exc())
+            print(f"读取{name}失败")
+            return
+
+        if ops is not None:
+            for Dir, untrs, trsed, length, code in ops:
+                # 调用 __WriteFile 写入翻译后的文本
+                data = self.__WriteFile(
+                    data, untrs, trsed, Dir, length, code, key_is_list=Scenario
+                )
+            # 删除标记为 "☆删除☆" 的列表元素
+            data = self.__del_marked_list(data, Scenario)
+
+        # 创建输出目录
+        self.__makedir(name, data_dir)
+        output_file = os.path.join(data_dir, name)  # 构造输出文件的完整路径
+        try:
+            # 将更新后的数据写回 JSON 文件，使用缩进和确保 ASCII 字符不转义
+            with open(output_file, "w", encoding="utf8") as f1:
+                json.dump(data, f1, ensure_ascii=False, indent=4)
+        except Exception as e:
+            self.logger.error(f"写入文件 {name} 失败")
+            self.logger.error(traceback.format_exc())
+            print(f"写入{name}失败")
+
     def InjectGame(
-        self, GameDir: str, path: str, BlackLabel: list = None, BlackCode: list = None
+        self,
+        GameDir: str,
+        path: str,
+        BlackLabel: list = None,
+        BlackCode: list = None,
+        max_workers: int = None,
     ):
         """
         将翻译后的文本注入回游戏目录中的 JSON 文件。
@@ -580,6 +730,7 @@ class Jr_Tpp:
         :param path: 翻译文件所在的路径。
         :param BlackLabel: 要排除的标签列表（默认为 ["Black"]）。
         :param BlackCode: 要排除的 code 列表（默认为 self.BlackCode）。
+        :param max_workers: 并行写入的进程数（默认使用配置中的 max_workers，1 为串行）。
         """
         self.logger.info(f"开始注入翻译到游戏目录: {GameDir}, 输出路径: {path}")
         # 如果未提供 BlackLabel 和 BlackCode，则使用默认值
@@ -605,6 +756,7 @@ class Jr_Tpp:
         data_dir = os.path.join(path, "data")  # 构造输出数据目录的路径
         os.makedirs(data_dir, exist_ok=True)  # 确保输出目录存在
 
+        targets = []
         for File in Files:
             # 提取文件名
             name_parts = File.split(os.path.join("data", ""))
@@ -613,66 +765,22 @@ class Jr_Tpp:
                 Scenario = "Scenario.json" in File  # 检查是否为 Scenario.json 文件
 
                 if os.sep + "data" + os.sep in File and name.endswith(".json"):
-                    print(f"正在写入{name}")
-                    try:
-                        # 尝试使用 UTF-8 编码读取 JSON 文件
-                        with open(File, "r", encoding="utf8") as f:
-                            data = json.load(f)
-                    except Exception as e:
-                        self.logger.error(f"读取文件 {name} 失败")
-                        self.logger.error(traceback.format_exc())
-                        print(f"读取{name}失败")
-                        continue
-
+                    # 每个文件的写入操作只构建一次
+                    ops = None
                     if name in self.ProgramData.keys():
-                        # 如果存在对应的翻译数据，则进行文本替换
-                        DataFrame = self.ProgramData[name]
-                        for untrs in DataFrame.index:
-                            trsed = DataFrame.loc[untrs, "译文"]  # 获取翻译后的文本
-                            # 获取文本的地址、code 和标签
-                            Dirlist = DataFrame.loc[untrs, "地址"].split("☆↑↓")
-                            codelist = DataFrame.loc[untrs, "code"].split(",")
-                            labellist = DataFrame.loc[untrs, "标签"].split(",")
-                            # 检查是否存在需要排除的标签
-                            black = any(label in BlackLabel for label in labellist)
-
-                            for i in range(len(Dirlist)):
-                                # 解析地址、长度和 code
-                                Dir = Dirlist[i].split("\u200B")[0]
-                                length = int(Dirlist[i].split("\u200B")[1])
-                                code = codelist[i]
-                                # 排除黑名单中的文本和目录
-                                if (
-                                    not black
-                                    and code not in BlackCode
-                                    and not self.__IfBlackDir(Dir)
-                                ):
-                                    # 解析地址为列表形式
-                                    Dir = Dir.split("json\\")[1].split("\\")
-                                    # 调用 __WriteFile 写入翻译后的文本
-                                    data = self.__WriteFile(
-                                        data,
-                                        untrs,
-                                        trsed,
-                                        Dir,
-                                        length,
-                                        code,
-                                        key_is_list=Scenario,
-                                    )
-                        # 删除标记为 "☆删除☆" 的列表元素
-                        data = self.__del_marked_list(data, Scenario)
-
-                    # 创建输出目录
-                    self.__makedir(name, data_dir)
-                    output_file = os.path.join(data_dir, name)  # 构造输出文件的完整路径
-                    try:
-                        # 将更新后的数据写回 JSON 文件，使用缩进和确保 ASCII 字符不转义
-                        with open(output_file, "w", encoding="utf8") as f1:
-                            json.dump(data, f1, ensure_ascii=False, indent=4)
-                    except Exception as e:
-                        self.logger.error(f"写入文件 {name} 失败")
-                        self.logger.error(traceback.format_exc())
-                        print(f"写入{name}失败")
+                        ops = self.__BuildWriteOps(self.ProgramData[name], BlackLabel, BlackCode)
+                    targets.append((File, name, ops, Scenario, data_dir))
+
+        max_workers = max_workers or self.max_workers
+        if max_workers > 1 and len(targets) > 1:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(self.config,)
+            ) as executor:
+                # 消费结果以便传播工作进程中的异常
+                list(executor.map(_inject_game_file_in_worker, *zip(*targets)))
+        else:
+            for target in targets:
+                self.InjectGameFile(*target)
 
         self.logger.info("游戏注入完成")
         print("########################写入游戏完成########################")
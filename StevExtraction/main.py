@@ -65,6 +65,7 @@ class MainApp:
                 "need2check_filename": "need2check.json",
                 "project_data_dir": "data",
                 "project_dir_name": "翻译工程文件",
+                "max_workers": 1,
             }
             for key, value in defaults.items():
                 config.setdefault(key, value)
@@ -0,0 +1,122 @@
+# Tools/Benchmark/bench_response_extractor.py
+"""
+Micro benchmark for ResponseExtractor over recorded responses.
+
+Every fixture line is a JSON object:
+    name        label shown in reports
+    source      source_text_dict sent with the request
+    response    raw model reply (the numbered <textarea> format)
+    extracted   expected ResponseExtractor.text_extraction result
+    cleaned     expected ResponseExtractor.remove_numbered_prefix result
+
+The outputs are checked against the recorded expectations before timing, so
+a faster extractor that changes results fails instead of looking good. New
+replies can be appended with empty expectations and filled in with --record
+(only do this when the current extractor is known to be correct).
+
+Examples:
+    python Tools/Benchmark/bench_response_extractor.py
+    python Tools/Benchmark/bench_response_extractor.py --iterations 200
+    python Tools/Benchmark/bench_response_extractor.py --fixtures my_replies.jsonl --record
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from ModuleFolders.Domain.ResponseExtractor.ResponseExtractor import ResponseExtractor
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "response_extractor.jsonl")
+
+
+def load_fixtures(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as reader:
+        return [json.loads(line) for line in reader if line.strip()]
+
+
+def extract(fixture: dict):
+    """与 TranslatorTask 相同的调用顺序：先提取，再去除序号"""
+    extracted = ResponseExtractor.text_extraction(None, fixture["source"], fixture["response"])
+    cleaned = ResponseExtractor.remove_numbered_prefix(None, extracted) if isinstance(extracted, dict) else extracted
+    return extracted, cleaned
+
+
+def _normalized(value):
+    # 异常分支返回 tuple，经 JSON 往返后才能与记录值比较
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def verify(fixtures: List[dict]) -> List[str]:
+    failures = []
+    for fixture in fixtures:
+        extracted, cleaned = extract(fixture)
+        if _normalized(extracted) != fixture.get("extracted") or _normalized(cleaned) != fixture.get("cleaned"):
+            failures.append(fixture.get("name", "?"))
+    return failures
+
+
+def record(fixtures: List[dict], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as writer:
+        for fixture in fixtures:
+            extracted, cleaned = extract(fixture)
+            fixture["extracted"], fixture["cleaned"] = _normalized(extracted), _normalized(cleaned)
+            writer.write(json.dumps(fixture, ensure_ascii=False) + "\n")
+
+
+def bench(fixtures: List[dict], iterations: int) -> dict:
+    lines = sum(len(fixture["response"].split("\n")) for fixture in fixtures)
+    per_fixture = {}
+    start = time.perf_counter()
+    for fixture in fixtures:
+        fixture_start = time.perf_counter()
+        for _ in range(iterations):
+            extract(fixture)
+        per_fixture[fixture.get("name", "?")] = (time.perf_counter() - fixture_start) / iterations
+    elapsed = time.perf_counter() - start
+    return {
+        "responses": len(fixtures),
+        "iterations": iterations,
+        "responses_per_second": len(fixtures) * iterations / elapsed,
+        "lines_per_second": lines * iterations / elapsed,
+        "slowest": sorted(per_fixture.items(), key=lambda item: item[1], reverse=True)[:5],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ResponseExtractor over recorded responses")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="JSONL file with recorded responses")
+    parser.add_argument("--iterations", type=int, default=50, help="Passes over each fixture")
+    parser.add_argument("--record", action="store_true", help="Overwrite expectations with the current output and exit")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if args.record:
+        record(fixtures, args.fixtures)
+        print(f"Recorded {len(fixtures)} fixtures to {args.fixtures}")
+        return 0
+
+    failures = verify(fixtures)
+    if failures:
+        print(f"Output differs from the recorded expectations in {len(failures)} fixture(s):")
+        for name in failures:
+            print(f"  {name}")
+        return 1
+
+    result = bench(fixtures, max(1, args.iterations))
+    print(f"{result['responses']} responses x {result['iterations']} iterations")
+    print(f"  {result['responses_per_second']:,.0f} responses/s, {result['lines_per_second']:,.0f} lines/s")
+    print("  slowest:")
+    for name, seconds in result["slowest"]:
+        print(f"    {name:<28} {seconds * 1e6:9.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# Tools/Benchmark/check_startup_imports.py
+"""
+Startup import budget for ainiee_cli.
+
+Imports ainiee_cli in a fresh interpreter under `python -X importtime` and
+fails when the cumulative import time exceeds the budget, or when a module
+that must stay lazy (task stack, babeldoc, tiktoken) is pulled in at import
+time. Web-server tasks and queue steps start a new process per run, so this
+cost is paid on every task.
+
+Reported:
+    total ms         cumulative import time of ainiee_cli
+    slowest          direct imports of ainiee_cli with the largest cumulative time
+    forbidden        lazy modules found in the import graph
+
+Examples:
+    python Tools/Benchmark/check_startup_imports.py
+    python Tools/Benchmark/check_startup_imports.py --budget-ms 800 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+DEFAULT_BUDGET_MS = 1500.0
+
+# 这些模块只能在首次运行任务时加载（见 ainiee_cli.CLIMenu.task_executor）
+FORBIDDEN_PREFIXES = (
+    "babeldoc",
+    "tiktoken",
+    "ModuleFolders.Base.PluginManager",
+    "ModuleFolders.Domain.FileReader",
+    "ModuleFolders.Domain.FileOutputer",
+    "ModuleFolders.Infrastructure.Cache.CacheManager",
+    "ModuleFolders.Service.TaskExecutor",
+)
+
+
+def measure_imports(module: str) -> List[Tuple[str, int, int]]:
+    """Return (name, depth, cumulative_us) for `module` and everything it imports, module last."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        # 依赖层级由名称前的缩进表示，每层两个空格
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(cumulative)))
+
+    # -X importtime 先输出子模块再输出父模块，module 之前、上一个顶层条目之后的都是它的依赖
+    end = max(i for i, (name, depth, _) in enumerate(entries) if depth == 0 and name == module)
+    start = end
+    while start > 0 and entries[start - 1][1] > 0:
+        start -= 1
+    return entries[start:end + 1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the import-time budget of ainiee_cli")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum cumulative import time")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest direct imports to print")
+    args = parser.parse_args()
+
+    entries = measure_imports("ainiee_cli")
+    total_ms = entries[-1][2] / 1000
+    direct = [(name, us) for name, depth, us in entries if depth == 1]
+    forbidden = [prefix for prefix in FORBIDDEN_PREFIXES if any(name.startswith(prefix) for name, _, _ in entries)]
+
+    print(f"total: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in sorted(direct, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if forbidden:
+        print("FAIL: modules imported eagerly that must stay lazy:")
+        for name in forbidden:
+            print(f"  {name}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
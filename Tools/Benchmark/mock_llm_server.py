@@ -0,0 +1,330 @@
+# Tools/Benchmark/mock_llm_server.py
+"""
+Local OpenAI/Anthropic-compatible mock LLM server for offline benchmarks.
+
+Answers POST .../chat/completions (OpenAI, streaming and non-streaming) and
+POST .../messages (Anthropic). The "translation" is the last <textarea> of the
+request echoed back line by line with a marker, so the numbered-line format
+that ResponseExtractor expects is preserved.
+
+Behaviour is controlled by MockBehavior:
+    latency_ms / jitter_ms    time to first byte
+    tokens_per_second         output speed (0 = send everything at once)
+    error_rate                share of requests answered with HTTP 500
+    rate_limit_rate           share of requests answered with HTTP 429 + retry-after
+
+Can also be started on its own:
+    python Tools/Benchmark/mock_llm_server.py --port 8765 --latency-ms 500 --rate-limit-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+TRANSLATED_MARKER = "【译】"
+
+_TEXTAREA_PATTERN = re.compile(r"<textarea>\n?(.*?)\n?</textarea>", re.DOTALL)
+# "1.原文" 单行条目与多行块中的 "1.2.,子行"；"1.[" 与 "]" 等结构行原样返回
+_LINE_PATTERN = re.compile(r"^(\d+\.)(?!\[)(.*)$")
+_SUBLINE_PATTERN = re.compile(r'^("\d+\.\d+\.,)(.*)$')
+
+
+@dataclass
+class MockBehavior:
+    latency_ms: float = 300.0
+    jitter_ms: float = 100.0
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    seed: Optional[int] = None
+
+
+class MockStats:
+    """Server-side counters, read by the benchmark after a run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.status_counts = {}
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+    def record(self, status: int, prompt_tokens: int = 0, completion_tokens: int = 0):
+        with self._lock:
+            self.requests += 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "status_counts": {str(k): v for k, v in sorted(self.status_counts.items())},
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count; only used for usage fields and output pacing."""
+    return max(1, len(text) // 2)
+
+
+def build_translation(messages: list) -> str:
+    """Echo the last <textarea> of the last user message as a fake translation."""
+    content = ""
+    for message in reversed(messages or []):
+        if message.get("role") == "user":
+            content = message.get("content")
+            if isinstance(content, list):
+                # Anthropic/OpenAI 多段内容
+                content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+            break
+
+    matches = _TEXTAREA_PATTERN.findall(content or "")
+    if not matches:
+        return f"<textarea>\n1.{TRANSLATED_MARKER}\n</textarea>"
+
+    lines = []
+    for line in matches[-1].split("\n"):
+        match = _LINE_PATTERN.match(line) or _SUBLINE_PATTERN.match(line)
+        lines.append(f"{match.group(1)}{TRANSLATED_MARKER}{match.group(2)}" if match else line)
+    return "<textarea>\n" + "\n".join(lines) + "\n</textarea>"
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockLLMServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock-model", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid json", "type": "invalid_request_error"}})
+            return
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/chat/completions"):
+            api_format = "openai"
+        elif path.endswith("/messages"):
+            api_format = "anthropic"
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {path}", "type": "invalid_request_error"}})
+            return
+
+        behavior = self.server.behavior
+        rng = self.server.rng()
+        latency = max(0.0, behavior.latency_ms + rng.uniform(-behavior.jitter_ms, behavior.jitter_ms)) / 1000
+        roll = rng.random()
+        time.sleep(latency)
+
+        if roll < behavior.rate_limit_rate:
+            self._send_rate_limited(api_format)
+            return
+        if roll < behavior.rate_limit_rate + behavior.error_rate:
+            self._send_server_error(api_format)
+            return
+
+        messages = list(body.get("messages") or [])
+        text = build_translation(messages)
+        prompt_tokens = estimate_tokens(json.dumps(messages, ensure_ascii=False) + str(body.get("system", "")))
+        completion_tokens = estimate_tokens(text)
+        self.server.stats.record(200, prompt_tokens, completion_tokens)
+
+        if api_format == "openai" and body.get("stream"):
+            self._stream_openai(body, text, prompt_tokens, completion_tokens)
+            return
+
+        self._pace(completion_tokens)
+        if api_format == "openai":
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock-model"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            })
+        else:
+            self._send_json(200, {
+                "id": f"msg_{uuid.uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", "mock-model"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+            })
+
+    # --- responses ---
+
+    def _pace(self, tokens: int):
+        tps = self.server.behavior.tokens_per_second
+        if tps > 0:
+            time.sleep(tokens / tps)
+
+    def _send_rate_limited(self, api_format: str):
+        retry_after = self.server.behavior.retry_after_seconds
+        self.server.stats.record(429)
+        if api_format == "openai":
+            payload = {"error": {"message": "Rate limit reached for requests", "type": "requests",
+                                 "code": "rate_limit_exceeded"}}
+        else:
+            payload = {"type": "error", "error": {"type": "rate_limit_error",
+                                                  "message": "Number of requests has exceeded your rate limit"}}
+        self._send_json(429, payload, headers=[
+            ("retry-after", f"{retry_after:g}"),
+            ("x-ratelimit-remaining-requests", "0"),
+            ("x-ratelimit-reset-requests", f"{retry_after:g}s"),
+        ])
+
+    def _send_server_error(self, api_format: str):
+        self.server.stats.record(500)
+        if api_format == "openai":
+            payload = {"error": {"message": "The server had an error while processing your request.",
+                                 "type": "server_error"}}
+        else:
+            payload = {"type": "error", "error": {"type": "api_error", "message": "Internal server error"}}
+        self._send_json(500, payload)
+
+    def _send_json(self, status: int, payload: dict, headers: List[Tuple[str, str]] = ()):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_openai(self, body: dict, text: str, prompt_tokens: int, completion_tokens: int):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": body.get("model", "mock-model")}
+        # 按行切分输出，tokens_per_second 控制每段之间的间隔
+        pieces = text.splitlines(keepends=True) or [text]
+        for piece in pieces:
+            self._pace(estimate_tokens(piece))
+            chunk = {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+
+        final = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                 "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                           "total_tokens": prompt_tokens + completion_tokens}}
+        self._write_chunk(f"data: {json.dumps(final, ensure_ascii=False)}\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """Threaded mock server; `behavior` may be replaced between runs."""
+
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, behavior: Optional[MockBehavior] = None):
+        super().__init__((host, port), _MockHandler)
+        self.behavior = behavior or MockBehavior()
+        self.stats = MockStats()
+        self._rng_lock = threading.Lock()
+        self._rng = random.Random(self.behavior.seed)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rng(self) -> random.Random:
+        # 每个请求取一个子随机数生成器，固定 seed 时结果可复现
+        with self._rng_lock:
+            return random.Random(self._rng.random())
+
+    def set_behavior(self, behavior: MockBehavior):
+        self.behavior = behavior
+        with self._rng_lock:
+            self._rng = random.Random(behavior.seed)
+        self.stats.reset()
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="mock_llm_server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock LLM server for TranslateFlow benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=MockBehavior.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=MockBehavior.jitter_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=MockBehavior.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=MockBehavior.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=MockBehavior.rate_limit_rate)
+    parser.add_argument("--retry-after", type=float, default=MockBehavior.retry_after_seconds)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    behavior = MockBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+    server = MockLLMServer(args.host, args.port, behavior)
+    print(f"Mock LLM server listening on {server.base_url} ({asdict(behavior)})")
+    print(f"  OpenAI:    {server.base_url}/v1/chat/completions")
+    print(f"  Anthropic: {server.base_url}/v1/messages")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats.snapshot()))
+
+
+if __name__ == "__main__":
+    main()
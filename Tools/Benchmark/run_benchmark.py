@@ -0,0 +1,651 @@
+# Tools/Benchmark/run_benchmark.py
+"""
+End-to-end throughput benchmark for TaskExecutor, fully offline.
+
+Starts the local mock LLM server, writes synthetic TXT/JSON/EPUB projects and
+runs one translation per (format, mode) scenario. Each scenario runs in its
+own process so peak RSS and the module-level singletons are not shared
+between runs. The task config lives in a temporary config.json; the user's
+profiles are never read or written.
+
+Reported per scenario:
+    lines/s          translated lines / (first request start .. last request end)
+    p50 / p99        client-side request latency, retries included
+    peak RSS         of the scenario process
+    cache save       number, total and max time of CacheManager.save_to_file
+    HTTP statuses    as seen by the mock server
+    metrics % (est.) estimated cost of the stage metrics (StageMetrics): recorded timers and
+                     counter increments x the cost of one call, relative to wall time
+    metrics cost %   measured with --metrics-ab: each scenario runs again with StageMetrics
+                     turned into no-ops, reported as the lines/s lost with metrics on
+
+Examples:
+    python Tools/Benchmark/run_benchmark.py
+    python Tools/Benchmark/run_benchmark.py --formats txt,epub --modes async --lines 5000 --threads 64
+    python Tools/Benchmark/run_benchmark.py --rate-limit-rate 0.05 --save baseline.json
+    python Tools/Benchmark/run_benchmark.py --baseline baseline.json --fail-on-regression
+    python Tools/Benchmark/run_benchmark.py --formats txt --metrics-ab --latency-ms 0 --lines 20000
+"""
+
+import argparse
+import copy
+import functools
+import itertools
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from Tools.Benchmark.mock_llm_server import MockBehavior, MockLLMServer
+from Tools.Benchmark.synthetic_projects import PROJECT_WRITERS, create_project
+
+BENCHMARK_PLATFORM = "custom_platform_benchmark"
+BENCHMARK_PROFILE = "__benchmark__"  # 不存在的 Profile，保证只读写临时 config.json
+MODES = ("thread", "async")
+
+# 与基线对比时检查的指标：(字段, 数值越大越好)
+COMPARED_METRICS = (
+    ("lines_per_second", True),
+    ("latency_p50_ms", False),
+    ("latency_p99_ms", False),
+    ("peak_rss_mb", False),
+    ("cache_save_total_ms", False),
+)
+
+
+# --- Measurements ---
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 以 KB 为单位，macOS 以字节为单位
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+def install_stage_metrics(enabled: bool) -> Callable[[], int]:
+    """
+    Count the real StageMetrics.inc calls, or turn every StageMetrics call into a no-op
+    for the metrics-off run of --metrics-ab. Returns a function giving the inc call count,
+    to be read once after the run.
+    """
+    from ModuleFolders.Infrastructure.Metrics.StageMetrics import get_stage_metrics
+
+    metrics = get_stage_metrics()
+    if not enabled:
+        null_timer = _NullTimer()
+        metrics.timer = lambda stage: null_timer
+        metrics.observe = lambda stage, seconds: None
+        metrics.inc = lambda name, value=1, **labels: None
+        return lambda: 0
+
+    # next() on itertools.count is atomic, the calls come from many worker threads
+    calls = itertools.count()
+    inc = metrics.inc
+
+    def counted_inc(name, value=1, **labels):
+        next(calls)
+        inc(name, value, **labels)
+
+    metrics.inc = counted_inc
+    return lambda: next(calls)
+
+
+def stage_metrics_overhead(wall_seconds: float, increments: int, samples: int = 20000) -> dict:
+    """Estimate the stage metrics cost: recorded timers and increments x measured cost per call."""
+    from ModuleFolders.Infrastructure.Metrics.StageMetrics import StageMetrics, get_stage_metrics
+
+    snapshot = get_stage_metrics().snapshot()
+    observations = sum(data["count"] for data in snapshot["histograms"].values())
+
+    probe = StageMetrics()
+    start = time.perf_counter()
+    for _ in range(samples):
+        with probe.timer("probe"):
+            pass
+    timer_cost = (time.perf_counter() - start) / samples
+    start = time.perf_counter()
+    for _ in range(samples):
+        probe.inc("probe_total", result="probe")
+    inc_cost = (time.perf_counter() - start) / samples
+
+    # 单线程无竞争下测得的单次开销，只是估算
+    overhead = observations * timer_cost + increments * inc_cost
+    return {
+        "stage_observations": observations,
+        "stage_increments": increments,
+        "metrics_overhead_pct": round(overhead / wall_seconds * 100, 3) if wall_seconds > 0 else 0.0,
+    }
+
+
+class RunRecorder:
+    """Times requests, cache saves and output writing by wrapping their entry points."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = []  # (start, end, failed)
+        self.cache_saves = []  # 秒
+        self.output_seconds = 0.0
+
+    def install(self):
+        from ModuleFolders.Domain.FileOutputer.FileOutputer import FileOutputer
+        from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
+        from ModuleFolders.Infrastructure.LLMRequester.AsyncLLMRequester import AsyncLLMRequester
+        from ModuleFolders.Infrastructure.LLMRequester.LLMRequester import LLMRequester
+
+        recorder = self
+
+        def timed_request(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                recorder._add_request(start, result)
+                return result
+            return wrapper
+
+        def timed_request_async(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                result = await func(*args, **kwargs)
+                recorder._add_request(start, result)
+                return result
+            return wrapper
+
+        def timed_save(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    with recorder._lock:
+                        recorder.cache_saves.append(time.perf_counter() - start)
+            return wrapper
+
+        def timed_output(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    recorder.output_seconds += time.perf_counter() - start
+            return wrapper
+
+        LLMRequester.sent_request = timed_request(LLMRequester.sent_request)
+        AsyncLLMRequester.send_request_async = timed_request_async(AsyncLLMRequester.send_request_async)
+        CacheManager.save_to_file = timed_save(CacheManager.save_to_file)
+        FileOutputer.output_translated_content = timed_output(FileOutputer.output_translated_content)
+        return self
+
+    def _add_request(self, start: float, result):
+        failed = bool(result and result[0])
+        with self._lock:
+            self.requests.append((start, time.perf_counter(), failed))
+
+    def summary(self) -> dict:
+        with self._lock:
+            requests = list(self.requests)
+            saves = list(self.cache_saves)
+        latencies = [(end - start) * 1000 for start, end, _ in requests]
+        phase = (max(end for _, end, _ in requests) - min(start for start, _, _ in requests)) if requests else 0.0
+        return {
+            "requests": len(requests),
+            "failed_requests": sum(1 for *_, failed in requests if failed),
+            "translate_seconds": round(phase, 3),
+            "latency_p50_ms": round(percentile(latencies, 50), 1),
+            "latency_p99_ms": round(percentile(latencies, 99), 1),
+            "cache_saves": len(saves),
+            "cache_save_total_ms": round(sum(saves) * 1000, 1),
+            "cache_save_max_ms": round(max(saves, default=0.0) * 1000, 1),
+            "output_seconds": round(self.output_seconds, 3),
+        }
+
+
+# --- Scenario process ---
+
+def build_task_config(spec: dict) -> dict:
+    """Default config pointed at the mock server; nothing is taken from the user's profile."""
+    from ModuleFolders.Infrastructure.TaskConfig.default_config import DEFAULT_CONFIG
+
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    platform = copy.deepcopy(config["platforms"]["custom"])
+    platform.update({
+        "tag": BENCHMARK_PLATFORM,
+        "name": "Benchmark Mock",
+        "api_url": spec["api_url"],
+        "api_key": ",".join(spec["api_keys"]),
+        "api_format": "Anthropic" if spec["api_format"] == "anthropic" else "OpenAI",
+        "model": "mock-model",
+        "rpm_limit": 1000000,
+        "tpm_limit": 1000000000,
+        "auto_complete": True,
+    })
+    config["platforms"][BENCHMARK_PLATFORM] = platform
+    config.update({
+        "active_profile": BENCHMARK_PROFILE,
+        "target_platform": BENCHMARK_PLATFORM,
+        "api_settings": {"translate": BENCHMARK_PLATFORM, "polish": BENCHMARK_PLATFORM},
+        "base_url": spec["api_url"],
+        "api_key": "",
+        "model": "mock-model",
+        "user_thread_counts": spec["threads"],
+        "enable_async_mode": spec["mode"] == "async",
+        "enable_stream_api": spec["stream"],
+        "tokens_limit_switch": False,
+        "lines_limit": spec["lines_per_request"],
+        "label_input_path": spec["input_path"],
+        "label_output_path": spec["output_path"],
+        "translation_project": spec["project_type"],
+        "source_language": "japanese",
+        "target_language": "chinese_simplified",
+        "auto_set_output_path": False,
+        "enable_rate_limit": False,
+        "enable_response_cache": spec.get("response_cache", False),
+    })
+    return config
+
+
+def run_scenario(spec: dict) -> dict:
+    """Run one translation in this process and return its measurements."""
+    os.chdir(PROJECT_ROOT)
+
+    from ModuleFolders.Base.Base import Base
+    # 所有配置读写都落在临时目录
+    Base.CONFIG_PATH = os.path.join(spec["workdir"], "config.json")
+    config = build_task_config(spec)
+    with open(Base.CONFIG_PATH, "w", encoding="utf-8") as writer:
+        json.dump(config, writer, ensure_ascii=False, indent=4)
+
+    import ModuleFolders.Domain.FileReader.ReaderUtil as ReaderUtilModule
+    import ModuleFolders.Infrastructure.LLMRequester.ResponseCache as ResponseCacheModule
+    import ModuleFolders.Infrastructure.Tokener.TiktokenLoader as TiktokenLoaderModule
+    from ModuleFolders.Base.EventManager import EventManager
+    from ModuleFolders.Base.PluginManager import PluginManager
+    from ModuleFolders.Domain.FileOutputer.FileOutputer import FileOutputer
+    from ModuleFolders.Domain.FileReader.FileReader import FileReader
+    from ModuleFolders.Infrastructure.Cache.CacheItem import TranslationStatus
+    from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
+    from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
+    from ModuleFolders.Service.TaskExecutor.TaskExecutor import TaskExecutor
+
+    # 响应缓存由同一次运行的全部场景共用，后面的场景可以命中前面保存的回复
+    ResponseCacheModule.CACHE_PATH = spec["response_cache_path"]
+    TiktokenLoaderModule._SUPPRESS_OUTPUT = True
+    ReaderUtilModule._SUPPRESS_OUTPUT = True
+    try:
+        TiktokenLoaderModule.initialize_tiktoken()
+    except Exception:
+        pass
+
+    recorder = RunRecorder().install()
+    stage_metrics_enabled = spec.get("stage_metrics", True)
+    increment_count = install_stage_metrics(stage_metrics_enabled)
+
+    plugin_manager = PluginManager()
+    plugin_manager.load_plugins_from_directory(os.path.join(PROJECT_ROOT, "PluginScripts"))
+    file_reader, file_outputer, cache_manager = FileReader(), FileOutputer(), CacheManager()
+    executor = TaskExecutor(plugin_manager, cache_manager, file_reader, file_outputer)
+    executor.config.load_config_from_dict(config)
+
+    wall_start = time.perf_counter()
+    project = file_reader.read_files(spec["project_type"], spec["input_path"], "")
+    cache_manager.load_from_project(project)
+    read_seconds = time.perf_counter() - wall_start
+
+    finished = threading.Event()
+    completed = []
+
+    def on_complete(event, data):
+        completed.append(True)
+        finished.set()
+
+    def on_stop_done(event, data):
+        finished.set()
+
+    events = EventManager.get_singleton()
+    events.subscribe(Base.EVENT.TASK_COMPLETED, on_complete)
+    events.subscribe(Base.EVENT.TASK_STOP_DONE, on_stop_done)
+
+    Base.work_status = Base.STATUS.IDLE
+    events.emit(Base.EVENT.TASK_START, {
+        "continue_status": False,
+        "current_mode": TaskType.TRANSLATION,
+        "session_input_path": spec["input_path"],
+        "session_output_path": spec["output_path"],
+    })
+    timed_out = not finished.wait(spec["timeout"])
+    wall_seconds = time.perf_counter() - wall_start
+    if timed_out:
+        Base.work_status = Base.STATUS.STOPING
+    events.emit(Base.EVENT.APP_SHUT_DOWN, {})
+
+    total_lines = cache_manager.get_item_count()
+    translated = cache_manager.get_item_count_by_status(TranslationStatus.TRANSLATED)
+    result = {
+        "format": spec["format"],
+        "mode": spec["mode"],
+        "completed": bool(completed) and not timed_out,
+        "total_lines": total_lines,
+        "translated_lines": translated,
+        "read_seconds": round(read_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    result.update(recorder.summary())
+    result["stage_metrics"] = stage_metrics_enabled
+    if stage_metrics_enabled:
+        result.update(stage_metrics_overhead(wall_seconds, increment_count()))
+    phase = result["translate_seconds"]
+    result["lines_per_second"] = round(translated / phase, 1) if phase > 0 else 0.0
+    return result
+
+
+def child_main(spec_path: str) -> int:
+    with open(spec_path, "r", encoding="utf-8") as reader:
+        spec = json.load(reader)
+    try:
+        result = run_scenario(spec)
+    except BaseException as e:
+        import traceback
+        traceback.print_exc()
+        result = {"format": spec["format"], "mode": spec["mode"], "completed": False, "error": str(e)}
+    with open(spec["result_path"], "w", encoding="utf-8") as writer:
+        json.dump(result, writer, ensure_ascii=False, indent=4)
+    sys.stdout.flush()
+    # TaskExecutor 的工作线程不是守护线程，直接退出进程
+    os._exit(0 if result.get("completed") else 1)
+
+
+# --- Driver ---
+
+def scenario_key(result: dict) -> str:
+    return f"{result['format']}/{result['mode']}"
+
+
+def behavior_from_args(args) -> MockBehavior:
+    return MockBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def run_all(args) -> List[dict]:
+    workdir = tempfile.mkdtemp(prefix="translateflow_bench_")
+    behavior = behavior_from_args(args)
+    server = MockLLMServer(behavior=behavior).start()
+    api_url = f"{server.base_url}/v1" if args.api_format == "openai" else server.base_url
+    print(f"Mock server: {server.base_url}  workdir: {workdir}")
+
+    results = []
+    try:
+        for fmt in args.formats:
+            input_path, project_type = create_project(workdir, fmt, args.lines, args.files, args.seed or 0)
+            for mode in args.modes:
+                name = f"{fmt}_{mode}"
+                scenario_dir = os.path.join(workdir, name)
+                os.makedirs(scenario_dir, exist_ok=True)
+                spec = {
+                    "format": fmt,
+                    "mode": mode,
+                    "workdir": scenario_dir,
+                    "input_path": input_path,
+                    "output_path": os.path.join(scenario_dir, "output"),
+                    "result_path": os.path.join(scenario_dir, "result.json"),
+                    "project_type": project_type,
+                    "api_url": api_url,
+                    "api_format": args.api_format,
+                    "api_keys": [f"bench-key-{i}" for i in range(max(1, args.api_keys))],
+                    "threads": args.threads,
+                    "lines_per_request": args.lines_per_request,
+                    "stream": args.stream,
+                    "timeout": args.timeout,
+                    "response_cache": args.response_cache,
+                    "response_cache_path": os.path.join(workdir, "llm_cache", "responses.db"),
+                }
+                server.set_behavior(behavior)
+                print(f"Running {fmt}/{mode} ...", flush=True)
+                result = run_child(spec, args)
+                result["server"] = server.stats.snapshot()
+
+                if args.metrics_ab and result.get("completed"):
+                    off_dir = f"{scenario_dir}_no_metrics"
+                    os.makedirs(off_dir, exist_ok=True)
+                    off_spec = {
+                        **spec,
+                        "workdir": off_dir,
+                        "output_path": os.path.join(off_dir, "output"),
+                        "result_path": os.path.join(off_dir, "result.json"),
+                        "stage_metrics": False,
+                    }
+                    server.set_behavior(behavior)
+                    print(f"Running {fmt}/{mode} with stage metrics off ...", flush=True)
+                    off_result = run_child(off_spec, args)
+                    result.update(metrics_ab_summary(result, off_result))
+                results.append(result)
+    finally:
+        server.stop()
+        if args.keep_workdir:
+            print(f"Kept workdir: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def run_child(spec: dict, args) -> dict:
+    """Run one scenario in a child process and return its result."""
+    spec_path = os.path.join(spec["workdir"], "spec.json")
+    with open(spec_path, "w", encoding="utf-8") as writer:
+        json.dump(spec, writer, ensure_ascii=False, indent=4)
+
+    log_path = os.path.join(spec["workdir"], "run.log")
+    with open(log_path, "w", encoding="utf-8") as log:
+        try:
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", spec_path],
+                cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT,
+                env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+                timeout=args.timeout + 60,
+            )
+        except subprocess.TimeoutExpired:
+            pass
+
+    if os.path.exists(spec["result_path"]):
+        with open(spec["result_path"], "r", encoding="utf-8") as reader:
+            return json.load(reader)
+    return {"format": spec["format"], "mode": spec["mode"], "completed": False, "error": f"no result, see {log_path}"}
+
+
+def metrics_ab_summary(on_result: dict, off_result: dict) -> dict:
+    """Throughput with stage metrics on vs. off; positive cost means metrics on was slower."""
+    if not off_result.get("completed"):
+        return {"metrics_off_error": off_result.get("error", "incomplete")}
+    on_rate, off_rate = on_result["lines_per_second"], off_result["lines_per_second"]
+    return {
+        "metrics_off_lines_per_second": off_rate,
+        "metrics_off_wall_seconds": off_result["wall_seconds"],
+        "metrics_cost_pct": round((off_rate - on_rate) / off_rate * 100, 2) if off_rate > 0 else 0.0,
+    }
+
+
+def print_results(results: List[dict], baseline: Optional[Dict[str, dict]] = None):
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="TranslateFlow throughput benchmark")
+    for column in ("scenario", "lines", "lines/s", "p50 ms", "p99 ms", "requests",
+                   "peak RSS MB", "cache saves", "cache ms (max)", "metrics % (est.)", "metrics cost %", "HTTP"):
+        table.add_column(column, justify="right" if column != "scenario" else "left")
+
+    for result in results:
+        if "error" in result or not result.get("completed"):
+            table.add_row(scenario_key(result), "[red]failed[/red]", result.get("error", "incomplete"))
+            continue
+        statuses = " ".join(f"{k}:{v}" for k, v in result["server"]["status_counts"].items())
+        table.add_row(
+            scenario_key(result),
+            f"{result['translated_lines']}/{result['total_lines']}",
+            _with_delta(result, baseline, "lines_per_second"),
+            _with_delta(result, baseline, "latency_p50_ms"),
+            _with_delta(result, baseline, "latency_p99_ms"),
+            f"{result['requests']} ({result['failed_requests']} failed)",
+            _with_delta(result, baseline, "peak_rss_mb"),
+            str(result["cache_saves"]),
+            f"{result['cache_save_total_ms']} ({result['cache_save_max_ms']})",
+            str(result.get("metrics_overhead_pct", "-")),
+            str(result.get("metrics_cost_pct", "-")),
+            statuses,
+        )
+    Console().print(table)
+
+
+def _with_delta(result: dict, baseline: Optional[Dict[str, dict]], field: str) -> str:
+    value = result.get(field, 0)
+    previous = (baseline or {}).get(scenario_key(result), {}).get(field)
+    if not previous:
+        return f"{value}"
+    change = (value - previous) / previous * 100
+    return f"{value} ({change:+.1f}%)"
+
+
+def find_regressions(results: List[dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    regressions = []
+    for result in results:
+        previous = baseline.get(scenario_key(result))
+        if previous is None:
+            continue
+        if not result.get("completed"):
+            regressions.append(f"{scenario_key(result)}: did not complete")
+            continue
+        for field, higher_is_better in COMPARED_METRICS:
+            old, new = previous.get(field), result.get(field)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{scenario_key(result)}: {field} {old} -> {new} ({change * 100:+.1f}%)")
+    return regressions
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Offline end-to-end throughput benchmark for TaskExecutor")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+
+    workload = parser.add_argument_group("workload")
+    workload.add_argument("--formats", default="txt,json,epub", help=f"Comma separated, from {','.join(PROJECT_WRITERS)}")
+    workload.add_argument("--modes", default=",".join(MODES), help="Comma separated: thread,async")
+    workload.add_argument("--lines", type=int, default=2000, help="Translatable segments per project")
+    workload.add_argument("--files", type=int, default=4, help="Files (chapters) per project")
+    workload.add_argument("--lines-per-request", type=int, default=20)
+    workload.add_argument("--threads", type=int, default=32, help="user_thread_counts for the run")
+    workload.add_argument("--api-format", choices=("openai", "anthropic"), default="openai")
+    workload.add_argument("--api-keys", type=int, default=1, help="Number of API keys to rotate")
+    workload.add_argument("--no-stream", dest="stream", action="store_false", help="Disable streaming responses")
+    workload.add_argument("--timeout", type=int, default=600, help="Seconds before a scenario is stopped")
+    workload.add_argument("--response-cache", action="store_true",
+                          help="Enable the LLM response cache; later scenarios reuse replies from earlier ones")
+
+    server = parser.add_argument_group("mock server")
+    server.add_argument("--latency-ms", type=float, default=MockBehavior.latency_ms)
+    server.add_argument("--jitter-ms", type=float, default=MockBehavior.jitter_ms)
+    server.add_argument("--tokens-per-second", type=float, default=MockBehavior.tokens_per_second,
+                        help="Output speed per request, 0 sends the whole reply at once")
+    server.add_argument("--error-rate", type=float, default=MockBehavior.error_rate, help="Share of HTTP 500 replies")
+    server.add_argument("--rate-limit-rate", type=float, default=MockBehavior.rate_limit_rate, help="Share of HTTP 429 replies")
+    server.add_argument("--retry-after", type=float, default=MockBehavior.retry_after_seconds)
+    server.add_argument("--seed", type=int, default=0)
+
+    report = parser.add_argument_group("report")
+    report.add_argument("--metrics-ab", action="store_true",
+                        help="Run every scenario again with StageMetrics as no-ops and report the measured cost")
+    report.add_argument("--save", help="Write the results to this JSON file (usable as --baseline)")
+    report.add_argument("--baseline", help="Compare against results saved with --save")
+    report.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression (default 0.10)")
+    report.add_argument("--fail-on-regression", action="store_true", help="Exit with code 1 when a metric regresses")
+    report.add_argument("--keep-workdir", action="store_true", help="Keep generated projects, outputs and logs")
+    return parser
+
+
+def main() -> int:
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    if args.child:
+        return child_main(args.child)
+
+    args.formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    args.modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [fmt for fmt in args.formats if fmt not in PROJECT_WRITERS] + [m for m in args.modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown format/mode: {', '.join(unknown)}")
+    if args.metrics_ab and args.response_cache:
+        # 第二次运行会命中第一次保存的回复，两次吞吐量不可比
+        parser.error("--metrics-ab cannot be combined with --response-cache")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as reader:
+            baseline = {scenario_key(result): result for result in json.load(reader)["results"]}
+
+    results = run_all(args)
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as writer:
+            json.dump({
+                "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "settings": {key: value for key, value in vars(args).items() if key != "child"},
+                "mock_server": asdict(behavior_from_args(args)),
+                "results": results,
+            }, writer, ensure_ascii=False, indent=4)
+        print(f"Results saved to {args.save}")
+
+    failed = [scenario_key(result) for result in results if not result.get("completed")]
+    regressions = find_regressions(results, baseline, args.tolerance) if baseline else []
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if failed:
+        print(f"Incomplete scenarios: {', '.join(failed)}")
+    return 1 if failed or (regressions and args.fail_on_regression) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
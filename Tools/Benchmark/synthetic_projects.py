@@ -0,0 +1,137 @@
+# Tools/Benchmark/synthetic_projects.py
+"""
+Deterministic synthetic projects for the throughput benchmark.
+
+Each generator writes `lines` translatable segments spread over `files`
+files into a fresh directory and returns the project type that FileReader
+should use for it:
+
+    txt   -> Txt   (plain text, one segment per line)
+    json  -> Mtool (MTool style {"source": "source"} dictionary)
+    epub  -> Epub  (EPUB 2 with one XHTML chapter per file and a toc.ncx)
+"""
+
+import json
+import os
+import random
+import zipfile
+from typing import Callable, Dict, List, Tuple
+
+_SUBJECTS = ["彼女は", "俺は", "先生が", "猫が", "王女様は", "その男は", "みんなで", "少年は"]
+_PLACES = ["学校で", "駅の前で", "森の奥で", "城の中で", "海辺で", "図書館で", "夜の街で", "部屋の隅で"]
+_OBJECTS = ["古い手紙を", "魔法の剣を", "温かいお茶を", "小さな鍵を", "秘密の地図を", "赤い花を"]
+_VERBS = ["見つけた。", "静かに読んだ。", "大切に持っていた。", "誰にも渡さなかった。", "じっと見つめていた。"]
+_TAILS = ["", "「本当に？」と彼は聞いた。", "空はもう暗くなっていた。", "風が少し冷たかった。"]
+
+
+def synthetic_lines(count: int, seed: int = 0) -> List[str]:
+    """Generate `count` unique Japanese-looking sentences."""
+    rng = random.Random(seed)
+    lines = []
+    for index in range(count):
+        sentence = (rng.choice(_SUBJECTS) + rng.choice(_PLACES) + rng.choice(_OBJECTS)
+                    + rng.choice(_VERBS) + rng.choice(_TAILS))
+        # 序号保证每行唯一，避免缓存/去重逻辑让不同格式的结果不可比
+        lines.append(f"{sentence}（{index + 1}）")
+    return lines
+
+
+def _split(lines: List[str], files: int) -> List[List[str]]:
+    files = max(1, min(files, len(lines) or 1))
+    size = -(-len(lines) // files)
+    return [lines[i:i + size] for i in range(0, len(lines), size)] or [[]]
+
+
+def write_txt_project(directory: str, lines: List[str], files: int) -> str:
+    for index, chunk in enumerate(_split(lines, files), 1):
+        with open(os.path.join(directory, f"chapter_{index:03d}.txt"), "w", encoding="utf-8") as writer:
+            writer.write("\n".join(chunk) + "\n")
+    return "Txt"
+
+
+def write_json_project(directory: str, lines: List[str], files: int) -> str:
+    for index, chunk in enumerate(_split(lines, files), 1):
+        with open(os.path.join(directory, f"mtool_{index:03d}.json"), "w", encoding="utf-8") as writer:
+            json.dump({line: line for line in chunk}, writer, ensure_ascii=False, indent=4)
+    return "Mtool"
+
+
+def write_epub_project(directory: str, lines: List[str], files: int) -> str:
+    chapters = _split(lines, files)
+    with zipfile.ZipFile(os.path.join(directory, "book.epub"), "w") as book:
+        # mimetype 必须是第一个且不压缩
+        book.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        book.writestr("META-INF/container.xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+            '  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>\n'
+            '</container>\n'
+        ), compress_type=zipfile.ZIP_DEFLATED)
+
+        manifest, spine, nav_points = [], [], []
+        for index, chunk in enumerate(chapters, 1):
+            name = f"chapter_{index:03d}.xhtml"
+            title = f"第{index}章"
+            paragraphs = "\n".join(f"    <p>{line}</p>" for line in chunk)
+            book.writestr(f"OEBPS/{name}", (
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="ja">\n'
+                f'  <head><title>{title}</title></head>\n'
+                f'  <body>\n    <h1>{title}</h1>\n{paragraphs}\n  </body>\n'
+                '</html>\n'
+            ), compress_type=zipfile.ZIP_DEFLATED)
+            manifest.append(f'    <item id="chapter{index}" href="{name}" media-type="application/xhtml+xml"/>')
+            spine.append(f'    <itemref idref="chapter{index}"/>')
+            nav_points.append(
+                f'    <navPoint id="nav{index}" playOrder="{index}">'
+                f'<navLabel><text>{title}</text></navLabel><content src="{name}"/></navPoint>'
+            )
+
+        book.writestr("OEBPS/toc.ncx", (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">\n'
+            '  <head><meta name="dtb:uid" content="benchmark-book"/></head>\n'
+            '  <docTitle><text>ベンチマーク</text></docTitle>\n'
+            '  <navMap>\n' + "\n".join(nav_points) + '\n  </navMap>\n'
+            '</ncx>\n'
+        ), compress_type=zipfile.ZIP_DEFLATED)
+        book.writestr("OEBPS/content.opf", (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" unique-identifier="bookid" version="2.0">\n'
+            '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            '    <dc:title>ベンチマーク</dc:title><dc:language>ja</dc:language>\n'
+            '    <dc:identifier id="bookid">benchmark-book</dc:identifier>\n'
+            '  </metadata>\n'
+            '  <manifest>\n'
+            '    <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>\n'
+            + "\n".join(manifest) + '\n  </manifest>\n'
+            '  <spine toc="ncx">\n' + "\n".join(spine) + '\n  </spine>\n'
+            '</package>\n'
+        ), compress_type=zipfile.ZIP_DEFLATED)
+    return "Epub"
+
+
+PROJECT_WRITERS: Dict[str, Callable[[str, List[str], int], str]] = {
+    "txt": write_txt_project,
+    "json": write_json_project,
+    "epub": write_epub_project,
+}
+
+
+def create_project(root: str, fmt: str, lines: int, files: int, seed: int = 0) -> Tuple[str, str]:
+    """
+    Write a synthetic project.
+
+    Args:
+        root: Parent directory, a `<fmt>_input` folder is created in it
+        fmt: One of PROJECT_WRITERS
+        lines: Number of translatable segments
+        files: Number of files the segments are spread over
+
+    Returns:
+        Tuple[str, str]: (input directory, project type for FileReader)
+    """
+    directory = os.path.join(root, f"{fmt}_input")
+    os.makedirs(directory, exist_ok=True)
+    project_type = PROJECT_WRITERS[fmt](directory, synthetic_lines(lines, seed), files)
+    return directory, project_type
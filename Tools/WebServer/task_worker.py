@@ -0,0 +1,343 @@
+# Tools/WebServer/task_worker.py
+"""
+Warm task workers for the web server's TaskManager.
+
+A worker process imports ainiee_cli, builds its CLIMenu (plugins, tokenizer,
+HTTP clients) once and then runs jobs sent over a local authenticated socket
+(multiprocessing.connection). Output and progress come back as typed
+messages instead of being scraped from stdout:
+
+    server -> worker  {"type": "run", "argv": [...], "env": {...}}
+                      {"type": "shutdown"}
+    worker -> server  {"type": "ready", "worker_id": str, "pid": int}
+                      {"type": "log", "message": str}
+                      {"type": "stats", "stats": dict}
+                      {"type": "done", "returncode": int}
+
+WarmWorkerPool keeps the configured number of idle workers started ahead of
+time; a worker that is stopped, crashes or has run max_jobs_per_worker jobs
+is replaced by a fresh one.
+"""
+
+import collections
+import contextlib
+import io
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import threading
+import traceback
+import uuid
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+ENV_ADDRESS = "AINIEE_WORKER_ADDRESS"
+ENV_AUTHKEY = "AINIEE_WORKER_AUTHKEY"
+ENV_WORKER_ID = "AINIEE_WORKER_ID"
+
+
+# --- Worker side ---
+
+class _ChannelStream(io.TextIOBase):
+    """A text stream that forwards every complete line as a log message."""
+
+    encoding = "utf-8"
+
+    def __init__(self, send):
+        super().__init__()
+        self._send = send
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    def write(self, text):
+        with self._lock:
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            line = line.strip()
+            if line:
+                self._send({"type": "log", "message": line})
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            line, self._buffer = self._buffer.strip(), ""
+        if line:
+            self._send({"type": "log", "message": line})
+
+
+def _run_job(cli, parser, job: dict, send) -> int:
+    """Run one job in the warm CLIMenu and return its exit code."""
+    from ainiee_cli import WebLogger
+    from ModuleFolders.Base.Base import Base
+
+    # 上一个任务传入的 API Key 不能带到下一个任务
+    os.environ.pop("AINIEE_API_KEY", None)
+    os.environ.update(job.get("env") or {})
+    stream = _ChannelStream(send)
+    WebLogger.stats_sink = lambda stats: send({"type": "stats", "stats": stats})
+    try:
+        with contextlib.redirect_stdout(stream), contextlib.redirect_stderr(stream):
+            args = parser.parse_args(job["argv"])
+            cli.persist_config = args.save_config
+
+            # 每个任务重新读取配置，Web 端修改的 Profile 与插件开关立即生效
+            cli.load_config()
+            if "plugin_enables" in cli.root_config:
+                cli.plugin_manager.update_plugins_enable(cli.root_config["plugin_enables"])
+            Base.work_status = Base.STATUS.IDLE
+
+            cli.run_non_interactive(args)
+        return 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        stream.write(traceback.format_exc())
+        return 1
+    finally:
+        stream.flush()
+        WebLogger.stats_sink = None
+
+
+def worker_main():
+    """Entry point of a worker process started by WarmWorkerPool."""
+    host, port = os.environ[ENV_ADDRESS].rsplit(":", 1)
+    authkey = bytes.fromhex(os.environ[ENV_AUTHKEY])
+    worker_id = os.environ[ENV_WORKER_ID]
+
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    os.chdir(PROJECT_ROOT)
+
+    conn = Client((host, int(port)), authkey=authkey)
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    # 预热：解释器、插件、分词器与 HTTP 客户端在接收任务前全部就绪
+    from ainiee_cli import CLIMenu, build_arg_parser
+    cli = CLIMenu()
+    cli.task_executor  # 任务组件默认按需加载，常驻进程在此提前加载
+    parser = build_arg_parser()
+    send({"type": "ready", "worker_id": worker_id, "pid": os.getpid()})
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job.get("type") == "shutdown":
+            break
+        if job.get("type") != "run":
+            continue
+        returncode = _run_job(cli, parser, job, send)
+        try:
+            send({"type": "done", "returncode": returncode})
+        except OSError:
+            break
+
+    conn.close()
+
+
+# --- Server side ---
+
+class WarmWorker:
+    """Handle of one worker process owned by WarmWorkerPool."""
+
+    def __init__(self, worker_id: str, process: subprocess.Popen):
+        self.worker_id = worker_id
+        self.process = process
+        self.conn = None
+        self.jobs = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, argv: List[str], env: Optional[Dict[str, str]] = None):
+        """Send a job; progress is read from `conn` by the caller."""
+        self.jobs += 1
+        self.conn.send({"type": "run", "argv": argv, "env": env or {}})
+
+    def kill(self):
+        try:
+            if os.name == "posix":
+                # uv run 会再拉起一个 python 子进程，按进程组整体结束
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, OSError):
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except Exception:
+            pass
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+
+
+class WarmWorkerPool:
+    """Keeps `size` warm worker processes ready to take TaskManager jobs."""
+
+    def __init__(self, command: List[str], size: int = 1, max_jobs_per_worker: int = 20):
+        """
+        Args:
+            command: Command prefix that starts task_worker.py (e.g. ["uv", "run", path])
+            size: Number of idle workers kept ready
+            max_jobs_per_worker: Recycle a worker after this many jobs to bound state leaking between jobs
+        """
+        self.command = command
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._lock = threading.Lock()
+        self._idle: "collections.deque[WarmWorker]" = collections.deque()
+        self._starting: Dict[str, WarmWorker] = {}
+        self._listener: Optional[Listener] = None
+        self._authkey = secrets.token_bytes(32)
+        self._closed = False
+
+    @property
+    def started(self) -> bool:
+        return self._listener is not None
+
+    def start(self):
+        """Open the local socket and pre-fork the workers."""
+        with self._lock:
+            if self._listener is not None or self._closed:
+                return
+            self._listener = Listener(("127.0.0.1", 0), authkey=self._authkey)
+        threading.Thread(target=self._accept_loop, name="warm_worker_accept", daemon=True).start()
+        for _ in range(self.size):
+            self._spawn()
+
+    def acquire(self) -> Optional[WarmWorker]:
+        """Take an idle, warmed-up worker, or None if none is ready yet."""
+        with self._lock:
+            while self._idle:
+                worker = self._idle.popleft()
+                if worker.alive:
+                    return worker
+                self._replace_later(worker)
+        return None
+
+    def release(self, worker: WarmWorker):
+        """Return a worker after its job finished normally."""
+        if not worker.alive or worker.jobs >= self.max_jobs_per_worker:
+            self.discard(worker)
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.kill()
+
+    def discard(self, worker: WarmWorker):
+        """Kill a worker (stopped task, crash or recycle) and start a replacement."""
+        worker.kill()
+        if not self._closed:
+            self._spawn()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._idle) + list(self._starting.values())
+            self._idle.clear()
+            self._starting.clear()
+            listener, self._listener = self._listener, None
+        for worker in workers:
+            worker.kill()
+        if listener is not None:
+            listener.close()
+
+    def _replace_later(self, worker: WarmWorker):
+        threading.Thread(target=self.discard, args=(worker,), daemon=True).start()
+
+    def _spawn(self):
+        with self._lock:
+            if self._closed or self._listener is None:
+                return
+            host, port = self._listener.address
+
+        worker_id = uuid.uuid4().hex
+        env = os.environ.copy()
+        env[ENV_ADDRESS] = f"{host}:{port}"
+        env[ENV_AUTHKEY] = self._authkey.hex()
+        env[ENV_WORKER_ID] = worker_id
+        env["PYTHONIOENCODING"] = "utf-8"
+        env["AINIEE_BACKEND_WORKER"] = "1"
+
+        try:
+            process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                cwd=PROJECT_ROOT,
+                env=env,
+                start_new_session=(os.name == "posix"),
+            )
+        except Exception as e:
+            print(f"[WARM WORKER] Failed to start worker: {e}")
+            return
+
+        worker = WarmWorker(worker_id, process)
+        with self._lock:
+            self._starting[worker_id] = worker
+        threading.Thread(target=self._drain_output, args=(worker,), daemon=True).start()
+
+    def _drain_output(self, worker: WarmWorker):
+        """Output printed outside of a job (startup, crashes) goes to the server console."""
+        for line in iter(worker.process.stdout.readline, ''):
+            line = line.strip()
+            if line:
+                print(f"[WARM WORKER {worker.process.pid}] {line}")
+        with self._lock:
+            self._starting.pop(worker.worker_id, None)
+
+    def _accept_loop(self):
+        while True:
+            listener = self._listener
+            if listener is None:
+                return
+            try:
+                conn = listener.accept()
+            except Exception:
+                if self._closed:
+                    return
+                continue
+            threading.Thread(target=self._handshake, args=(conn,), daemon=True).start()
+
+    def _handshake(self, conn):
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            conn.close()
+            return
+        with self._lock:
+            worker = self._starting.pop(message.get("worker_id"), None)
+            if worker is not None and worker.alive and not self._closed:
+                worker.conn = conn
+                self._idle.append(worker)
+                return
+        conn.close()
+
+
+if __name__ == "__main__":
+    worker_main()
@@ -15,7 +15,7 @@ try:
     import uvicorn
     from fastapi import FastAPI, HTTPException, Body, File, UploadFile, Response, BackgroundTasks, Depends, Header, Request, Query
     from fastapi.staticfiles import StaticFiles
-    from fastapi.responses import FileResponse
+    from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
     from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
     from pydantic import BaseModel
     from typing import Optional
@@ -68,6 +68,10 @@ class TaskManager:
             # Use a separate thread to monitor the process output
             self.monitor_thread: Optional[threading.Thread] = None
 
+            # 常驻预热 Worker 池，AINIEE_WARM_WORKERS=0 时退回每个任务启动独立进程
+            self.warm_pool = None
+            self.worker = None
+
     def _get_initial_stats(self) -> Dict[str, Any]:
         return {
             "rpm": 0, "tpm": 0, "totalProgress": 0, "completedProgress": 0,
@@ -281,6 +285,21 @@ class TaskManager:
             # because ainiee_cli.py doesn't have CLI args for them. They are
             # expected to be part of the loaded profile config.
 
+            # Prefer a warm worker; fall back to a fresh subprocess when none is ready
+            worker = self._acquire_warm_worker()
+            if worker is not None:
+                try:
+                    worker.run(cli_args[3:], env={"AINIEE_INTERNAL_API_URL": self.api_url})
+                    self.worker = worker
+                    self.logs.append({"timestamp": time.time(), "message": f"[DEBUG] Running on warm worker (pid {worker.process.pid})"})
+                    self.monitor_thread = threading.Thread(target=self._worker_monitor, args=(worker,))
+                    self.monitor_thread.daemon = True
+                    self.monitor_thread.start()
+                    return True
+                except Exception as e:
+                    self.logs.append({"timestamp": time.time(), "message": f"[DEBUG] Warm worker unavailable, starting subprocess: {e}"})
+                    self.warm_pool.discard(worker)
+
             try:
                 # Get the system's preferred console encoding (e.g., 'gbk' on Chinese Windows)
                 system_encoding = locale.getpreferredencoding(False)
@@ -317,6 +336,78 @@ class TaskManager:
                 self.logs.append({"timestamp": time.time(), "message": f"Failed to start process: {e}"})
                 return False
 
+    def _warm_worker_count(self) -> int:
+        try:
+            return max(0, int(os.environ.get("AINIEE_WARM_WORKERS", "1")))
+        except ValueError:
+            return 1
+
+    def start_warm_pool(self):
+        """Pre-fork the warm worker pool so the next task skips interpreter and plugin start-up."""
+        if self.warm_pool is None:
+            size = self._warm_worker_count()
+            if size == 0:
+                return
+            from Tools.WebServer.task_worker import WarmWorkerPool
+            worker_script = os.path.join(PROJECT_ROOT, "Tools", "WebServer", "task_worker.py")
+            self.warm_pool = WarmWorkerPool(["uv", "run", worker_script], size=size)
+        self.warm_pool.start()
+
+    def shutdown_warm_pool(self):
+        if self.warm_pool is not None:
+            self.warm_pool.shutdown()
+            self.warm_pool = None
+
+    def _acquire_warm_worker(self):
+        try:
+            self.start_warm_pool()
+        except Exception as e:
+            self.logs.append({"timestamp": time.time(), "message": f"[DEBUG] Warm worker pool unavailable: {e}"})
+            return None
+        return self.warm_pool.acquire() if self.warm_pool else None
+
+    def _worker_monitor(self, worker):
+        """Consumes typed messages from a warm worker until its job is done."""
+        returncode = None
+        while True:
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+
+            msg_type = message.get("type")
+            if msg_type == "log":
+                line = message["message"]
+                self.logs.append({"timestamp": time.time(), "message": line})
+                if "File:" in line:
+                    try: self.stats["currentFile"] = line.split("File:")[1].strip().split("|")[0].strip()
+                    except: pass
+            elif msg_type == "stats":
+                self.stats.update(message["stats"])
+                self.chart_data.append({
+                    "time": time.strftime('%H:%M:%S'),
+                    "rpm": self.stats["rpm"],
+                    "tpm": self.stats["tpm"]
+                })
+            elif msg_type == "done":
+                returncode = message.get("returncode")
+                break
+
+        with self._lock:
+            # stop_task 已接管该 Worker 时不再改写状态
+            owned = self.worker is worker
+            if owned:
+                self.worker = None
+                if self.status == "running":
+                    self.status = "completed" if returncode == 0 else "error"
+                    self.stats["status"] = self.status
+
+        if owned and self.warm_pool is not None:
+            if returncode is None:
+                self.warm_pool.discard(worker)
+            else:
+                self.warm_pool.release(worker)
+
     def _process_monitor(self):
         """Monitors the subprocess, which now provides correctly decoded strings."""
         if self.process and self.process.stdout:
@@ -390,7 +481,7 @@ class TaskManager:
     def stop_task(self):
         """Stops the running task."""
         with self._lock:
-            if self.status != "running" or not self.process:
+            if self.status != "running" or not (self.process or self.worker):
                 return
             
             self.status = "stopping"
@@ -399,8 +490,13 @@ class TaskManager:
             
             try:
                 # Direct force kill as requested (Data safety guaranteed by cache)
-                self.process.kill()
-                self.process.wait(timeout=2)
+                if self.worker is not None:
+                    # The pool replaces the killed worker with a fresh warm one
+                    worker, self.worker = self.worker, None
+                    self.warm_pool.discard(worker)
+                else:
+                    self.process.kill()
+                    self.process.wait(timeout=2)
             except Exception as e:
                 self.logs.append({"timestamp": time.time(), "message": f"Force stop error: {e}"})
             
@@ -884,6 +980,18 @@ def get_client_ip(request):
     return request.client.host if request.client else "unknown"
 
 
+async def get_user_if_authenticated(request: Request) -> Optional[User]:
+    """
+    Resolve the bearer token when one is sent. Anonymous (local) callers get None
+    instead of a 401; an invalid token is still rejected.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    from ModuleFolders.Service.Auth import get_auth_manager
+    return await jwt_middleware.get_current_user(token=token.strip(), auth_manager=get_auth_manager())
+
+
 # --- Auth Routes ---
 
 @app.post("/api/v1/auth/register", response_model=LoginResponse)
@@ -2281,6 +2389,88 @@ async def get_task_status(response: Response):
         }
     }
 
+def _submit_texts(request: Dict[str, Any]):
+    from ModuleFolders.Service.HttpService.TextTranslator import get_text_translator
+    return get_text_translator(get_shared_request_limiter()).submit(
+        request["texts"], request["source_language"], request["target_language"]
+    )
+
+
+def _collect_text_translation(request: Dict[str, Any], user_id: Optional[str] = None, char_count: int = 0):
+    """
+    Translate and wait for all texts. Returns (response, characters translated) for
+    require_quota(report_usage=True); user_id and char_count are read by require_quota.
+    """
+    from ModuleFolders.Service.HttpService.TextTranslator import collect_text_results
+
+    futures = _submit_texts(request)
+    status_code, body = collect_text_results(request["texts"], futures, request["timeout"])
+    translated = sum(
+        len(text) for text, translation in zip(request["texts"], body["translations"]) if translation is not None
+    )
+    return JSONResponse(status_code=status_code, content=body), translated
+
+
+def _stream_text_translation(request: Dict[str, Any], enforcer=None, reservation=None) -> StreamingResponse:
+    """
+    Stream results as NDJSON. A quota reservation is settled once the stream ends (or the
+    client disconnects) with the characters of the texts that were actually translated.
+    """
+    from ModuleFolders.Service.HttpService.TextTranslator import iter_text_results
+
+    futures = _submit_texts(request)
+
+    def lines():
+        translated = 0
+        try:
+            for result in iter_text_results(request["texts"], futures, request["timeout"]):
+                if "translation" in result:
+                    translated += len(result["source"])
+                yield json.dumps(result) + "\n"
+        finally:
+            if reservation is not None:
+                enforcer.commit_or_release(reservation, translated, metadata={"function": "translate_text"})
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/api/translate/text")
+def translate_text(payload: Any = Body(...), user: Optional[User] = Depends(get_user_if_authenticated)):
+    """
+    Translate strings without loading a project; works while a project task is running.
+    Concurrent callers are batched per language pair. With "stream": true the results are
+    returned as NDJSON lines in completion order, followed by a summary line.
+    Authenticated callers reserve the source characters against their daily quota and are
+    charged only for the texts that were translated.
+    """
+    from ModuleFolders.Service.Billing import QuotaExceededError, get_quota_enforcer, require_quota
+    from ModuleFolders.Service.HttpService.TextTranslator import parse_text_request
+
+    try:
+        request = parse_text_request(payload)
+        char_count = sum(len(text) for text in request["texts"])
+        if request["stream"]:
+            if user is None:
+                return _stream_text_translation(request)
+            enforcer = get_quota_enforcer()
+            reservation = enforcer.reserve(str(user.id), char_count, metric_type="characters")
+            try:
+                return _stream_text_translation(request, enforcer, reservation)
+            except BaseException:
+                enforcer.release(reservation)
+                raise
+
+        if user is None:
+            return _collect_text_translation(request)[0]
+        metered = require_quota(metric_type="characters", quantity_param="char_count", report_usage=True)(
+            _collect_text_translation
+        )
+        return metered(request, user_id=str(user.id), char_count=char_count)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QuotaExceededError as e:
+        return JSONResponse(status_code=402, content=e.to_dict())
+
 class InternalComparisonPayload(BaseModel):
     source: str
     translation: str
@@ -2292,6 +2482,29 @@ async def internal_update_comparison(payload: InternalComparisonPayload):
     task_manager.current_translation = payload.translation
     return {"status": "ok"}
 
+class InternalMetricsPayload(BaseModel):
+    source: str
+    snapshot: Dict[str, Any]
+
+# Latest stage metrics snapshot pushed by each worker process, keyed by source
+worker_metrics: Dict[str, Dict[str, Any]] = {}
+
+@app.post("/api/internal/update_metrics")
+async def internal_update_metrics(payload: InternalMetricsPayload):
+    """Internal endpoint for worker processes to push their stage metrics."""
+    worker_metrics[payload.source] = payload.snapshot
+    return {"status": "ok"}
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus scrape endpoint.
+    Stage timings and counters of this process merged with the snapshots pushed by worker processes.
+    """
+    from ModuleFolders.Infrastructure.Metrics.StageMetrics import get_stage_metrics, merge_snapshots, render_prometheus
+    snapshot = merge_snapshots([get_stage_metrics().snapshot(), *worker_metrics.values()])
+    return Response(content=render_prometheus(snapshot), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/api/task/breakpoint-status")
 async def get_breakpoint_status(input_path: str = ""):
     """
@@ -3324,6 +3537,21 @@ def load_config_sync() -> Dict[str, Any]:
 
     return loaded_config
 
+_shared_request_limiter = None
+_shared_request_limiter_lock = threading.Lock()
+
+def get_shared_request_limiter():
+    """
+    RequestLimiter shared by the LLM requests this process sends itself (AI proofread, /api/translate/text).
+    The limits are set from the platform config by the first user.
+    """
+    global _shared_request_limiter
+    with _shared_request_limiter_lock:
+        if _shared_request_limiter is None:
+            from ModuleFolders.Infrastructure.RequestLimiter.RequestLimiter import RequestLimiter
+            _shared_request_limiter = RequestLimiter()
+    return _shared_request_limiter
+
 def run_proofread_task():
     """Background task to run AI proofread"""
     global _proofread_state
@@ -3359,79 +3587,38 @@ def run_proofread_task():
             _proofread_state["completed"] = True
             return
 
-        # Initialize proofreader
-        ai_proofreader = AIProofreader(config)
+        # Initialize proofreader; requests are packed and sent concurrently by proofread_batch
+        ai_proofreader = AIProofreader(config, request_limiter=get_shared_request_limiter())
 
         def progress_callback(current, total, prompt_tokens, completion_tokens):
             _proofread_state["progress"] = current
             _proofread_state["tokens_used"] = prompt_tokens + completion_tokens
 
-        # Process using batching and threading to match CLI logic
-        # 1. Determine batch size and threads from config
-        # Default lines_limit is usually 20, threads 5
-        batch_size = config.get("lines_limit", 20)
-        thread_count = config.get("actual_thread_counts", 5) 
-        if thread_count <= 0: thread_count = 5
-
-        # 2. Split items into blocks
-        blocks = [to_check[i:i + batch_size] for i in range(0, len(to_check), batch_size)]
-        
-        # 3. Define worker function
-        import concurrent.futures
-        
-        results_lock = threading.Lock()
-        
-        def process_block(block):
-            if not _proofread_state["running"]: return
-            
-            try:
-                # Call the new batch method with full rules
-                block_results = ai_proofreader.proofread_lines_block(
-                    block,
-                    glossary=config.get("prompt_dictionary_data", []),
-                    world_building=config.get("world_building_content", ""),
-                    writing_style=config.get("writing_style_content", ""),
-                    characterization=config.get("characterization_data", [])
-                )
-                
-                with results_lock:
-                    # Update state with results
-                    for idx, result in block_results.items():
-                        original_item = next((item for item in block if item.get("index") == idx), None)
-                        
-                        if result.has_issues and original_item:
-                            for issue in result.issues:
-                                _proofread_state["issues"].append({
-                                    "id": len(_proofread_state["issues"]) + 1,
-                                    "text_index": original_item["text_index"],
-                                    "file_path": original_item["file_path"],
-                                    "source": original_item["source"],
-                                    "original_translation": original_item["translation"],
-                                    "corrected_translation": result.corrected_translation,
-                                    "issue_type": issue.type,
-                                    "severity": issue.severity,
-                                    "description": issue.description,
-                                    "accepted": False
-                                })
-                    
-                    _proofread_state["progress"] += len(block)
-                    p_tok = sum(r.prompt_tokens for r in block_results.values())
-                    c_tok = sum(r.completion_tokens for r in block_results.values())
-                    _proofread_state["tokens_used"] += (p_tok + c_tok)
-                    
-            except Exception as e:
-                print(f"Error processing block: {e}")
+        results = ai_proofreader.proofread_batch(
+            to_check,
+            glossary=config.get("prompt_dictionary_data", []),
+            progress_callback=progress_callback,
+            world_building=config.get("world_building_content", ""),
+            writing_style=config.get("writing_style_content", ""),
+            characterization=config.get("characterization_data", []),
+            should_stop=lambda: not _proofread_state["running"]
+        )
 
-        # 4. Execute with ThreadPool
-        with concurrent.futures.ThreadPoolExecutor(max_workers=thread_count) as executor:
-            # We must monitor running state
-            futures = []
-            for block in blocks:
-                if not _proofread_state["running"]: break
-                futures.append(executor.submit(process_block, block))
-            
-            # Wait for completion
-            concurrent.futures.wait(futures)
+        for idx, result in results.items():
+            original_item = to_check[idx]
+            for issue in result.issues:
+                _proofread_state["issues"].append({
+                    "id": len(_proofread_state["issues"]) + 1,
+                    "text_index": original_item["text_index"],
+                    "file_path": original_item["file_path"],
+                    "source": original_item["source"],
+                    "original_translation": original_item["translation"],
+                    "corrected_translation": result.corrected_translation,
+                    "issue_type": issue.type,
+                    "severity": issue.severity,
+                    "description": issue.description,
+                    "accepted": False
+                })
 
         _proofread_state["running"] = False
         _proofread_state["completed"] = True
@@ -4187,6 +4374,8 @@ async def list_users(
     search: Optional[str] = None,
     role: Optional[str] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    total: str = "auto",
     user: User = Depends(jwt_middleware.require_admin())
 ):
     """
@@ -4196,6 +4385,10 @@ async def list_users(
     - search: 在用户名和邮箱中搜索
     - role: 按用户角色过滤
     - status: 按账户状态过滤
+
+    分页：
+    - cursor: 上一页返回的 next_cursor，翻页开销与页码无关
+    - total: exact 精确计数 / auto 大结果集使用估算值 / none 不计数
     """
     try:
         from ModuleFolders.Service.User import get_user_manager
@@ -4208,6 +4401,8 @@ async def list_users(
             search=search,
             role=role,
             status=status,
+            cursor=cursor,
+            total=total,
         )
 
         return result
@@ -6107,6 +6302,7 @@ def stop_server():
     if _current_server:
         # 1. Stop any running subprocess task
         task_manager.stop_task()
+        task_manager.shutdown_warm_pool()
         # 2. Tell uvicorn to exit
         _current_server.should_exit = True
         _current_server = None
@@ -6119,6 +6315,13 @@ def run_server(host: str = "127.0.0.1", port: int = 8000, monitor_mode: bool = F
     # 动态记录 WebServer 的地址，以便子进程上报数据
     task_manager.api_url = f"http://{host}:{port}"
     
+    # 预先启动常驻 Worker，首个任务即可免去解释器与插件加载耗时
+    if not monitor_mode:
+        try:
+            task_manager.start_warm_pool()
+        except Exception as e:
+            print(f"Warning: Failed to start warm task workers: {e}")
+
     try:
         config = uvicorn.Config(app, host=host, port=port, log_level="info")
         _current_server = StoppableServer(config)
@@ -11,65 +11,47 @@ import signal
 import threading
 import warnings
 import locale
-import collections
 import glob
 import rapidjson as json
 import shutil
 import subprocess
 import argparse
-import threading
-import requests
 import traceback
 from datetime import datetime
+from functools import cached_property
 
-from rich.console import Console, Group
+from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, IntPrompt, Confirm
 from rich.table import Table
 from rich.live import Live
-from rich.layout import Layout
 from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn, TimeElapsedColumn, SpinnerColumn
 from rich import print
 from rich.text import Text
-from rich.align import Align
 
 warnings.filterwarnings('ignore')
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
-from ModuleFolders.Infrastructure.Tokener.TiktokenLoader import initialize_tiktoken
-import ModuleFolders.Infrastructure.Tokener.TiktokenLoader as TiktokenLoaderModule
-import ModuleFolders.Domain.FileReader.ReaderUtil as ReaderUtilModule
-TiktokenLoaderModule._SUPPRESS_OUTPUT = True
-ReaderUtilModule._SUPPRESS_OUTPUT = True
-try: initialize_tiktoken()
-except Exception: pass
-
 from ModuleFolders.Base.Base import Base, TUIHandler
-from ModuleFolders.Base.PluginManager import PluginManager
-from ModuleFolders.Infrastructure.Cache.CacheItem import TranslationStatus
-from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
-from ModuleFolders.Domain.FileReader.FileReader import FileReader
-from ModuleFolders.Domain.FileOutputer.FileOutputer import FileOutputer
-from ModuleFolders.Service.SimpleExecutor.SimpleExecutor import SimpleExecutor
-from ModuleFolders.Service.TaskExecutor.TaskExecutor import TaskExecutor
-from ModuleFolders.Infrastructure.Update.UpdateManager import UpdateManager
-from ModuleFolders.Infrastructure.TaskConfig.SettingsRenderer import SettingsMenuBuilder
 from ModuleFolders.Infrastructure.TaskConfig.TaskType import TaskType
-from ModuleFolders.UserInterface.Editor import TUIEditor
-from ModuleFolders.Diagnostic import SmartDiagnostic, DiagnosticFormatter
-from ModuleFolders.Infrastructure.TaskConfig.TaskConfig import TaskConfig
-from ModuleFolders.Service.HttpService.HttpService import HttpService
-from ModuleFolders.UserInterface.FileSelector import FileSelector
-from ModuleFolders.UserInterface.InputListener import InputListener
-from ModuleFolders.UserInterface.TaskUI import TaskUI
-from ModuleFolders.UserInterface.APIManager import APIManager
-from ModuleFolders.UserInterface.GlossaryMenu import GlossaryMenu
-from ModuleFolders.UserInterface.AIProofreadMenu import AIProofreadMenu
-from ModuleFolders.UserInterface.AutomationMenu import AutomationMenu
-from ModuleFolders.UserInterface.EditorMenu import EditorMenu
-from ModuleFolders.CLI.OperationLogger import OperationLogger, log_operation
+from ModuleFolders.CLI.OperationLogger import OperationLogger
+
+# 交互菜单、诊断、更新等模块只在交互模式下使用，按需导入，
+# 保证 Web 服务器/任务队列拉起的无界面任务进程快速启动
+# 插件、文件读写与任务执行器同样在首次使用时才加载（见 CLIMenu.task_executor），
+# 启动耗时由 Tools/Benchmark/check_startup_imports.py 把关
+
+
+def _prepare_task_runtime():
+    """加载任务组件前初始化 tiktoken 缓存目录（并应用 babeldoc 补丁），重复调用无副作用"""
+    import ModuleFolders.Infrastructure.Tokener.TiktokenLoader as TiktokenLoaderModule
+    import ModuleFolders.Domain.FileReader.ReaderUtil as ReaderUtilModule
+    TiktokenLoaderModule._SUPPRESS_OUTPUT = True
+    ReaderUtilModule._SUPPRESS_OUTPUT = True
+    try: TiktokenLoaderModule.initialize_tiktoken()
+    except Exception: pass
 
 
 
@@ -120,17 +102,16 @@ config = {}
 if os.path.exists(config_path):
     with open(config_path, 'r', encoding='utf-8') as f: config = json.load(f)
 
-saved_lang = config.get("interface_language")
-config_path = os.path.join(PROJECT_ROOT, "Resource", "config.json")
-config = {}
-if os.path.exists(config_path):
-    with open(config_path, 'r', encoding='utf-8') as f: config = json.load(f)
-
 saved_lang = config.get("interface_language")
 current_lang = saved_lang or (lambda: "zh_CN" if (l := locale.getdefaultlocale()[0]) and l.startswith("zh") else "ja" if l and l.startswith("ja") else "en")()
 i18n = I18NLoader(current_lang)
 Base.i18n = i18n # Make I18N globally accessible
 
+def _is_task_ui(ui):
+    """TaskUI 按需导入，模块尚未加载时不可能存在其实例"""
+    task_ui_module = sys.modules.get("ModuleFolders.UserInterface.TaskUI")
+    return task_ui_module is not None and isinstance(ui, task_ui_module.TaskUI)
+
 def mask_key(key):
     if not key: return ""
     if len(key) <= 5: return key[:1] + "***" + key[-1:]
@@ -169,6 +150,9 @@ def ensure_calibre_available(tool_name="ebook-convert.exe"):
 
 
 class WebLogger:
+    # 常驻 Worker 模式下由 task_worker 设置，统计数据以结构化消息发送，不再输出 [STATS] 行
+    stats_sink = None
+
     def __init__(self, stream=None, show_detailed=False):
         self.last_stats_time = 0
         self.stream = stream or sys.__stdout__
@@ -266,7 +250,21 @@ class WebLogger:
         
         rpm = (calc_requests / (elapsed / 60)) if elapsed > 0 else 0
         tpm_k = (calc_tokens / (elapsed / 60) / 1000) if elapsed > 0 else 0
-        
+
+        if WebLogger.stats_sink is not None:
+            try:
+                WebLogger.stats_sink({
+                    "rpm": round(rpm, 2),
+                    "tpm": round(tpm_k, 2),
+                    "completedProgress": completed,
+                    "totalProgress": total,
+                    "totalTokens": tokens,
+                    "successRate": round(s_rate, 1),
+                    "errorRate": round(e_rate, 1),
+                })
+            except: pass
+            return
+
         try:
             self.stream.write(f"[STATS] RPM: {rpm:.2f} | TPM: {tpm_k:.2f}k | Progress: {completed}/{total} | Tokens: {tokens} | S-Rate: {s_rate:.1f}% | E-Rate: {e_rate:.1f}%\n")
             self.stream.flush()
@@ -388,7 +386,7 @@ def normalize_path_for_filesystem(path):
 
 
 class CLIMenu:
-    def __init__(self):
+    def __init__(self, persist_config=True):
         self.root_config_path = os.path.join(PROJECT_ROOT, "Resource", "config.json")
         self.profiles_dir = os.path.join(PROJECT_ROOT, "Resource", "profiles")
         self.rules_profiles_dir = os.path.join(PROJECT_ROOT, "Resource", "rules_profiles")
@@ -396,26 +394,12 @@ class CLIMenu:
         
         self.config = {}
         self.root_config = {}
+        self.runtime_overrides = {}  # 仅作用于本次运行、不写入 Profile 的配置
+        self.persist_config = persist_config  # False 时配置只在内存中修改（队列并行子进程）
         self.active_profile_name = "default"
         self.active_rules_profile_name = "default"
         self.load_config()
 
-        self.plugin_manager = PluginManager()
-        self.plugin_manager.load_plugins_from_directory(os.path.join(PROJECT_ROOT, "PluginScripts"))
-        
-        # 同步插件启用状态
-        if "plugin_enables" in self.root_config:
-            self.plugin_manager.update_plugins_enable(self.root_config["plugin_enables"])
-            
-        self.file_reader, self.file_outputer, self.cache_manager = FileReader(), FileOutputer(), CacheManager()
-        self.simple_executor = SimpleExecutor()
-        self.task_executor = TaskExecutor(self.plugin_manager, self.cache_manager, self.file_reader, self.file_outputer)
-        self.file_selector = FileSelector(i18n)
-        self.update_manager = UpdateManager(i18n)
-        
-        # 输入监听器
-        self.input_listener = InputListener()
-
         # 全局属性供子模块使用
         self.PROJECT_ROOT = PROJECT_ROOT
         self.i18n = i18n
@@ -433,8 +417,6 @@ class CLIMenu:
         if self.config.get("enable_operation_logging", False):
             self.operation_logger.enable()
 
-        # 智能诊断模块
-        self.smart_diagnostic = SmartDiagnostic(lang=current_lang)
         self._api_error_count = 0  # API错误计数
         self._api_error_messages = []  # 存储最近的API错误信息
         self._show_diagnostic_hint = False  # 是否显示诊断提示
@@ -445,20 +427,100 @@ class CLIMenu:
         self._api_error_messages = []  # 存储最近的API错误信息
         self._show_diagnostic_hint = False  # 是否显示诊断提示
 
-        # API管理器
-        self.api_manager = APIManager(self)
-
-        # 术语/规则菜单
-        self.glossary_menu = GlossaryMenu(self)
+    # 任务组件在首次访问时创建，菜单浏览、--help 等不会拉起 babeldoc/tiktoken
+    @cached_property
+    def plugin_manager(self):
+        _prepare_task_runtime()
+        from ModuleFolders.Base.PluginManager import PluginManager
+        plugin_manager = PluginManager()
+        plugin_manager.load_plugins_from_directory(os.path.join(PROJECT_ROOT, "PluginScripts"))
 
-        # AI校对菜单
-        self.ai_proofread_menu = AIProofreadMenu(self)
-
-        # 自动化菜单
-        self.automation_menu = AutomationMenu(self)
-
-        # 编辑器菜单
-        self.editor_menu_handler = EditorMenu(self)
+        # 同步插件启用状态
+        if "plugin_enables" in self.root_config:
+            plugin_manager.update_plugins_enable(self.root_config["plugin_enables"])
+        return plugin_manager
+
+    @cached_property
+    def cache_manager(self):
+        _prepare_task_runtime()
+        from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
+        return CacheManager()
+
+    @cached_property
+    def file_reader(self):
+        _prepare_task_runtime()
+        from ModuleFolders.Domain.FileReader.FileReader import FileReader
+        return FileReader()
+
+    @cached_property
+    def file_outputer(self):
+        _prepare_task_runtime()
+        from ModuleFolders.Domain.FileOutputer.FileOutputer import FileOutputer
+        return FileOutputer()
+
+    @cached_property
+    def task_executor(self):
+        _prepare_task_runtime()
+        from ModuleFolders.Service.TaskExecutor.TaskExecutor import TaskExecutor
+        return TaskExecutor(self.plugin_manager, self.cache_manager, self.file_reader, self.file_outputer)
+
+    # 以下组件在首次访问时创建，无界面任务不会加载它们
+    @cached_property
+    def simple_executor(self):
+        from ModuleFolders.Service.SimpleExecutor.SimpleExecutor import SimpleExecutor
+        return SimpleExecutor()
+
+    @cached_property
+    def file_selector(self):
+        from ModuleFolders.UserInterface.FileSelector import FileSelector
+        return FileSelector(i18n)
+
+    @cached_property
+    def update_manager(self):
+        from ModuleFolders.Infrastructure.Update.UpdateManager import UpdateManager
+        return UpdateManager(i18n)
+
+    @cached_property
+    def input_listener(self):
+        """输入监听器"""
+        from ModuleFolders.UserInterface.InputListener import InputListener
+        return InputListener()
+
+    @cached_property
+    def smart_diagnostic(self):
+        """智能诊断模块"""
+        from ModuleFolders.Diagnostic import SmartDiagnostic
+        return SmartDiagnostic(lang=current_lang)
+
+    @cached_property
+    def api_manager(self):
+        """API管理器"""
+        from ModuleFolders.UserInterface.APIManager import APIManager
+        return APIManager(self)
+
+    @cached_property
+    def glossary_menu(self):
+        """术语/规则菜单"""
+        from ModuleFolders.UserInterface.GlossaryMenu import GlossaryMenu
+        return GlossaryMenu(self)
+
+    @cached_property
+    def ai_proofread_menu(self):
+        """AI校对菜单"""
+        from ModuleFolders.UserInterface.AIProofreadMenu import AIProofreadMenu
+        return AIProofreadMenu(self)
+
+    @cached_property
+    def automation_menu(self):
+        """自动化菜单"""
+        from ModuleFolders.UserInterface.AutomationMenu import AutomationMenu
+        return AutomationMenu(self)
+
+    @cached_property
+    def editor_menu_handler(self):
+        """编辑器菜单"""
+        from ModuleFolders.UserInterface.EditorMenu import EditorMenu
+        return EditorMenu(self)
 
     def _check_web_server_dist(self):
         """检查 WebServer 编译产物是否存在"""
@@ -505,7 +567,7 @@ class CLIMenu:
                 Base.print(f"[cyan]您可以通过 http://{local_ip}:{webserver_port} 访问网页监控面板[/cyan]")
                 
                 # Signal TUI takeover if running
-                if self.task_running and hasattr(self, "ui") and isinstance(self.ui, TaskUI):
+                if self.task_running and hasattr(self, "ui") and _is_task_ui(self.ui):
                     self.ui.web_task_manager = ws_module.task_manager
                     self.ui._server_ip = local_ip
 
@@ -655,6 +717,7 @@ class CLIMenu:
     def _push_stats_to_webserver(self, stats_data):
         """推送统计数据到webserver"""
         try:
+            import requests
             response = requests.post(
                 "http://127.0.0.1:8000/api/internal/update_stats",
                 json=stats_data,
@@ -667,6 +730,7 @@ class CLIMenu:
     def _push_log_to_webserver(self, message, log_type="info"):
         """推送日志消息到webserver"""
         try:
+            import requests
             response = requests.post(
                 "http://127.0.0.1:8000/api/internal/push_log",
                 json={"message": message, "type": log_type},
@@ -1045,15 +1109,22 @@ class CLIMenu:
     def run_non_interactive(self, args):
         """处理命令行参数，以非交互模式运行任务"""
         # 切换 Profile
-        if args.profile:
-            self.root_config["active_profile"] = args.profile
-            self.save_config(save_root=True)
-            self.load_config() # 重新加载配置
-            
-        if args.rules_profile:
-            self.root_config["active_rules_profile"] = args.rules_profile
-            self.save_config(save_root=True)
-            self.load_config()
+        if not self.persist_config:
+            # 只在本进程内切换，不修改根配置中的当前 Profile
+            if args.profile: self.active_profile_name = args.profile
+            if args.rules_profile: self.active_rules_profile_name = args.rules_profile
+            if args.profile or args.rules_profile:
+                self._migrate_and_load_profiles()
+        else:
+            if args.profile:
+                self.root_config["active_profile"] = args.profile
+                self.save_config(save_root=True)
+                self.load_config() # 重新加载配置
+
+            if args.rules_profile:
+                self.root_config["active_rules_profile"] = args.rules_profile
+                self.save_config(save_root=True)
+                self.load_config()
         
         # 覆盖基础配置
         if args.source_lang: self.config["source_language"] = args.source_lang
@@ -1080,18 +1151,30 @@ class CLIMenu:
         if args.platform: self.config["target_platform"] = args.platform
         if args.model: self.config["model"] = args.model
         if args.api_url: self.config["base_url"] = args.api_url
-        if args.api_key:
-            self.config["api_key"] = args.api_key
+        # API Key 也可以通过环境变量传入，避免出现在进程列表中
+        api_key = args.api_key or os.environ.get("AINIEE_API_KEY")
+        if api_key:
+            self.config["api_key"] = api_key
             # 同步到具体平台配置中
             tp = self.config.get("target_platform", "")
             if tp and tp in self.config.get("platforms", {}):
-                self.config["platforms"][tp]["api_key"] = args.api_key
+                self.config["platforms"][tp]["api_key"] = api_key
 
         # 覆盖高级参数
         if args.think_depth is not None: self.config["think_depth"] = args.think_depth
         if args.thinking_budget is not None: self.config["thinking_budget"] = args.thinking_budget
         if args.failover is not None: self.config["enable_api_failover"] = args.failover == "on"
 
+        # 速率预算只作用于本次运行（队列并行时由 QueueManager 分配），不写入 Profile
+        self.runtime_overrides = {}
+        if args.rpm is not None or args.tpm is not None:
+            self.runtime_overrides["enable_rate_limit"] = True
+            if args.rpm is not None: self.runtime_overrides["custom_rpm_limit"] = args.rpm
+            if args.tpm is not None: self.runtime_overrides["custom_tpm_limit"] = args.tpm
+        if args.max_threads is not None:
+            threads = self.config.get("user_thread_counts") or args.max_threads
+            self.runtime_overrides["user_thread_counts"] = min(threads, args.max_threads)
+
         self.save_config()
 
         task_map = {
@@ -1260,6 +1343,9 @@ class CLIMenu:
         self._migrate_and_load_profiles()
 
     def save_config(self, save_root=False):
+        if not self.persist_config:
+            return
+
         # 1. Save Settings (Exclude rules)
         active_profile_path = os.path.join(self.profiles_dir, f"{self.active_profile_name}.json")
         os.makedirs(os.path.dirname(active_profile_path), exist_ok=True)
@@ -1915,6 +2001,8 @@ class CLIMenu:
         console.print(Panel(error_text[:500] + ("..." if len(error_text) > 500 else ""),
                            title=f"[bold yellow]{i18n.get('label_error_content')}[/bold yellow]"))
 
+        from ModuleFolders.Diagnostic import DiagnosticFormatter
+
         # 使用诊断模块进行诊断
         result = self.smart_diagnostic.diagnose(error_text)
         formatted = DiagnosticFormatter.format_result(result, current_lang)
@@ -1986,6 +2074,8 @@ class CLIMenu:
         self.display_banner()
         console.print(Panel(f"[bold]{i18n.get('msg_diagnostic_result')}[/bold]"))
 
+        from ModuleFolders.Diagnostic import DiagnosticFormatter
+
         # 1. 先尝试规则匹配（用户可能直接输入错误码如 502）
         rule_result = self.smart_diagnostic.rule_matcher.match(keyword)
         if rule_result.is_matched:
@@ -2017,6 +2107,8 @@ class CLIMenu:
         console.print("\n")
         console.print(Panel(f"[bold yellow]{i18n.get('msg_program_error')}[/bold yellow]", border_style="yellow"))
 
+        from ModuleFolders.Diagnostic import DiagnosticFormatter
+
         # 1. 使用智能诊断模块进行自动诊断
         diag_result = self.smart_diagnostic.diagnose(error_msg)
 
@@ -2444,6 +2536,7 @@ class CLIMenu:
 
     def settings_menu(self):
         """设置菜单 - 基于 ConfigRegistry 动态生成"""
+        from ModuleFolders.Infrastructure.TaskConfig.SettingsRenderer import SettingsMenuBuilder
         builder = SettingsMenuBuilder(self.config, i18n)
 
         while True:
@@ -2797,6 +2890,7 @@ class CLIMenu:
         if web_mode:
             self.ui = WebLogger(stream=original_stdout, show_detailed=self.config.get("show_detailed_logs", False))
         else:
+            from ModuleFolders.UserInterface.TaskUI import TaskUI
             self.ui = TaskUI(parent_cli=self, i18n=i18n)
             # 设置 TUIHandler 的 UI 实例
             TUIHandler.set_ui(self.ui)
@@ -2806,7 +2900,7 @@ class CLIMenu:
         self.live_state = [True] # 必须在这里初始化，防止 LogStream 报错
 
         # 确保 TaskExecutor 的配置与 CLIMenu 的配置同步
-        self.task_executor.config.load_config_from_dict(self.config)
+        self.task_executor.config.load_config_from_dict({**self.config, **self.runtime_overrides})
 
         # Set force_retranslate if provided
         if force_retranslate:
@@ -2822,6 +2916,7 @@ class CLIMenu:
 
         # Patch tqdm to avoid conflict with Rich Live
         import ModuleFolders.Service.TaskExecutor.TaskExecutor as TaskExecutorModule
+        from ModuleFolders.Infrastructure.Cache.CacheItem import TranslationStatus
         TaskExecutorModule.tqdm = lambda x, **kwargs: x
         
         # Initialize suppression flags early
@@ -3248,7 +3343,7 @@ class CLIMenu:
             if log_file: log_file.close()
             
             # --- Ensure Takeover Mode is disabled before UI cleanup ---
-            if hasattr(self, "ui") and isinstance(self.ui, TaskUI):
+            if hasattr(self, "ui") and _is_task_ui(self.ui):
                 with self.ui._lock:
                     self.ui.taken_over = False
                 # The Live context manager is about to exit, let it do one last clean frame
@@ -3520,6 +3615,7 @@ class CLIMenu:
 
         try:
             with console.status(f"[cyan]{i18n.get('msg_export_started')}[/cyan]"):
+                from ModuleFolders.Infrastructure.Cache.CacheManager import CacheManager
                 project = CacheManager.read_from_file(cache_path)
                 
                 self.task_executor.config.initialize(self.config)
@@ -3528,7 +3624,8 @@ class CLIMenu:
                     "translated_suffix": cfg.output_filename_suffix,
                     "bilingual_suffix": "_bilingual",
                     "bilingual_order": cfg.bilingual_text_order,
-                    "enable_bilingual_output": cfg.enable_bilingual_output
+                    "enable_bilingual_output": cfg.enable_bilingual_output,
+                    "export_thread_counts": cfg.export_thread_counts,
                 }
                 
                 self.file_outputer.output_translated_content(
@@ -3972,24 +4069,8 @@ class CLIMenu:
                 self.stop_queue_log_monitor()  # 停止队列日志监控
                 self._is_queue_mode = False  # 清除队列模式标记
 
-def main():
-    # Force unbuffered stdout for real-time web monitoring
-    try:
-        # Check if we are running as a backend worker or just want unbuffered output
-        if os.environ.get('AINIEE_BACKEND_WORKER') or os.environ.get('PYTHONUNBUFFERED'):
-            sys.stdout.reconfigure(line_buffering=True, encoding='utf-8')
-            # Explicitly print a marker to confirm stdout is working
-            print("[AINIEE_CLI] Process started in unbuffered mode.", flush=True)
-    except Exception as e:
-        # If reconfigure fails (e.g. older python or weird stream), just ignore
-        pass
-
-    # DEBUG: Log args
-    try:
-        with open("cli_debug.log", "a") as f:
-            f.write(f"[{datetime.now()}] ARGV: {sys.argv}\n")
-    except: pass
-
+def build_arg_parser():
+    """命令行参数定义，常驻 Worker 解析任务参数时复用"""
     parser = argparse.ArgumentParser(description="AiNiee-Next - A powerful tool for AI-driven translation and polishing.", add_help=False)
     
     # 将 --help 参数单独处理，以便自定义帮助信息
@@ -4016,12 +4097,16 @@ def main():
     parser.add_argument('--retry', type=int, help="Max retry counts for failed requests")
     parser.add_argument('--rounds', type=int, help="Max execution rounds")
     parser.add_argument('--timeout', type=int, help="Request timeout in seconds")
+    parser.add_argument('--rpm', type=int, help="Requests per minute limit for this run only")
+    parser.add_argument('--tpm', type=int, help="Tokens per minute limit for this run only")
+    parser.add_argument('--max-threads', type=int, help="Upper bound of concurrent threads for this run only")
+    parser.add_argument('--no-save-config', dest='save_config', action='store_false', help="Apply the overrides to this run only, without writing profiles or the root config")
 
     # API 与模型配置
     parser.add_argument('--platform', help="Target platform (e.g., Openai, LocalLLM, sakura)")
     parser.add_argument('--model', help="Model name")
     parser.add_argument('--api-url', help="Base URL for the API")
-    parser.add_argument('--api-key', help="API Key")
+    parser.add_argument('--api-key', help="API Key (or set the AINIEE_API_KEY environment variable)")
     parser.add_argument('--think-depth', type=int, help="Reasoning depth (0-10000)")
     parser.add_argument('--thinking-budget', type=int, help="Thinking budget limit")
     parser.add_argument('--failover', choices=['on', 'off'], help="Enable or disable API failover")
@@ -4033,9 +4118,30 @@ def main():
     parser.add_argument('--tokens', type=int, help="Tokens per request (Token Mode)")
     parser.add_argument('--pre-lines', type=int, help="Context lines to include")
 
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    # Force unbuffered stdout for real-time web monitoring
+    try:
+        # Check if we are running as a backend worker or just want unbuffered output
+        if os.environ.get('AINIEE_BACKEND_WORKER') or os.environ.get('PYTHONUNBUFFERED'):
+            sys.stdout.reconfigure(line_buffering=True, encoding='utf-8')
+            # Explicitly print a marker to confirm stdout is working
+            print("[AINIEE_CLI] Process started in unbuffered mode.", flush=True)
+    except Exception as e:
+        # If reconfigure fails (e.g. older python or weird stream), just ignore
+        pass
+
+    # DEBUG: Log args
+    try:
+        with open("cli_debug.log", "a") as f:
+            f.write(f"[{datetime.now()}] ARGV: {sys.argv}\n")
+    except: pass
+
+    args = build_arg_parser().parse_args()
 
-    cli = CLIMenu()
+    cli = CLIMenu(persist_config=args.save_config)
     try:
         if args.task and args.input_path:
             cli.run_non_interactive(args)